@@ -15,28 +15,27 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "voice-engine"))
 
 from recognizer import VoiceRecognizer
-from commander import Commander
+from dedupe import DEFAULT_WINDOW
+from router import CommandRouter
 
 class MiDAS:
     """Main MiDAS AI coordinator."""
     
-    def __init__(self, use_whisper=False):
+    def __init__(self, use_whisper=False, dedupe_window=DEFAULT_WINDOW, executor=None):
         """
         Initialize MiDAS.
         
         Args:
             use_whisper: Use Whisper model for voice recognition (more accurate, slower)
+            dedupe_window: Seconds a repeated command is ignored (echo / speaker bleed)
+            executor: Executor for all commands (default: osascript on real Logic Pro)
         """
         print("🔷 Initializing MiDAS AI...")
         print()
         
         # Initialize components
         self.recognizer = VoiceRecognizer(use_whisper=use_whisper)
-        self.commander = Commander()
-        
-        # Set up callbacks
-        self.commander.on_command = self.on_command_recognized
-        self.commander.on_error = self.on_error
+        self.router = CommandRouter(executor=executor, dedupe_window=dedupe_window)
         
         # State
         self.is_running = False
@@ -65,12 +64,16 @@ class MiDAS:
         print("  • 'keep it'                 - Save current take")
         print("  • 'trash it'                - Delete current take")
         print("  • 'comp mode'               - Enter comping mode")
+        print("  • 'cancel' / 'never mind'   - Stop the running command")
         print()
         print("🎤 Listening... (Ctrl+C to quit)")
         print("-" * 60)
         print()
         
         try:
+            # Commands queue by priority; cancel acts immediately
+            self.router.start_scheduler(on_complete=self.on_job_complete)
+            
             # Start voice recognition
             self.recognizer.start_listening(self.handle_voice_input)
             
@@ -91,6 +94,10 @@ class MiDAS:
         print()
         print("🔷 Stopping MiDAS...")
         self.recognizer.stop_listening()
+        self.router.stop_scheduler()
+        if self.router.commander.take_pipeline:
+            self.router.commander.take_pipeline.stop()
+        self.router.executor.save_latency_stats()
         self.is_running = False
         
         # Stats
@@ -101,6 +108,8 @@ class MiDAS:
         if self.total_commands > 0:
             success_rate = (self.successful_commands / self.total_commands) * 100
             print(f"  Success rate: {success_rate:.0f}%")
+        if self.router.dedupe.suppressed:
+            print(f"  Repeats ignored: {self.router.dedupe.suppressed}")
         print()
         print("✓ MiDAS stopped")
         print()
@@ -112,19 +121,34 @@ class MiDAS:
         Args:
             text: Recognized speech text
         """
+        # Routed once; the router drops an intent (source, action, args)
+        # accepted within the dedupe window as an echo. Control intents
+        # ("cancel") run right away, everything else is queued.
+        intent, job = self.router.submit(text)
+        if intent is None:
+            self.total_commands += 1
+        elif intent.confidence < 0.9:
+            print(f"  ⚠️  Low confidence ({intent.confidence:.0%}): '{intent.text}' -> {intent.action}")
+    
+    def on_job_complete(self, job):
+        """Callback when a queued command finishes, is dropped or is cancelled."""
+        if (job.intent.source, job.intent.action) == ('control', 'prewarm'):
+            return  # background pre-warm queued by the router, not a spoken command
         self.total_commands += 1
-        
-        # Parse and execute command
-        success = self.commander.handle_voice_input(text)
-        
-        if success:
-            self.successful_commands += 1
+        if job.status == 'done' and isinstance(job.result, Exception):
+            self.on_error(str(job.result))
+        elif job.status == 'done':
+            self.on_result(job.intent, job.result)
+        else:
+            print(f"  ⏹️  {job.status.capitalize()}: {job.intent.description}")
     
-    def on_command_recognized(self, command):
-        """Callback when command is successfully recognized."""
-        # Could provide audio/visual feedback here
-        # For now, just print
-        print(f"  ✓ Executing: {command.action}")
+    def on_result(self, intent, result):
+        """Callback when a command has run."""
+        if result.success:
+            self.successful_commands += 1
+            print(f"  ✓ {result.output}")
+        else:
+            self.on_error(result.error)
     
     def on_error(self, error: str):
         """Callback when error occurs."""
@@ -141,6 +165,12 @@ def main():
         action="store_true",
         help="Use Whisper model for voice recognition (more accurate, slower)"
     )
+    parser.add_argument(
+        "--dedupe-window",
+        type=float,
+        default=DEFAULT_WINDOW,
+        help="Seconds a repeated command is ignored (0 disables)"
+    )
     parser.add_argument(
         "--test",
         action="store_true",
@@ -159,13 +189,14 @@ def main():
         
         if text:
             print(f"\n✓ Recognized: '{text}'")
-            commander = Commander()
-            commander.handle_voice_input(text)
+            intent, result = CommandRouter().handle(text)
+            if result is not None:
+                print(f"  {'✓' if result.success else '❌'} {result.output or result.error}")
         else:
             print("\n✗ No command recognized")
     else:
         # Normal mode: continuous listening
-        midas = MiDAS(use_whisper=args.whisper)
+        midas = MiDAS(use_whisper=args.whisper, dedupe_window=args.dedupe_window)
         midas.start()
 
 
@@ -7,11 +7,52 @@ Built: February 18, 2026
 
 import json
 import re
-import subprocess
 from pathlib import Path
 
+from executor import OsascriptExecutor
+
+ADVICE_CONTENT_FILE = Path(__file__).parent / 'advice_content.json'
+
+# Rendered advice text per content file, loaded once per process
+_advice_cache = {}
+
+
+def load_advice_content(content_file=ADVICE_CONTENT_FILE):
+    """Advice/help text by action, rendered from the JSON data file (cached)"""
+    content_file = Path(content_file)
+    if content_file not in _advice_cache:
+        with open(content_file, 'r') as f:
+            content = json.load(f)
+        
+        rendered = {}
+        for action, entry in content.items():
+            prefix = entry.get('tip_prefix', '   • ')
+            sections = [section['heading'] + '\n' + '\n'.join(prefix + tip for tip in section['tips'])
+                        for section in entry['sections']]
+            rendered[action] = entry['title'] + '\n\n' + '\n\n'.join(sections)
+        _advice_cache[content_file] = rendered
+    
+    return _advice_cache[content_file]
+
+
 class AdviceParser:
-    def __init__(self):
+    # Answered from the project snapshot when a ProjectStateCache is attached
+    PROJECT_ACTIONS = ['project_info', 'analyze_track', 'check_mix']
+    
+    # Fixed text served from advice_content.json (check_* map to detect_issues)
+    STATIC_ACTIONS = {
+        'vocal_advice': 'vocal_advice',
+        'drum_advice': 'drum_advice',
+        'bass_advice': 'bass_advice',
+        'general_advice': 'general_advice',
+        'detect_issues': 'detect_issues',
+        'check_clipping': 'detect_issues',
+        'check_mud': 'detect_issues',
+        'check_harsh': 'detect_issues',
+        'show_help': 'show_help'
+    }
+    
+    def __init__(self, executor=None, project_state=None):
         # Load command patterns
         commands_file = Path(__file__).parent / 'advice_commands.json'
         with open(commands_file, 'r') as f:
@@ -19,6 +60,9 @@ class AdviceParser:
         
         # AppleScript file path
         self.script_path = Path(__file__).parent.parent / 'logic-automation' / 'project_analyzer.scpt'
+        self.executor = executor or OsascriptExecutor()
+        self.project_state = project_state  # ProjectStateCache (optional)
+        self.advice_text = load_advice_content()
         
     def parse(self, text):
         """Parse natural language question and return advice command"""
@@ -142,77 +186,109 @@ class AdviceParser:
         if not command:
             return {"success": False, "error": "No command parsed"}
         
-        # Handle help specially (no AppleScript needed)
-        if command['action'] == 'show_help':
-            return self._show_help()
+        # Help and fixed advice come from the in-memory content (no AppleScript needed)
+        if command['action'] in self.STATIC_ACTIONS:
+            return {
+                "success": True,
+                "output": self.static_advice(command['action']),
+                "description": command['description']
+            }
+        
+        # Analysis from the project snapshot (falls back to the script if Logic can't be read)
+        if command['action'] in self.PROJECT_ACTIONS and self.project_state:
+            result = self.analyze_project(command['action'], command['args'])
+            if result:
+                result['description'] = command['description']
+                return result
         
-        try:
-            # Build osascript command
-            cmd = ['osascript', str(self.script_path)] + command['args']
-            
-            # Execute
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                return {
-                    "success": True,
-                    "output": result.stdout.strip(),
-                    "description": command['description']
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": result.stderr.strip(),
-                    "description": command['description']
-                }
+        # Execute AppleScript
+        result = self.executor.run(self.script_path, command['args'], timeout=10)
         
-        except subprocess.TimeoutExpired:
+        if result.success:
             return {
-                "success": False,
-                "error": "Command timed out",
+                "success": True,
+                "output": result.output,
                 "description": command['description']
             }
-        except Exception as e:
+        else:
             return {
                 "success": False,
-                "error": str(e),
+                "error": result.error,
                 "description": command['description']
             }
     
+    def analyze_project(self, action, args):
+        """
+        Answer project_info / analyze_track / check_mix from the project snapshot
+        Returns: result dict, or None if the snapshot isn't available
+        """
+        if not self.project_state.ensure_fresh('mixer', 'plugins', 'tempo', 'markers'):
+            return None
+        project = self.project_state.state
+        
+        if action == 'project_info':
+            lines = [
+                f"Tempo: {project.tempo:g} BPM",
+                f"Tracks: {len(project.tracks)}",
+                f"Markers: {len(project.markers)}"
+            ]
+            kinds = {}
+            for track in project.tracks:
+                kinds[track.kind or 'unknown'] = kinds.get(track.kind or 'unknown', 0) + 1
+            lines += [f"  {kind}: {count}" for kind, count in sorted(kinds.items())]
+            return {"success": True, "output": "\n".join(lines)}
+        
+        if action == 'analyze_track':
+            num = int(args[1])
+            track = project.track_at(num)
+            if track is None:
+                return {"success": False, "error": f"No track {num} (project has {len(project.tracks)})"}
+            
+            state = "muted" if track.mute else "soloed" if track.solo else "active"
+            plugins = ", ".join(track.plugins) if track.plugins else "none"
+            lines = [
+                f"Track {num} Analysis:",
+                f"Name: {track.name}",
+                f"Type: {track.kind or 'unknown'}",
+                f"Level: {track.volume_db:+.1f} dB",
+                f"State: {state}",
+                f"Plugins: {plugins}"
+            ]
+            return {"success": True, "output": "\n".join(lines)}
+        
+        # check_mix
+        issues = []
+        hot = [t.name for t in project.tracks if t.volume_db > 0]
+        if hot:
+            issues.append(f"⚠️ Above 0 dB (clipping risk): {', '.join(hot)}")
+        soloed = [t.name for t in project.tracks if t.solo]
+        if soloed:
+            issues.append(f"⚠️ Soloed (forgotten solo?): {', '.join(soloed)}")
+        muted = [t.name for t in project.tracks if t.mute]
+        if muted:
+            issues.append(f"• Muted: {', '.join(muted)}")
+        dry = [t.name for t in project.tracks
+               if t.kind in ('audio', 'midi') and t.plugins == []]
+        if dry:
+            issues.append(f"• No plugins yet: {', '.join(dry)}")
+        vocals = [t for t in project.tracks if 'vocal' in t.name.lower() or 'vox' in t.name.lower()]
+        if vocals and all(t.volume_db < max(o.volume_db for o in project.tracks) for t in vocals):
+            issues.append("• Vocals aren't the loudest element - bring them forward")
+        
+        if not issues:
+            issues.append("✓ No obvious level/state problems")
+        output = f"Mix Analysis ({len(project.tracks)} tracks):\n\n" + "\n".join(issues)
+        return {"success": True, "output": output}
+    
+    def static_advice(self, action):
+        """Fixed advice/help text for an action"""
+        return self.advice_text[self.STATIC_ACTIONS[action]]
+    
     def _show_help(self):
         """Show available commands"""
-        help_text = """
-MiDAS AI - Voice Commands Available:
-
-🎙️ Analysis:
-• "analyze the mix" - Check overall mix
-• "analyze track [number]" - Check specific track
-• "project info" - Get project details
-
-🎯 Specific Advice:
-• "how do I mix vocals" - Vocal mixing tips
-• "how do I mix drums" - Drum mixing tips
-• "how do I mix bass" - Bass mixing tips
-• "general mixing tips" - Overall workflow
-
-🔍 Issue Detection:
-• "what needs fixing" - Detect common issues
-• "check for clipping" - Check levels
-• "sounds muddy" - Low-mid frequency advice
-• "sounds harsh" - High frequency advice
-
-💡 Help:
-• "help" - Show this message
-• "what can you do" - Show capabilities
-        """
         return {
             "success": True,
-            "output": help_text.strip(),
+            "output": self.static_advice('show_help'),
             "description": "Showing help"
         }
     
@@ -292,6 +368,15 @@ def test_parser():
     print("\n" + "=" * 60)
     print(f"RESULTS: {passed} passed, {failed} failed")
     print("=" * 60)
+    
+    # Fixed advice is served from the in-memory content, no osascript
+    import time
+    command = parser.parse("how do i mix vocals")
+    start = time.perf_counter()
+    for _ in range(1000):
+        result = parser.execute(command)
+    per_call = (time.perf_counter() - start) / 1000 * 1e6
+    print(f"\n{result['output'].splitlines()[0]} served in {per_call:.1f} µs per request")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,231 @@
+"""
+MiDAS AI - Fader Automation
+Voice-driven fader rides written as a few breakpoints instead of every step
+
+    "bring vocals up slowly over 4 bars"
+    "ride the bass down 6 db over 2 bars"
+    "fade drums out over 8 bars"
+
+A ride is built as a NumPy curve - STEPS_PER_BAR points per bar, shaped
+(linear, slow S-curve, quick ease-out) in dB from the fader's current
+level - then decimated with Ramer-Douglas-Peucker. The distance is
+vertical (dB at the same position), so every point of the original curve
+stays within the tolerance of the line Logic draws between the kept
+breakpoints. Only the breakpoints are sent, as one write-automation call
+to mixing.scpt, which replaces any automation already in that range. Each
+ride reports points sent against the points built, with the worst error
+next to the tolerance.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import re
+
+import numpy as np
+
+from simulated_logic import MAX_DB, MIN_DB, clamp_db
+
+STEPS_PER_BAR = 32           # curve resolution before decimation
+DEFAULT_TOLERANCE_DB = 0.25  # max deviation from the built curve
+DEFAULT_RIDE_DB = 3.0        # "bring vocals up slowly" with no amount
+
+# Spoken speed -> curve shape
+SHAPES = {
+    None: 'linear', 'steadily': 'linear',
+    'slowly': 'slow', 'gradually': 'slow', 'smoothly': 'slow', 'gently': 'slow',
+    'quickly': 'quick', 'fast': 'quick',
+}
+
+RIDE_PATTERNS = [
+    re.compile(r'^(?:bring|ride|push|pull|take|move) (?:the )?(?P<track>.+?) (?P<direction>up|down)'
+               r'(?: (?P<rest>.+?))? over (?P<bars>\d+(?:\.\d+)?) bars?$'),
+    re.compile(r'^fade (?:the )?(?P<track>.+?) (?P<direction>in|out)'
+               r'(?: (?P<rest>.+?))? over (?P<bars>\d+(?:\.\d+)?) bars?$'),
+]
+
+
+def parse_ride(text):
+    """
+    Match a fader ride
+    Returns: {'track', 'direction' (up/down/in/out), 'amount' (spoken, or None),
+              'shape', 'bars'} or None
+    """
+    for pattern in RIDE_PATTERNS:
+        match = pattern.match(text)
+        if match is None:
+            continue
+        words = (match.group('rest') or '').split()
+        speed = next((word for word in words if word in SHAPES), None)
+        amount = " ".join(word for word in words if word != speed) or None
+        return {'track': match.group('track'), 'direction': match.group('direction'),
+                'amount': amount, 'shape': SHAPES[speed], 'bars': float(match.group('bars'))}
+    return None
+
+
+# ============================================================
+# CURVES
+# ============================================================
+
+def ride_curve(start_db, end_db, bars, shape='linear', start_bar=1.0, steps_per_bar=STEPS_PER_BAR):
+    """
+    Fader ride as an (n, 2) array of (position in bars, dB)
+    shape: 'linear', 'slow' (S-curve, eases in and out) or 'quick' (most of the move up front)
+    """
+    steps = max(int(round(bars * steps_per_bar)), 1)
+    t = np.linspace(0.0, 1.0, steps + 1)
+    if shape == 'slow':
+        t = t * t * (3.0 - 2.0 * t)
+    elif shape == 'quick':
+        t = 1.0 - (1.0 - t) ** 3
+    positions = start_bar + np.linspace(0.0, bars, steps + 1)
+    levels = np.clip(start_db + (end_db - start_db) * t, MIN_DB, MAX_DB)
+    return np.column_stack((positions, levels))
+
+
+def decimate(points, tolerance_db=DEFAULT_TOLERANCE_DB):
+    """
+    Ramer-Douglas-Peucker on a curve (vertical distance in dB)
+    Returns: the kept breakpoints, first and last always included
+    """
+    count = len(points)
+    if count <= 2:
+        return points.copy()
+    x, y = points[:, 0], points[:, 1]
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+
+    # Iterative - a long ride would otherwise recurse once per kept point
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        inner = slice(first + 1, last)
+        fraction = (x[inner] - x[first]) / (x[last] - x[first])
+        errors = np.abs(y[inner] - (y[first] + fraction * (y[last] - y[first])))
+        worst = int(np.argmax(errors))
+        if errors[worst] > tolerance_db:
+            split = first + 1 + worst
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return points[keep]
+
+
+def max_error(points, breakpoints):
+    """Largest dB difference between a curve and the line through its breakpoints"""
+    drawn = np.interp(points[:, 0], breakpoints[:, 0], breakpoints[:, 1])
+    return float(np.max(np.abs(points[:, 1] - drawn)))
+
+
+def encode_points(breakpoints):
+    """writeVolumeAutomation() argument: 'bar,db;bar,db;...'"""
+    return ";".join(f"{bar:.4f},{db:.2f}" for bar, db in breakpoints)
+
+
+class AutomationEngine:
+    """Builds, decimates and writes fader rides; keeps a report per ride"""
+
+    def __init__(self, executor, script_path, tolerance_db=DEFAULT_TOLERANCE_DB,
+                 steps_per_bar=STEPS_PER_BAR):
+        """
+        Args:
+            executor: Executor for mixing.scpt
+            script_path: mixing.scpt
+            tolerance_db: max deviation of the written ride from the built curve
+            steps_per_bar: curve resolution before decimation
+        """
+        self.executor = executor
+        self.script_path = script_path
+        self.tolerance_db = tolerance_db
+        self.steps_per_bar = steps_per_bar
+        self.reports = []
+
+    def plan(self, start_db, end_db, bars, shape='linear', start_bar=1.0):
+        """
+        Curve and breakpoints for a ride
+        Returns: (breakpoints, report {'points', 'sent', 'tolerance_db', 'max_error_db'})
+        """
+        points = ride_curve(start_db, end_db, bars, shape, start_bar, self.steps_per_bar)
+        breakpoints = decimate(points, self.tolerance_db)
+        return breakpoints, {
+            'points': len(points),
+            'sent': len(breakpoints),
+            'tolerance_db': self.tolerance_db,
+            'max_error_db': max_error(points, breakpoints),
+        }
+
+    def write(self, track_ref, start_db, end_db, bars, shape='linear', start_bar=1.0):
+        """Write a ride on a track (name or '#<index>:<name>') in one osascript call"""
+        breakpoints, report = self.plan(start_db, end_db, bars, shape, start_bar)
+        result = self.executor.run(self.script_path, ['write-automation', track_ref,
+                                                      encode_points(breakpoints)], timeout=10)
+        if result.success:
+            self.reports.append(report)
+            result.output += (f" ({report['sent']} of {report['points']} points, max error "
+                              f"{report['max_error_db']:.2f} dB ≤ {report['tolerance_db']:g} dB)")
+        return result
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    import time
+
+    from executor import SimulatedExecutor
+    from router import CommandRouter
+    from simulated_logic import SimulatedLogic
+
+    print("🎚️  MiDAS AI - Fader Automation")
+    print("=" * 60)
+    print()
+
+    for text in ["bring vocals up slowly over 4 bars", "ride the bass down 6 db quickly over 2 bars",
+                 "fade drums out over 8 bars", "push keys up a little gradually over 16 bars"]:
+        print(f"{text:<46} → {parse_ride(text)}")
+    assert parse_ride("bring vocals up 3 db") is None
+    print()
+
+    engine = AutomationEngine(None, None)
+    print(f"{'ride':<26} {'built':>6} {'sent':>5} {'max error':>10}")
+    for start_db, end_db, bars, shape in [(-6, 0, 4, 'slow'), (0, -6, 2, 'quick'),
+                                          (0, MIN_DB, 8, 'linear'), (-3, -1, 16, 'slow')]:
+        breakpoints, report = engine.plan(start_db, end_db, bars, shape)
+        label = f"{start_db:g} → {end_db:g} dB, {bars} bars {shape}"
+        print(f"{label:<26} {report['points']:>6} {report['sent']:>5} {report['max_error_db']:>7.2f} dB")
+        assert report['max_error_db'] <= report['tolerance_db'] + 1e-9
+        assert report['sent'] < report['points'] / 4
+    print()
+
+    # Tighter tolerance: more breakpoints, still bounded
+    for tolerance in (1.0, 0.25, 0.05, 0.01):
+        points = ride_curve(-12, 0, 8, 'slow')
+        kept = decimate(points, tolerance)
+        print(f"tolerance {tolerance:>5} dB: {len(kept):>3} of {len(points)} points, "
+              f"max error {max_error(points, kept):.3f} dB")
+        assert max_error(points, kept) <= tolerance + 1e-9
+
+    start = time.perf_counter()
+    long_ride = ride_curve(-18, 6, 256, 'slow', steps_per_bar=96)
+    kept = decimate(long_ride)
+    print(f"{len(long_ride)} point ride decimated to {len(kept)} in "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms")
+    print()
+
+    # Through the router: one osascript call per ride
+    daw = SimulatedLogic(["Lead Vocals", "Drums", "Bass"])
+    daw.tracks[0].volume_db = -6.0
+    executor = SimulatedExecutor(daw, realtime=False)
+    router = CommandRouter(executor=executor, dedupe_window=0)
+    router.refresh_state()
+    for text in ["bring vocals up slowly over 4 bars", "fade drums out over 8 bars"]:
+        before = executor.invocations
+        result = router.execute(router.route(text))
+        assert result.success, result.error
+        print(f"{text:<36} → {result.output}  [{executor.invocations - before} call(s)]")
+        assert executor.invocations - before == 1
+    vocals = daw.find_track("Lead Vocals")
+    assert vocals.automation[0] == (1.0, -6.0) and vocals.automation[-1] == (5.0, -3.0)
+    print("✅ Rides written as bounded-error breakpoints in one call each")
@@ -0,0 +1,148 @@
+"""
+MiDAS AI - Batch Command Runner
+Groups queued commands into one osascript call per automation script
+
+Built by Jarvis & Adam - February 2026
+"""
+
+from pathlib import Path
+
+from script_result import decode_result
+
+# Separators understood by runBatch() in the automation scripts
+COMMAND_SEPARATOR = '\x1e'  # ASCII 30 (record separator)
+ARG_SEPARATOR = '\x1f'      # ASCII 31 (unit separator)
+
+# Scripts whose `on run argv` handler accepts "batch <payload>"
+BATCH_SCRIPTS = {'mixing.scpt', 'navigation.scpt', 'track_management.scpt', 'session_manager.scpt'}
+
+
+def encode_batch(commands):
+    """Serialize a list of argv-style commands into one batch payload"""
+    encoded = []
+    for args in commands:
+        clean = [str(arg).replace(COMMAND_SEPARATOR, ' ').replace(ARG_SEPARATOR, ' ')
+                 for arg in args]
+        encoded.append(ARG_SEPARATOR.join(clean))
+    return COMMAND_SEPARATOR.join(encoded)
+
+
+def decode_batch(output, expected=None):
+    """
+    Parse runBatch() output into one result per command
+    Entries are result envelopes (script_result.py) or, from older scripts,
+    "ok"/"error" + ASCII 31 + message.
+    Returns: list of {'success': bool, 'output': str, 'values': dict, 'ms': float or None}
+    """
+    output = output.rstrip('\n')
+    results = []
+
+    if output:
+        for entry in output.split(COMMAND_SEPARATOR):
+            if entry.lstrip().startswith('{'):
+                decoded = decode_result(entry)
+                results.append({
+                    'success': decoded['success'],
+                    'output': decoded['message'].strip(),
+                    'values': decoded['values'],
+                    'ms': decoded['ms']
+                })
+                continue
+            status, _, message = entry.partition(ARG_SEPARATOR)
+            results.append({
+                'success': status == 'ok',
+                'output': message.strip(),
+                'values': {},
+                'ms': None
+            })
+
+    # Pad if the script stopped early (every command gets a result)
+    if expected is not None:
+        while len(results) < expected:
+            results.append({'success': False, 'output': "No result returned", 'values': {}, 'ms': None})
+
+    return results
+
+
+class CommandBatch:
+    """Queue of commands that runs as few osascript processes as possible"""
+
+    def __init__(self, executor, timeout_per_command=10):
+        self.executor = executor
+        self.timeout_per_command = timeout_per_command
+        self.queued = []  # (script_path, args)
+
+    def add(self, script_path, args):
+        """Queue one command (args = [command, arg1, arg2, ...])"""
+        self.queued.append((Path(script_path), [str(a) for a in args]))
+
+    def __len__(self):
+        return len(self.queued)
+
+    def groups(self):
+        """
+        Split the queue into runs of consecutive commands for the same script.
+        Order is preserved; scripts without batch support get one group per command.
+        """
+        groups = []
+        for script_path, args in self.queued:
+            can_batch = script_path.name in BATCH_SCRIPTS
+            if groups and can_batch and groups[-1][0] == script_path:
+                groups[-1][1].append(args)
+            else:
+                groups.append((script_path, [args]))
+        return groups
+
+    def execute(self):
+        """
+        Run everything queued and clear the queue
+        Returns: one ExecutionResult per queued command, in queue order
+        """
+        results = []
+        for script_path, commands in self.groups():
+            results.extend(self.executor.run_batch(script_path, commands,
+                                                   timeout=self.timeout_per_command))
+        self.queued = []
+        return results
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    print("📦 MiDAS AI - Batch Command Runner")
+    print("=" * 60)
+    print()
+
+    from executor import DryRunExecutor
+
+    script_dir = Path(__file__).parent.parent / "logic-automation"
+    executor = DryRunExecutor()
+    batch = CommandBatch(executor)
+    batch.add(script_dir / "mixing.scpt", ['solo', 'vocals'])
+    batch.add(script_dir / "mixing.scpt", ['adjust', 'drums', '-3'])
+    batch.add(script_dir / "navigation.scpt", ['set-loop', '9', '17'])
+    batch.add(script_dir / "navigation.scpt", ['play'])
+    batch.add(script_dir / "mixing.scpt", ['unsolo-all'])
+
+    for script_path, commands in batch.groups():
+        print(f"{script_path.name}: {len(commands)} command(s) in one call")
+        for args in commands:
+            print(f"   → {args}")
+
+    payload = encode_batch([['solo', 'vocals'], ['adjust', 'drums', '-3'], ['mute', 'bass']])
+    fake_output = ARG_SEPARATOR.join(['ok', 'Soloed vocals']) + COMMAND_SEPARATOR + \
+        ARG_SEPARATOR.join(['error', 'Track not found: drums']) + COMMAND_SEPARATOR + \
+        '{"status":"ok","message":"Muted Bass","values":{"track":"Bass","mute":true},"ms":38.5}\n'
+    decoded = decode_batch(fake_output, expected=3)
+
+    print()
+    print(f"Payload length: {len(payload)} chars")
+    print(f"Decoded: {decoded}")
+    assert decoded[0]['success'] and not decoded[1]['success']
+    assert decoded[2]['values'] == {'track': 'Bass', 'mute': True} and decoded[2]['ms'] == 38.5
+    print("✅ Batch encode/decode OK")
+
+    batch.execute()
+    print(f"Dry run: {len(executor.calls)} commands in {executor.invocations} osascript calls")
@@ -3,13 +3,21 @@ Command Parser for MiDAS AI
 
 Maps voice commands to Logic Pro actions.
 Handles variations and fuzzy matching.
+
+With a take pipeline, "next take" / "keep it" only stop and re-arm;
+the take is processed in the background (take_pipeline.py). Every take is
+recorded in the take store (take_store.py), which answers take count and
+history queries without asking Logic.
 """
 
-import subprocess
 from typing import Optional, Callable, Dict
 from dataclasses import dataclass
 import difflib
 
+from executor import ExecutionResult, Executor, OsascriptExecutor
+from take_pipeline import TakePipeline
+from take_store import TakeStore
+
 @dataclass
 class Command:
     """Represents a recognized command."""
@@ -20,7 +28,23 @@ class Command:
 class Commander:
     """Parses voice commands and executes Logic Pro actions."""
     
-    def __init__(self):
+    # Actions that stop a take; pipelined they become stopTake + background processing
+    TAKE_ACTIONS = {"nextTake", "keepIt"}
+    
+    # Answered from the take store only (no punchobot handler)
+    STORE_ACTIONS = {"takeHistory", "keptTakes"}
+    
+    def __init__(self, executor: Optional[Executor] = None,
+                 take_pipeline: Optional[TakePipeline] = None,
+                 take_store: Optional[TakeStore] = None):
+        """
+        Args:
+            executor: Executor for punchobot handlers (default: real Logic Pro)
+            take_pipeline: background take processing (default: on, with its own
+                           osascript executor, for real Logic Pro; off otherwise)
+            take_store: take history (default: ~/.midas/takes.db for real Logic Pro,
+                        in-memory otherwise)
+        """
         # Command mappings (voice text -> action)
         self.commands = {
             # Phase 1: Punchobot
@@ -51,6 +75,10 @@ class Commander:
             # Utility
             "reset counter": "resetTakeCounter",
             "how many takes": "getTakeCount",
+            "take history": "takeHistory",
+            "list takes": "takeHistory",
+            "kept takes": "keptTakes",
+            "which takes did i keep": "keptTakes",
             
             # Future commands can be added here
         }
@@ -66,6 +94,14 @@ class Commander:
         
         # AppleScript file path
         self.script_path = "/Users/midas/Developer/MiDAS-AI/logic-automation/punchobot.scpt"
+        if take_pipeline is None and executor is None:
+            take_pipeline = TakePipeline(OsascriptExecutor(), self.script_path)
+        if take_store is None:
+            take_store = TakeStore() if executor is None else TakeStore(db_file=None)
+        self.executor = executor or OsascriptExecutor()
+        self.take_store = take_store
+        self.take_pipeline = None
+        self.set_take_pipeline(take_pipeline)
         
         # Callbacks for feedback
         self.on_command: Optional[Callable[[Command], None]] = None
@@ -119,58 +155,104 @@ class Commander:
         Returns:
             Response from AppleScript or None if failed
         """
-        try:
-            # Build osascript command
-            script_call = f"""
-            osascript {self.script_path} <<EOF
-            tell application "Logic Pro"
-                activate
-            end tell
-            
-            -- Load the script
-            set scriptFile to POSIX file "{self.script_path}"
-            set scriptObj to load script scriptFile
-            
-            -- Call the function
-            tell scriptObj
-                {command.action}()
-            end tell
-            EOF
-            """
-            
-            # Execute AppleScript
-            result = subprocess.run(
-                ["osascript", "-e", f'tell script "{self.script_path}" to {command.action}()'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                response = result.stdout.strip()
-                print(f"✓ Executed: {command.action}")
-                if response:
-                    print(f"  Response: {response}")
-                return response
-            else:
-                error = result.stderr.strip()
-                print(f"⚠️  Error executing {command.action}: {error}")
-                if self.on_error:
-                    self.on_error(error)
-                return None
-        
-        except subprocess.TimeoutExpired:
+        result = self.run(command.action)
+        
+        if result.success:
+            response = result.output
+            print(f"✓ Executed: {command.action}")
+            if response:
+                print(f"  Response: {response}")
+            return response
+        
+        if result.timed_out:
             error = f"Command {command.action} timed out"
             print(f"⏱️  {error}")
-            if self.on_error:
-                self.on_error(error)
-            return None
-        except Exception as e:
-            error = f"Exception executing {command.action}: {e}"
-            print(f"❌ {error}")
-            if self.on_error:
-                self.on_error(error)
-            return None
+        else:
+            error = result.error
+            print(f"⚠️  Error executing {command.action}: {error}")
+        if self.on_error:
+            self.on_error(error)
+        return None
+    
+    def set_take_pipeline(self, take_pipeline: Optional[TakePipeline]):
+        """Use a take pipeline (None = nextTake processes in the script)"""
+        self.take_pipeline = take_pipeline
+        if take_pipeline is not None and take_pipeline.on_complete is None:
+            take_pipeline.on_complete = self._take_processed
+    
+    def run(self, action: str, timeout: float = 10) -> ExecutionResult:
+        """
+        Run a punchobot action.
+        
+        Take count and history come from the take store. With a take
+        pipeline, nextTake/keepIt call stopTake() - the recording track is
+        re-armed before anything is processed - and queue the take.
+        
+        Returns:
+            ExecutionResult of the handler call (or the store's answer)
+        """
+        answer = self._answer_from_store(action)
+        if answer is not None:
+            return answer
+        
+        if self.take_pipeline is None or action not in self.TAKE_ACTIONS:
+            result = self.executor.call_handler(self.script_path, action, timeout=timeout)
+            if result.success:
+                self._record_take(action, result)
+            return result
+        
+        result = self.executor.call_handler(self.script_path, "stopTake", timeout=timeout)
+        if not result.success or "take" not in result.values:
+            return result  # wasn't recording
+        
+        take = result.values["take"]
+        self.take_store.finish("kept" if action == "keepIt" else "recorded")
+        depth = self.take_pipeline.submit(take)
+        done = "saved!" if action == "keepIt" else "recorded."
+        result.output = f"Take {take} {done} Ready for next ({depth} processing)"
+        return result
+    
+    def _record_take(self, action: str, result: ExecutionResult):
+        """Mirror a successful punchobot handler call in the take store"""
+        store = self.take_store
+        if action == "startPunch":
+            take = result.values.get("take")
+            if take is not None:
+                store.start(take)
+        elif action in self.TAKE_ACTIONS and result.output.startswith("Take "):
+            # Processed inside the script before it returned
+            store.finish("kept" if action == "keepIt" else "recorded", processed=True)
+        elif action == "trashIt" and result.output.startswith("Take deleted"):
+            store.finish("trashed")
+        elif action == "resetTakeCounter":
+            store.new_session()
+        elif action == "enterCompMode":
+            kept = [f"Take {t['take']}" for t in store.takes("kept")]
+            if kept:
+                result.output += f"\nKept: {', '.join(kept)}"
+    
+    def _take_processed(self, take, ok, message):
+        if ok:
+            self.take_store.mark_processed(take)
+    
+    def _answer_from_store(self, action: str) -> Optional[ExecutionResult]:
+        """Take queries answered locally (None = ask the script)"""
+        store = self.take_store
+        if action == "getTakeCount" and store.has_takes():
+            return ExecutionResult(True, output=f"Current take: {store.count()} "
+                                                f"({store.count('kept')} kept, {store.count('trashed')} trashed)")
+        if action == "takeHistory":
+            takes = store.takes()
+            if not takes:
+                return ExecutionResult(True, output="No takes yet")
+            lines = [f"Take {t['take']}: {t['status']}" + ("" if t['processed'] or t['status'] in
+                                                           ("recording", "trashed") else " (processing)")
+                     for t in takes]
+            return ExecutionResult(True, output="\n".join(lines))
+        if action == "keptTakes":
+            kept = [f"Take {t['take']}" for t in store.takes("kept")]
+            return ExecutionResult(True, output=f"Kept: {', '.join(kept)}" if kept else "No kept takes yet")
+        return None
     
     def handle_voice_input(self, text: str) -> bool:
         """
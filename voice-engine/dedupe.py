@@ -0,0 +1,121 @@
+"""
+MiDAS AI - Recognition Dedupe
+Drops the second copy of a command heard twice in quick succession
+
+Room echo and speaker bleed can make the recognizer deliver one utterance
+twice within a second. Executing both is harmless for "play" but not for
+"next take" or "duplicate track". Between recognition and execution, an
+intent with the same source, action and args as one accepted less than
+`window` seconds ago is suppressed - unless its action is declared
+repeatable (stepping commands people really do say back to back).
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import time
+from typing import Dict, Tuple
+
+# Seconds in which an identical intent counts as an echo
+DEFAULT_WINDOW = 1.0
+
+# (source, action) that are never suppressed - each repeat moves further
+REPEATABLE_ACTIONS = {
+    ('navigation', 'fast-forward'),
+    ('navigation', 'rewind'),
+    ('navigation', 'next-marker'),
+    ('navigation', 'prev-marker'),
+    ('navigation', 'adjust-tempo'),
+}
+
+
+class IntentDeduplicator:
+    """Suppresses identical intents seen within a time window"""
+
+    def __init__(self, window=DEFAULT_WINDOW, repeatable=None, clock=time.monotonic):
+        """
+        Args:
+            window: seconds an accepted intent blocks identical copies (0 = off)
+            repeatable: (source, action) pairs never suppressed (default REPEATABLE_ACTIONS)
+            clock: time source (seconds)
+        """
+        self.window = window
+        self.repeatable = set(REPEATABLE_ACTIONS if repeatable is None else repeatable)
+        self.clock = clock
+
+        self._accepted: Dict[Tuple, float] = {}  # intent key -> time it was accepted
+
+        self.accepted = 0
+        self.suppressed = 0
+        self.suppressed_by_action: Dict[str, int] = {}
+
+    def is_duplicate(self, source, action, args=()):
+        """
+        True if this intent is an echo and should not execute.
+        A False answer records the intent as accepted.
+        """
+        if self.window <= 0 or (source, action) in self.repeatable:
+            self.accepted += 1
+            return False
+
+        now = self.clock()
+        key = (source, action, tuple(str(a) for a in args))
+        seen = self._accepted.get(key)
+        if seen is not None and now - seen < self.window:
+            self.suppressed += 1
+            self.suppressed_by_action[action] = self.suppressed_by_action.get(action, 0) + 1
+            return True
+
+        # Forget entries that can no longer match
+        self._accepted = {k: t for k, t in self._accepted.items() if now - t < self.window}
+        self._accepted[key] = now
+        self.accepted += 1
+        return False
+
+    def reset(self):
+        self._accepted.clear()
+
+    def stats(self):
+        return {
+            'window': self.window,
+            'accepted': self.accepted,
+            'suppressed': self.suppressed,
+            'by_action': dict(self.suppressed_by_action),
+        }
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    print("🔁 MiDAS AI - Recognition Dedupe")
+    print("=" * 60)
+    print()
+
+    now = [0.0]
+    dedupe = IntentDeduplicator(window=1.0, clock=lambda: now[0])
+
+    # (seconds since start, source, action, args, expected duplicate)
+    heard = [
+        (0.00, 'punchobot', 'nextTake', [], False),
+        (0.35, 'punchobot', 'nextTake', [], True),        # echo
+        (0.50, 'track', 'duplicate', ['2'], False),
+        (0.80, 'track', 'duplicate', ['2'], True),        # speaker bleed
+        (0.90, 'track', 'duplicate', ['3'], False),       # different args
+        (1.20, 'navigation', 'next-marker', [], False),
+        (1.40, 'navigation', 'next-marker', [], False),   # repeatable
+        (2.10, 'punchobot', 'nextTake', [], False),       # window passed
+    ]
+
+    passed = 0
+    for at, source, action, args, expected in heard:
+        now[0] = at
+        dropped = dedupe.is_duplicate(source, action, args)
+        ok = dropped == expected
+        passed += ok
+        print(f"{'✅' if ok else '❌'} {at:4.2f}s {source}:{action} {args} → "
+              f"{'suppressed' if dropped else 'execute'}")
+
+    print()
+    print(f"Stats: {dedupe.stats()}")
+    print(f"RESULTS: {passed} passed, {len(heard) - passed} failed")
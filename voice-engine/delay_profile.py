@@ -0,0 +1,214 @@
+"""
+MiDAS AI - UI Delay Profile
+Settle times for template steps, calibrated from measured UI response times
+
+Session templates used to sleep a fixed 0.5 s / 0.3 s after every keystroke.
+Compiled template steps (session_parser.py) split into two kinds:
+
+- Steps with something to check (track created, name applied) poll and move
+  on as soon as Logic responds, reporting how long that took. They give up
+  only at a generous ceiling - the old fixed delay plus margin - so a slow
+  moment in Logic never aborts a template that used to work.
+- The color step can't check the UI and sleeps a blind settle time:
+
+    settle = percentile(responses) * headroom
+
+  clamped to [min_delay, the old fixed delay].
+
+A poll that hits its ceiling only says "Logic took at least this long" (a
+censored sample, as in latency_stats.py): it is counted instead of recorded,
+keeps that step's settle time at the default and raises its ceiling by a
+bounded step until the next real response. Samples persist between sessions.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import json
+from pathlib import Path
+
+from latency_stats import LatencyHistogram
+
+DEFAULT_PROFILE_FILE = Path.home() / '.midas' / 'delay_profile.json'
+
+# Step kind -> settle time (seconds) until calibrated: the delays session_manager.scpt slept
+DEFAULT_DELAYS = {
+    'create_track': 1.0,    # delay 0.5 inside createAudioTrack() + delay 0.5 after it
+    'rename_current': 0.3,
+    'color_current': 0.3,
+    'group_last': 0.5,
+}
+
+# Step kinds that poll the UI and end as soon as Logic responds
+POLLED_STEPS = {'create_track', 'rename_current', 'group_last'}
+
+
+class DelayProfile:
+    """Per-step settle times derived from observed UI responses"""
+
+    def __init__(self, profile_file=DEFAULT_PROFILE_FILE, percentile=95, headroom=1.5,
+                 min_delay=0.05, min_samples=5, window=100, save_every=20,
+                 margin=2.0, backoff_step=0.5, max_backoff_steps=2):
+        """
+        Args:
+            profile_file: JSON file for persistence (None = in-memory only)
+            percentile: response percentile the settle time is based on
+            headroom: multiplier applied to that percentile
+            min_delay: lower bound (seconds)
+            min_samples: responses needed before the default delay is replaced
+            window: samples kept per step kind
+            save_every: write the profile after this many new samples
+            margin: seconds a polled step waits beyond the old fixed delay
+            backoff_step: ceiling increase per consecutive timeout (fraction)
+            max_backoff_steps: consecutive timeouts that still raise the ceiling
+        """
+        self.profile_file = Path(profile_file) if profile_file else None
+        self.percentile = percentile
+        self.headroom = headroom
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.save_every = save_every
+        self.margin = margin
+        self.backoff_step = backoff_step
+        self.max_backoff_steps = max_backoff_steps
+
+        self.histograms = {}
+        self.censored = {}  # kind -> consecutive timeouts since the last real response
+        self._unsaved = 0
+        self.load()
+
+    def _calibrated(self, kind):
+        """percentile * headroom of the recorded responses, or None until calibrated"""
+        hist = self.histograms.get(kind)
+        if hist is None or len(hist) < self.min_samples:
+            return None
+        return hist.percentile(self.percentile) * self.headroom
+
+    def delay_for(self, kind):
+        """Blind settle time (seconds) for a step that can't check the UI"""
+        default = DEFAULT_DELAYS.get(kind, 0.5)
+        delay = self._calibrated(kind)
+        if delay is None or self.censored.get(kind):
+            return default
+        return round(min(max(delay, self.min_delay), default), 3)
+
+    def ceiling_for(self, kind):
+        """Longest a polling step waits (seconds): never below the old fixed delay plus margin"""
+        ceiling = max(DEFAULT_DELAYS.get(kind, 0.5) + self.margin, self._calibrated(kind) or 0)
+        steps = min(self.censored.get(kind, 0), self.max_backoff_steps)
+        return round(ceiling * (1 + self.backoff_step * steps), 3)
+
+    def wait_for(self, kind):
+        """A step's wait argument: its poll ceiling, or its settle time if it can't poll"""
+        return self.ceiling_for(kind) if kind in POLLED_STEPS else self.delay_for(kind)
+
+    def record(self, kind, seconds):
+        """Record one measured UI response"""
+        if kind not in self.histograms:
+            self.histograms[kind] = LatencyHistogram(self.window)
+        self.histograms[kind].record(seconds)
+        self.censored.pop(kind, None)
+        self._changed()
+
+    def record_timeout(self, kind):
+        """Record a poll that hit its ceiling - counted, not added to the samples"""
+        self.censored[kind] = self.censored.get(kind, 0) + 1
+        self._changed()
+
+    def _changed(self):
+        self._unsaved += 1
+        if self.profile_file and self._unsaved >= self.save_every:
+            self.save()
+
+    def stats(self):
+        """Per-kind response summary and current wait (ceiling or settle time)"""
+        report = {}
+        for kind in sorted(set(DEFAULT_DELAYS) | set(self.histograms)):
+            hist = self.histograms.get(kind, LatencyHistogram())
+            summary = hist.summary()
+            summary['timeouts'] = self.censored.get(kind, 0)
+            summary['wait'] = self.wait_for(kind)
+            report[kind] = summary
+        return report
+
+    def load(self):
+        """Load persisted samples (missing or corrupt file = defaults)"""
+        if not self.profile_file or not self.profile_file.exists():
+            return
+        try:
+            with open(self.profile_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for kind, samples in data.get('samples', {}).items():
+            self.histograms[kind] = LatencyHistogram(self.window, samples)
+        self.censored = dict(data.get('timeouts', {}))
+
+    def save(self):
+        """Write samples to the profile file"""
+        if not self.profile_file:
+            return
+        self.profile_file.parent.mkdir(parents=True, exist_ok=True)
+        data = {'samples': {kind: list(hist.samples) for kind, hist in self.histograms.items()},
+                'timeouts': self.censored}
+        with open(self.profile_file, 'w') as f:
+            json.dump(data, f)
+        self._unsaved = 0
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    print("⏲️  MiDAS AI - UI Delay Profile")
+    print("=" * 60)
+    print()
+
+    profile_file = Path(tempfile.mkdtemp()) / 'delay_profile.json'
+    profile = DelayProfile(profile_file=profile_file)
+
+    random.seed(3)
+    for _ in range(30):
+        profile.record('create_track', random.uniform(0.10, 0.20))
+        profile.record('rename_current', random.uniform(0.03, 0.08))
+        profile.record('color_current', random.uniform(0.05, 0.15))
+    profile.record('group_last', 0.9)  # one slow sample isn't enough to calibrate
+    profile.save()
+
+    print(f"{'step':<16} {'n':>4} {'p95':>6} {'default':>8} {'wait':>7}")
+    for kind, s in profile.stats().items():
+        p95 = f"{s['p95']:.2f}" if s['p95'] is not None else '-'
+        label = 'ceiling' if kind in POLLED_STEPS else 'settle'
+        print(f"{kind:<16} {s['count']:>4} {p95:>6} {DEFAULT_DELAYS[kind]:>7.2f}s {s['wait']:>6.2f}s {label}")
+
+    # Fast responses shorten the blind settle time, never a poll's ceiling
+    assert profile.delay_for('color_current') < DEFAULT_DELAYS['color_current']
+    for kind in POLLED_STEPS:
+        assert profile.wait_for(kind) >= DEFAULT_DELAYS[kind] + profile.margin
+
+    reloaded = DelayProfile(profile_file=profile_file)
+    assert reloaded.stats() == profile.stats()
+    print()
+    print("✅ Profile calibrated, persisted and reloaded")
+
+    # Timeouts are censored: they raise the ceiling a bounded step and hold the settle time
+    ceilings = [profile.ceiling_for('group_last')]
+    for _ in range(3):
+        profile.record_timeout('group_last')
+        ceilings.append(profile.ceiling_for('group_last'))
+    profile.record_timeout('color_current')
+    print(f"group_last ceiling after 0-3 timeouts: {ceilings}")
+    assert ceilings[0] < ceilings[1] < ceilings[2] == ceilings[3]  # bounded: max_backoff_steps = 2
+    assert profile.delay_for('color_current') == DEFAULT_DELAYS['color_current']
+    assert profile.histograms['group_last'].samples == reloaded.histograms['group_last'].samples
+
+    profile.save()
+    assert DelayProfile(profile_file=profile_file).ceiling_for('group_last') == ceilings[-1]
+    profile.record('group_last', 0.4)
+    assert profile.ceiling_for('group_last') == ceilings[0]
+    print("✅ Timeouts raise the ceiling instead of ratcheting it down")
@@ -0,0 +1,509 @@
+"""
+MiDAS AI - Command Executors
+Pluggable backends for running automation script commands
+
+- OsascriptExecutor: real Logic Pro via osascript (macOS)
+- DryRunExecutor: records every call, touches nothing
+- SimulatedExecutor: in-process simulated Logic Pro with configurable latency
+
+prewarm() gets a script ready ahead of a predicted command (next_command.py):
+osascript compiles a text script on every run, so OsascriptExecutor compiles
+it once with osacompile and runs the compiled copy while it is current.
+
+A scheduler job runs inside cancel_scope(token) with its CancelToken
+(scheduler.py). cancel() only interrupts the call in flight; the token makes
+the cancel stick, so a job that makes several calls (a macro, a snapshot
+recall) has every later call refused, and the token records whether a call
+was actually stopped.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from batch import BATCH_SCRIPTS, encode_batch, decode_batch
+from latency_stats import AdaptiveTimeouts, action_key
+from script_result import decode_result, encode_result
+from simulated_logic import SimulatedLogic
+
+DEFAULT_COMPILED_DIR = Path.home() / '.midas' / 'compiled'
+
+
+@dataclass
+class ExecutionResult:
+    """Outcome of one automation command"""
+    success: bool
+    output: str = ''
+    error: str = ''
+    timed_out: bool = False
+    cancelled: bool = False
+    elapsed: float = 0.0
+    values: dict = field(default_factory=dict)  # state the script read back (script_result.py)
+    script_ms: Optional[float] = None           # time spent inside the script
+
+
+def decoded_result(output):
+    """ExecutionResult for one script result envelope (or legacy text output)"""
+    decoded = decode_result(output)
+    if decoded['success']:
+        return ExecutionResult(True, output=decoded['message'], values=decoded['values'],
+                               script_ms=decoded['ms'])
+    return ExecutionResult(False, error=decoded['message'], values=decoded['values'],
+                           script_ms=decoded['ms'])
+
+
+class Executor:
+    """Base executor - subclasses implement _invoke(), _invoke_batch() and _invoke_handler()"""
+
+    def __init__(self, timeouts=None):
+        """
+        Args:
+            timeouts: AdaptiveTimeouts instance; None = always use the caller's timeout
+        """
+        self.timeouts = timeouts
+        self._local = threading.local()  # cancel token of the job running on this thread
+
+    @contextmanager
+    def cancel_scope(self, token):
+        """Run the block's calls under a job's CancelToken (scheduler.py)"""
+        previous = getattr(self._local, 'token', None)
+        self._local.token = token
+        try:
+            yield
+        finally:
+            self._local.token = previous
+
+    def _cancel_requested(self):
+        """True if the job running on this thread has been cancelled"""
+        token = getattr(self._local, 'token', None)
+        return token is not None and token.requested
+
+    def _note_cancelled(self, results):
+        """Mark the current job's token stopped if a call was cancelled"""
+        token = getattr(self._local, 'token', None)
+        if token is not None and any(result.cancelled for result in results):
+            token.stopped = True
+
+    def _cancelled_result(self):
+        return ExecutionResult(False, error="Command cancelled", cancelled=True)
+
+    def _timeout_for(self, key, default):
+        if self.timeouts is None:
+            return default
+        return self.timeouts.timeout_for(key, default)
+
+    def _record_latency(self, key, result):
+        if self.timeouts is None:
+            return
+        if result.timed_out:
+            self.timeouts.record_timeout(key)
+        elif result.success:
+            self.timeouts.record(key, result.elapsed)
+
+    def run(self, script_path, args, timeout=10):
+        """Run one command: osascript <script_path> <args...>"""
+        args = [str(a) for a in args]
+        key = action_key(script_path, args)
+        timeout = self._timeout_for(key, timeout)
+
+        start = time.perf_counter()
+        result = self._cancelled_result() if self._cancel_requested() else \
+            self._invoke(Path(script_path), args, timeout)
+        result.elapsed = time.perf_counter() - start
+
+        self._note_cancelled([result])
+        self._record_latency(key, result)
+        return result
+
+    def run_batch(self, script_path, commands, timeout=10):
+        """
+        Run several commands for one script.
+        Scripts with a batch entry point get a single invocation.
+        Returns: one ExecutionResult per command
+        """
+        script_path = Path(script_path)
+        commands = [[str(a) for a in args] for args in commands]
+
+        if len(commands) == 1 or script_path.name not in BATCH_SCRIPTS:
+            return [self.run(script_path, args, timeout) for args in commands]
+
+        keys = [action_key(script_path, args) for args in commands]
+        timeouts = [self._timeout_for(key, timeout) for key in keys]
+
+        start = time.perf_counter()
+        if self._cancel_requested():
+            results = [self._cancelled_result() for _ in commands]
+        else:
+            results = self._invoke_batch(script_path, commands, sum(timeouts))
+        elapsed = (time.perf_counter() - start) / len(commands)
+        self._note_cancelled(results)
+
+        for key, result in zip(keys, results):
+            result.elapsed = elapsed
+            self._record_latency(key, result)
+        return results
+
+    def call_handler(self, script_path, handler, timeout=10, args=()):
+        """Call a handler in a script library (tell script ... to handler(args))"""
+        key = action_key(script_path, [handler])
+        timeout = self._timeout_for(key, timeout)
+
+        start = time.perf_counter()
+        result = self._cancelled_result() if self._cancel_requested() else \
+            self._invoke_handler(Path(script_path), handler, [str(a) for a in args], timeout)
+        result.elapsed = time.perf_counter() - start
+
+        self._note_cancelled([result])
+        self._record_latency(key, result)
+        return result
+
+    def cancel(self):
+        """Abort the in-flight invocation; returns True if something was cancelled"""
+        return False
+
+    def prewarm(self, script_path):
+        """Get a script ready to run; returns True if it is warm"""
+        return False
+
+    def latency_stats(self):
+        """Per-action latency histogram summary and current timeouts"""
+        if self.timeouts is None:
+            return {}
+        return self.timeouts.stats()
+
+    def save_latency_stats(self):
+        """Persist latency stats (call on shutdown)"""
+        if self.timeouts is not None:
+            self.timeouts.save()
+
+    def _invoke(self, script_path, args, timeout):
+        raise NotImplementedError
+
+    def _invoke_batch(self, script_path, commands, timeout):
+        raise NotImplementedError
+
+    def _invoke_handler(self, script_path, handler, args, timeout):
+        raise NotImplementedError
+
+
+class OsascriptExecutor(Executor):
+    """Runs commands against Logic Pro with osascript"""
+
+    def __init__(self, timeouts=None, cancel_grace=0.5, compiled_dir=DEFAULT_COMPILED_DIR):
+        """
+        Args:
+            timeouts: AdaptiveTimeouts (default: learned, persisted in ~/.midas)
+            cancel_grace: seconds to wait after SIGTERM before SIGKILL on cancel
+            compiled_dir: where prewarm() keeps compiled scripts (None = never compile)
+        """
+        super().__init__(timeouts if timeouts is not None else AdaptiveTimeouts())
+        self.cancel_grace = cancel_grace
+        self.compiled_dir = Path(compiled_dir) if compiled_dir else None
+        self._process = None
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    def _spawn(self, cmd, timeout):
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+        except Exception as e:
+            return ExecutionResult(False, error=str(e))
+
+        with self._lock:
+            self._process = process
+            self._cancelled = False
+            if self._cancel_requested():
+                # cancel() ran between the token check and the spawn
+                self._cancelled = True
+                process.terminate()
+
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            return ExecutionResult(False, error="Command timed out", timed_out=True)
+        finally:
+            with self._lock:
+                self._process = None
+
+        if self._cancelled:
+            return ExecutionResult(False, error="Command cancelled", cancelled=True)
+        if process.returncode == 0:
+            return ExecutionResult(True, output=stdout.strip())
+        return ExecutionResult(False, error=stderr.strip())
+
+    def _spawn_decoded(self, cmd, timeout):
+        """Spawn, then decode the script's result envelope"""
+        result = self._spawn(cmd, timeout)
+        if not result.success:
+            return result
+        return decoded_result(result.output)
+
+    def cancel(self):
+        """Terminate the running osascript process (SIGTERM, then SIGKILL)"""
+        with self._lock:
+            process = self._process
+            if process is None:
+                return False
+            self._cancelled = True
+
+        process.terminate()
+        try:
+            process.wait(timeout=self.cancel_grace)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        return True
+
+    def _compiled(self, script_path):
+        """Compiled copy of a script, or None if there is no current one"""
+        if self.compiled_dir is None:
+            return None
+        compiled = self.compiled_dir / script_path.name
+        try:
+            if compiled.stat().st_mtime >= script_path.stat().st_mtime:
+                return compiled
+        except OSError:
+            pass
+        return None
+
+    def _runnable(self, script_path):
+        return self._compiled(script_path) or script_path
+
+    def prewarm(self, script_path):
+        """Compile the script so its next run skips osascript's compile step"""
+        script_path = Path(script_path)
+        if self.compiled_dir is None:
+            return False
+        if self._compiled(script_path):
+            return True
+        self.compiled_dir.mkdir(parents=True, exist_ok=True)
+        result = self._spawn(['osacompile', '-o', str(self.compiled_dir / script_path.name),
+                              str(script_path)], timeout=30)
+        return result.success
+
+    def _invoke(self, script_path, args, timeout):
+        return self._spawn_decoded(['osascript', str(self._runnable(script_path))] + args, timeout)
+
+    def _invoke_batch(self, script_path, commands, timeout):
+        result = self._spawn(['osascript', str(self._runnable(script_path)), 'batch',
+                              encode_batch(commands)], timeout)
+        if not result.success:
+            return [ExecutionResult(False, error=result.error, timed_out=result.timed_out)
+                    for _ in commands]
+
+        return [ExecutionResult(r['success'], output=r['output'] if r['success'] else '',
+                                error='' if r['success'] else r['output'],
+                                values=r['values'], script_ms=r['ms'])
+                for r in decode_batch(result.output + '\n', expected=len(commands))]
+
+    def _invoke_handler(self, script_path, handler, args, timeout):
+        # Handler libraries have no `on run`, so the envelope is built around the call
+        quoted = ", ".join('"' + a.replace('\\', '\\\\').replace('"', '\\"') + '"' for a in args)
+        return self._spawn_decoded(['osascript',
+                                    '-e', f'tell script "{self._runnable(script_path)}"',
+                                    '-e', 'set startMillis to nowMillis()',
+                                    '-e', f'return resultEnvelope({handler}({quoted}), startMillis)',
+                                    '-e', 'end tell'], timeout)
+
+
+class DryRunExecutor(Executor):
+    """Records calls instead of running them (for previews and tests)"""
+
+    def __init__(self, responses=None, timeouts=None):
+        super().__init__(timeouts)
+        self.calls = []  # (script name, args) per command, in order
+        self.invocations = 0  # process spawns a real run would have needed
+        self.responses = responses or {}  # command name -> canned output
+
+    def _record(self, script_path, args):
+        self.calls.append((script_path.name, list(args)))
+        return ExecutionResult(True, output=self.responses.get(args[0] if args else '', ''))
+
+    def _invoke(self, script_path, args, timeout):
+        self.invocations += 1
+        return self._record(script_path, args)
+
+    def _invoke_batch(self, script_path, commands, timeout):
+        self.invocations += 1
+        return [self._record(script_path, args) for args in commands]
+
+    def _invoke_handler(self, script_path, handler, args, timeout):
+        self.invocations += 1
+        return self._record(script_path, [handler] + args)
+
+
+class SimulatedExecutor(Executor):
+    """
+    Runs commands against an in-process SimulatedLogic.
+
+    Latency model (seconds):
+        spawn_latency   - cost of starting one osascript process
+        command_latency - cost of each command inside a process
+        action_latency  - per-command overrides, e.g. {'vocal_session': 4.0}
+        compile_latency - cost of compiling a script that was not pre-warmed
+    plus, with ui_waits, the delays and UI waits the script itself spends (SimulatedLogic.busy).
+    With realtime=False nothing sleeps; simulated time accumulates in virtual_time.
+    """
+
+    def __init__(self, daw=None, spawn_latency=0.0, command_latency=0.0,
+                 action_latency=None, realtime=True, timeouts=None, compile_latency=0.0,
+                 ui_waits=True):
+        super().__init__(timeouts)
+        self.daw = daw or SimulatedLogic()
+        self.spawn_latency = spawn_latency
+        self.command_latency = command_latency
+        self.action_latency = action_latency or {}
+        self.compile_latency = compile_latency
+        self.ui_waits = ui_waits
+        self.realtime = realtime
+        self.virtual_time = 0.0
+        self.invocations = 0
+        self.compiled = set()  # script names pre-warmed (compiled once)
+        self._cancel_event = threading.Event()
+        self._in_flight = False
+
+    def _wait(self, seconds):
+        """Spend simulated time; returns True if cancelled meanwhile"""
+        self.virtual_time += seconds
+        if self.realtime and seconds > 0:
+            return self._cancel_event.wait(seconds)
+        return self._cancel_event.is_set()
+
+    def _command(self, script_path, args, timeout=None):
+        latency = self.action_latency.get(args[0] if args else '', self.command_latency)
+        if timeout is not None and latency > timeout:
+            if self._wait(timeout):
+                return self._cancelled_result()
+            return ExecutionResult(False, error="Command timed out", timed_out=True)
+
+        if self._wait(latency):
+            return self._cancelled_result()
+        with self.daw.lock:
+            ok, message = self.daw.handle(script_path.name, args)
+            busy, values = self.daw.busy, dict(self.daw.last_values)
+        if self.ui_waits and self._wait(busy):
+            return self._cancelled_result()
+        # Same envelope round trip as a real script
+        return decoded_result(encode_result(ok, message, values, latency * 1000))
+
+    def _invoke(self, script_path, args, timeout):
+        return self._invoke_batch(script_path, [args], timeout)[0]
+
+    def _invoke_batch(self, script_path, commands, timeout):
+        self.invocations += 1
+        self._cancel_event.clear()
+        self._in_flight = True
+        if self._cancel_requested():
+            self._cancel_event.set()  # cancel() ran between the token check and this call
+        try:
+            compile_latency = 0.0 if script_path.name in self.compiled else self.compile_latency
+            if self._wait(self.spawn_latency + compile_latency):
+                return [self._cancelled_result() for _ in commands]
+
+            results = []
+            for args in commands:
+                if self._cancel_event.is_set():
+                    results.append(self._cancelled_result())
+                else:
+                    results.append(self._command(script_path, args,
+                                                 timeout if len(commands) == 1 else None))
+            return results
+        finally:
+            self._in_flight = False
+
+    def _invoke_handler(self, script_path, handler, args, timeout):
+        return self._invoke(script_path, [handler] + args, timeout)
+
+    def prewarm(self, script_path):
+        name = Path(script_path).name
+        if name not in self.compiled:
+            self._wait(self.compile_latency)
+            self.compiled.add(name)
+        return True
+
+    def cancel(self):
+        """Interrupt the simulated invocation (remaining batch commands are skipped)"""
+        if not self._in_flight:
+            return False
+        self._cancel_event.set()
+        return True
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    from mixing_parser import MixingParser
+
+    print("⚙️  MiDAS AI - Command Executors")
+    print("=" * 60)
+    print()
+
+    commands = [
+        "solo vocals",
+        "drums down 3",
+        "bass up a bit",
+        "mute guitars",
+        "unsolo all",
+        "set vocals to 0",
+    ] * 2
+
+    # Single commands vs one batch on a simulated Logic with 150 ms spawn cost
+    for label, use_batch in [("one call per command", False), ("batched", True)]:
+        executor = SimulatedExecutor(
+            SimulatedLogic(["Lead Vocals", "Drums", "Bass", "Guitars"]),
+            spawn_latency=0.150, command_latency=0.020, realtime=False
+        )
+        parser = MixingParser(executor=executor)
+
+        if use_batch:
+            results = parser.execute_batch(commands)
+        else:
+            results = [parser.execute(text) for text in commands]
+
+        ok = sum(1 for r in results if r['success'])
+        print(f"{label:>22}: {ok}/{len(commands)} ok, "
+              f"{executor.invocations} osascript spawns, "
+              f"{executor.virtual_time * 1000:.0f} ms simulated")
+
+    print()
+    dry = DryRunExecutor()
+    MixingParser(executor=dry).execute("vocals up 3 dB")
+    print(f"Dry run recorded: {dry.calls}")
+
+    # Adaptive timeouts: a hung 'mute' is cut off near its normal latency, not after 10 s
+    executor = SimulatedExecutor(
+        SimulatedLogic(["Lead Vocals", "Drums"]),
+        command_latency=0.05,
+        timeouts=AdaptiveTimeouts(stats_file=None, min_timeout=0.05)
+    )
+    parser = MixingParser(executor=executor)
+    for _ in range(10):
+        parser.execute("mute drums")
+    executor.action_latency['mute'] = 60.0  # simulate a hung UI automation
+    print()
+    waits = []
+    for attempt in range(4):
+        before = executor.virtual_time
+        parser.execute("mute drums")
+        waits.append(executor.virtual_time - before)
+        print(f"Hung command gave up after {waits[-1]:.2f} s "
+              f"(next timeout for mixing.mute: {executor.latency_stats()['mixing.mute']['timeout']:.2f} s)")
+    # Timeouts aren't latencies: the wait grows by bounded steps, then stops
+    assert waits[0] < waits[1] < waits[2] == waits[3] <= 2 * waits[0] + 1e-9
+    executor.action_latency['mute'] = 0.05
+    parser.execute("mute drums")
+    assert executor.latency_stats()['mixing.mute']['timeouts'] == 0
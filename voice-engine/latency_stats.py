@@ -0,0 +1,232 @@
+"""
+MiDAS AI - Latency Stats & Adaptive Timeouts
+Keeps a rolling latency histogram per action and derives timeouts from it
+
+Instead of a fixed 10-30 s timeout, each action gets
+    timeout = percentile(latencies) * headroom
+clamped to [min_timeout, max_timeout]. Stats persist between sessions.
+
+A command that times out never reports its latency - it only says "at
+least this long" (a censored sample), so it stays out of the histogram.
+Consecutive timeouts are counted instead, and each one raises the
+timeout by a bounded step (backoff_step, at most max_backoff_steps); the
+next real latency resets the count. A permanently hung command therefore
+can't push its own timeout up to the cap.
+
+One AdaptiveTimeouts can be shared by executors on different threads (the
+router's and the take pipeline's), so they learn into - and save - one file.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import json
+import math
+import threading
+from collections import deque
+from pathlib import Path
+
+DEFAULT_STATS_FILE = Path.home() / '.midas' / 'latency_stats.json'
+
+
+def action_key(script_path, args):
+    """Stats key for a command, e.g. 'mixing.mute' or 'session_manager.vocal_session'"""
+    action = args[0] if args else ''
+    return f"{Path(script_path).stem}.{action}"
+
+
+class LatencyHistogram:
+    """Rolling window of latency samples (seconds) for one action"""
+
+    def __init__(self, window=200, samples=None):
+        self.samples = deque(samples or [], maxlen=window)
+
+    def record(self, seconds):
+        self.samples.append(float(seconds))
+
+    def __len__(self):
+        return len(self.samples)
+
+    def percentile(self, pct):
+        """Nearest-rank percentile (None if empty)"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def summary(self):
+        return {
+            'count': len(self.samples),
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': max(self.samples) if self.samples else None,
+        }
+
+
+class AdaptiveTimeouts:
+    """Per-action timeouts derived from observed latency"""
+
+    def __init__(self, stats_file=DEFAULT_STATS_FILE, percentile=99, headroom=2.0,
+                 min_timeout=1.0, max_timeout=None, min_samples=5, window=200,
+                 save_every=20, backoff_step=0.5, max_backoff_steps=2):
+        """
+        Args:
+            stats_file: JSON file for persistence (None = in-memory only)
+            percentile: latency percentile the timeout is based on
+            headroom: multiplier applied to that percentile
+            min_timeout: lower bound (seconds)
+            max_timeout: upper bound (seconds); None = the caller's default timeout
+            min_samples: samples needed before the default timeout is replaced
+            window: samples kept per action
+            save_every: write stats to disk after this many new samples
+            backoff_step: timeout increase per consecutive timeout (fraction of the learned one)
+            max_backoff_steps: consecutive timeouts that still raise it
+        """
+        self.stats_file = Path(stats_file) if stats_file else None
+        self.percentile = percentile
+        self.headroom = headroom
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+        self.window = window
+        self.save_every = save_every
+        self.backoff_step = backoff_step
+        self.max_backoff_steps = max_backoff_steps
+
+        self.histograms = {}
+        self.censored = {}  # key -> consecutive timeouts since the last real latency
+        self._unsaved = 0
+        self._lock = threading.RLock()  # shared by executors on different threads
+        self.load()
+
+    def histogram(self, key):
+        if key not in self.histograms:
+            self.histograms[key] = LatencyHistogram(self.window)
+        return self.histograms[key]
+
+    def timeout_for(self, key, default):
+        """Timeout (seconds) for an action; falls back to default until enough samples"""
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None or len(hist) < self.min_samples:
+                return default
+
+            ceiling = self.max_timeout if self.max_timeout is not None else default
+            steps = min(self.censored.get(key, 0), self.max_backoff_steps)
+            timeout = hist.percentile(self.percentile) * self.headroom * (1 + self.backoff_step * steps)
+            return min(max(timeout, self.min_timeout), ceiling)
+
+    def record(self, key, seconds):
+        """Record one observed latency (a command that finished)"""
+        with self._lock:
+            self.histogram(key).record(seconds)
+            self.censored.pop(key, None)
+            self._changed()
+
+    def record_timeout(self, key):
+        """Record a timeout - counted, not added to the histogram"""
+        with self._lock:
+            self.censored[key] = self.censored.get(key, 0) + 1
+            self._changed()
+
+    def _changed(self):
+        self._unsaved += 1
+        if self.stats_file and self._unsaved >= self.save_every:
+            self.save()
+
+    def stats(self):
+        """Per-action summary including the current derived timeout"""
+        report = {}
+        with self._lock:
+            for key, hist in sorted(self.histograms.items()):
+                summary = hist.summary()
+                summary['timeouts'] = self.censored.get(key, 0)
+                summary['timeout'] = self.timeout_for(key, self.max_timeout or 10)
+                report[key] = summary
+        return report
+
+    def load(self):
+        """Load persisted samples (missing or corrupt file = start fresh)"""
+        if not self.stats_file or not self.stats_file.exists():
+            return
+        try:
+            with open(self.stats_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for key, samples in data.get('samples', {}).items():
+            self.histograms[key] = LatencyHistogram(self.window, samples)
+        self.censored = dict(data.get('timeouts', {}))
+
+    def save(self):
+        """Write samples to the stats file"""
+        if not self.stats_file:
+            return
+        self.stats_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {'samples': {key: list(hist.samples) for key, hist in self.histograms.items()},
+                    'timeouts': self.censored}
+            with open(self.stats_file, 'w') as f:
+                json.dump(data, f)
+            self._unsaved = 0
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    print("⏱️  MiDAS AI - Adaptive Timeouts")
+    print("=" * 60)
+    print()
+
+    stats_file = Path(tempfile.mkdtemp()) / 'latency_stats.json'
+    timeouts = AdaptiveTimeouts(stats_file=stats_file, max_timeout=30)
+
+    random.seed(1)
+    for _ in range(50):
+        timeouts.record('mixing.mute', random.uniform(0.15, 0.30))
+        timeouts.record('session_manager.vocal_session', random.uniform(4.0, 6.0))
+    timeouts.record('navigation.play', 0.2)
+    timeouts.save()
+
+    print(f"{'action':<32} {'n':>4} {'p50':>6} {'p99':>6} {'timeout':>8}")
+    for key, s in timeouts.stats().items():
+        p50 = f"{s['p50']:.2f}" if s['p50'] is not None else '-'
+        p99 = f"{s['p99']:.2f}" if s['p99'] is not None else '-'
+        print(f"{key:<32} {s['count']:>4} {p50:>6} {p99:>6} {s['timeout']:>7.1f}s")
+
+    reloaded = AdaptiveTimeouts(stats_file=stats_file, max_timeout=30)
+    assert reloaded.timeout_for('mixing.mute', 10) == timeouts.timeout_for('mixing.mute', 10)
+    assert reloaded.timeout_for('navigation.play', 10) == 10  # not enough samples yet
+    print()
+    print("✅ Stats persisted and reloaded")
+
+    # Two executors on two threads (router + take pipeline) share one instance and one file
+    import threading
+
+    from executor import SimulatedExecutor
+    from simulated_logic import SimulatedLogic
+
+    shared_file = Path(tempfile.mkdtemp()) / 'latency_stats.json'
+    shared = AdaptiveTimeouts(stats_file=shared_file, save_every=1)
+    scripts = Path(__file__).parent.parent / 'logic-automation'
+    daw = SimulatedLogic(["Drums"])
+    jobs = [(SimulatedExecutor(daw, realtime=False, timeouts=shared), scripts / 'mixing.scpt', ['mute', 'Drums']),
+            (SimulatedExecutor(daw, realtime=False, timeouts=shared), scripts / 'navigation.scpt', ['play'])]
+    workers = [threading.Thread(target=lambda e=e, p=p, a=a: [e.run(p, a) for _ in range(200)])
+               for e, p, a in jobs]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    jobs[0][0].save_latency_stats()
+    saved = AdaptiveTimeouts(stats_file=shared_file)
+    assert {key: len(hist) for key, hist in saved.histograms.items()} == {
+        'mixing.mute': 200, 'navigation.play': 200}, saved.histograms.keys()
+    print("✅ Two executors on two threads saved 400 samples to one stats file")
@@ -0,0 +1,240 @@
+"""
+MiDAS AI - Voice Macros
+Record a run of spoken commands once, replay it as one batch
+
+    "start macro drum check"   → recording
+    "bypass all plugins on track 3", "solo bass", "loop verse to chorus", "play"
+    "stop macro"               → saved as "drum check"
+    "run drum check"           → all four, no re-parsing
+
+Recording captures intents as the router executed them - mixing track
+names already resolved to channel references - so replay skips routing
+and resolution. Before anything is sent, the router re-checks those
+references against the track index (a renamed or moved track is resolved
+again; a deleted one stops the replay), then runs the steps through
+CommandBatch. Each macro keeps how long it took to dictate and execute
+live, and how long replays take. Macros persist between sessions.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+
+from latency_stats import LatencyHistogram
+
+DEFAULT_MACRO_FILE = Path.home() / '.midas' / 'macros.json'
+
+# (pattern, action) - 'run' only matches names of existing macros
+MACRO_COMMANDS = [
+    (re.compile(r'^(?:start|record|begin) macro (?P<name>.+)$'), 'start'),
+    (re.compile(r'^(?:stop|end|finish|save) (?:the )?macro$'), 'stop'),
+    (re.compile(r'^(?:discard|scrap) (?:the )?macro$'), 'discard'),
+    (re.compile(r'^(?:list|show) macros$'), 'list'),
+    (re.compile(r'^delete macro (?P<name>.+)$'), 'delete'),
+    (re.compile(r'^(?:run|play) macro (?P<name>.+)$'), 'run'),
+    (re.compile(r'^run (?P<name>.+)$'), 'run'),
+]
+
+
+def macro_key(name):
+    """Lookup key for a macro name"""
+    return " ".join(name.lower().split())
+
+
+class MacroStore:
+    """Saved macros, the one being recorded, and replay timings"""
+
+    def __init__(self, macro_file=DEFAULT_MACRO_FILE, clock=time.monotonic):
+        """
+        Args:
+            macro_file: JSON file for persistence (None = in-memory only)
+            clock: time source for dictation timing (seconds)
+        """
+        self.macro_file = Path(macro_file) if macro_file else None
+        self.clock = clock
+        self.macros = {}        # key -> {'name', 'steps', 'live_seconds', 'execute_seconds', 'replays'}
+        self.recording = None   # macro being recorded, plus 'started'
+        self.load()
+
+    def parse(self, text):
+        """
+        Match a macro command
+        Returns: (action, name) - name is None for stop/discard/list - or None
+        """
+        for pattern, action in MACRO_COMMANDS:
+            match = pattern.match(text)
+            if match is None:
+                continue
+            name = match.groupdict().get('name')
+            if action == 'run' and macro_key(name) not in self.macros:
+                continue
+            return (action, name)
+        return None
+
+    # ============================================================
+    # RECORDING
+    # ============================================================
+
+    def start(self, name):
+        """Start recording (replaces a recording in progress)"""
+        self.recording = {'name': name, 'steps': [], 'execute_seconds': 0.0,
+                          'started': self.clock()}
+
+    def capture(self, step, seconds):
+        """Add an executed step (a JSON-ready dict) to the recording"""
+        if self.recording is not None:
+            self.recording['steps'].append(step)
+            self.recording['execute_seconds'] += seconds
+
+    def stop(self):
+        """Finish recording; returns the saved macro (None if nothing was recorded)"""
+        recording, self.recording = self.recording, None
+        if recording is None or not recording['steps']:
+            return None
+
+        macro = {
+            'name': recording['name'],
+            'steps': recording['steps'],
+            'live_seconds': self.clock() - recording.pop('started'),
+            'execute_seconds': recording['execute_seconds'],
+            'replays': [],
+        }
+        self.macros[macro_key(macro['name'])] = macro
+        self.save()
+        return macro
+
+    def discard(self):
+        """Drop the recording in progress; True if there was one"""
+        recording, self.recording = self.recording, None
+        return recording is not None
+
+    # ============================================================
+    # SAVED MACROS
+    # ============================================================
+
+    def get(self, name):
+        return self.macros.get(macro_key(name))
+
+    def delete(self, name):
+        if self.macros.pop(macro_key(name), None) is None:
+            return False
+        self.save()
+        return True
+
+    def record_replay(self, name, seconds, window=50):
+        """Note how long a replay took (last window replays are kept)"""
+        macro = self.get(name)
+        if macro is not None:
+            macro['replays'] = (macro['replays'] + [seconds])[-window:]
+            self.save()
+
+    def stats(self, name):
+        """Live dictation vs replay timing for a macro (None if unknown)"""
+        macro = self.get(name)
+        if macro is None:
+            return None
+        replays = LatencyHistogram(samples=macro['replays']).summary()
+        return {
+            'steps': len(macro['steps']),
+            'live_seconds': macro['live_seconds'],
+            'execute_seconds': macro['execute_seconds'],
+            'replays': replays['count'],
+            'replay_p50': replays['p50'],
+            'speedup': (macro['live_seconds'] / replays['p50']) if replays['p50'] else None,
+        }
+
+    def load(self):
+        """Load saved macros (missing or corrupt file = none)"""
+        if not self.macro_file or not self.macro_file.exists():
+            return
+        try:
+            with open(self.macro_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for macro in data.get('macros', []):
+            self.macros[macro_key(macro['name'])] = macro
+
+    def save(self):
+        """Write saved macros to the macro file"""
+        if not self.macro_file:
+            return
+        self.macro_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.macro_file, 'w') as f:
+            json.dump({'macros': list(self.macros.values())}, f, indent=1)
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    import tempfile
+
+    from executor import SimulatedExecutor
+    from router import CommandRouter
+    from simulated_logic import SimulatedLogic
+
+    print("🎬 MiDAS AI - Voice Macros")
+    print("=" * 60)
+    print()
+
+    SPEAKING = 1.5  # seconds per spoken command (utterance + recognition)
+
+    daw = SimulatedLogic(["Lead Vocals", "Drums", "Bass", "Guitars"])
+    daw.add_marker("verse", 5)
+    daw.add_marker("chorus", 21)
+    daw.tracks[2].plugins = ["Channel EQ", "Compressor"]
+    executor = SimulatedExecutor(daw, spawn_latency=0.030, command_latency=0.005)
+    now = [0.0]
+    macro_file = Path(tempfile.mkdtemp()) / 'macros.json'
+    router = CommandRouter(executor=executor, dedupe_window=0,
+                           macros=MacroStore(macro_file, clock=lambda: now[0]))
+
+    dictated = ["start macro drum check", "bypass all plugins on track 3", "solo bass",
+                "drums down 2", "loop verse to chorus", "play", "stop macro"]
+    for text in dictated:
+        start = time.perf_counter()
+        result = router.execute(router.route(text))
+        now[0] += SPEAKING + time.perf_counter() - start
+        print(f"{text:<32} → {result.output or result.error}")
+        assert result.success, (text, result.error)
+
+    daw.playing = False
+    daw.tracks[2].solo = False
+    daw.tracks[1].volume_db = 0.0
+    daw.tracks.insert(0, daw.tracks.pop(3))  # Guitars moved to the top: references are stale
+    router.refresh_state()
+
+    print()
+    for _ in range(3):
+        before = executor.invocations
+        start = time.perf_counter()
+        result = router.execute(router.route("run drum check"))
+        cost = time.perf_counter() - start
+        print(f"{'run drum check':<32} → {result.output or result.error}  "
+              f"({executor.invocations - before} calls, {cost * 1000:.0f} ms)")
+        assert result.success, result.error
+    # "drums down 2" is relative: three replays, -6 dB
+    assert daw.find_track("Bass").solo and daw.find_track("Drums").volume_db == -6.0 and daw.playing
+
+    stats = router.macros.stats("drum check")
+    print()
+    print(f"Stats: {stats}")
+    print(f"Dictated live: {stats['live_seconds']:.1f} s ({stats['execute_seconds'] * 1000:.0f} ms executing) "
+          f"→ replay {stats['replay_p50'] * 1000:.0f} ms")
+
+    # Saved to disk; a deleted track stops the replay before anything is sent
+    reloaded = MacroStore(macro_file)
+    assert reloaded.get("Drum Check")['steps'] == router.macros.get("drum check")['steps']
+    daw.tracks = [t for t in daw.tracks if t.name != "Drums"]
+    router.refresh_state()
+    before = executor.invocations
+    result = router.execute(router.route("run drum check"))
+    assert not result.success and executor.invocations == before
+    print(f"After deleting Drums: {result.error}")
+    print("✅ Macro recorded, persisted, replayed as a batch and validated")
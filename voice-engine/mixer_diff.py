@@ -0,0 +1,110 @@
+"""
+MiDAS AI - Mixer Diff
+Minimal mixing.scpt commands to move the mixer from its current state to a target
+
+Resets and restores used to touch every channel. Diffing a mixer snapshot
+against the target sends only the channels that actually differ: a reset
+on a 120-track session where three faders moved is one snapshot plus three
+commands in one batched osascript call. The snapshot is taken for every
+reset - the shadow mixer can be up to 30 s old, and a fader moved by hand
+in that time would be skipped.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+from typing import Dict, List
+
+from project_state import TrackState
+from track_index import track_reference
+
+# Fader moves smaller than this are left alone (faderToDb() rounding noise)
+DB_TOLERANCE = 0.05
+
+
+def reset_volumes_target(tracks) -> Dict[str, TrackState]:
+    """Target for reset-all: every fader at 0 dB, mute/solo untouched"""
+    return {t.name: TrackState(t.name, 0.0, t.mute, t.solo) for t in tracks}
+
+
+def clear_mute_solo_target(tracks) -> Dict[str, TrackState]:
+    """Target for reset_mixer: nothing muted or soloed, faders untouched"""
+    return {t.name: TrackState(t.name, t.volume_db, False, False) for t in tracks}
+
+
+def plan_mixer_changes(current, target) -> List[List[str]]:
+    """
+    Commands that turn current into target
+    Args:
+        current: TrackState list in channel order (the shadow mixer)
+        target: {track name: TrackState}; tracks not in target are left alone
+    Returns: argv-style mixing.scpt commands addressed by track reference
+    """
+    commands = []
+    for index, track in enumerate(current, 1):
+        wanted = target.get(track.name)
+        if wanted is None:
+            continue
+
+        reference = track_reference(index, track.name)
+        if abs(track.volume_db - wanted.volume_db) > DB_TOLERANCE:
+            commands.append(['set', reference, f"{wanted.volume_db:g}"])
+        if track.mute != wanted.mute:
+            commands.append(['mute' if wanted.mute else 'unmute', reference])
+        if track.solo != wanted.solo:
+            commands.append(['solo' if wanted.solo else 'unsolo', reference])
+
+    return commands
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    from executor import SimulatedExecutor
+    from router import CommandRouter
+    from simulated_logic import SimulatedLogic
+
+    print("🎚️  MiDAS AI - Mixer Diff")
+    print("=" * 60)
+    print()
+
+    current = [TrackState("Kick", 0.0), TrackState("Snare", -3.0, mute=True),
+               TrackState("Bass", 2.0, solo=True), TrackState("Lead Vocal", 0.02)]
+    for args in plan_mixer_changes(current, reset_volumes_target(current)):
+        print(f"reset-all   → {args}")
+    for args in plan_mixer_changes(current, clear_mute_solo_target(current)):
+        print(f"reset_mixer → {args}")
+
+    # 120-track session: full reset vs diff
+    print()
+    for label, diffed in [("every channel", False), ("diff", True)]:
+        daw = SimulatedLogic([f"Track {i}" for i in range(1, 121)])
+        daw.tracks[4].volume_db, daw.tracks[40].volume_db = 3.0, -6.0
+        daw.tracks[7].mute, daw.tracks[90].solo = True, True
+        executor = SimulatedExecutor(daw, spawn_latency=0.150, command_latency=0.020, realtime=False)
+        router = CommandRouter(executor=executor)
+
+        for text in ["reset all volumes", "reset mixer"]:
+            intent = router.route(text)
+            if diffed:
+                result = router.execute(intent)
+            else:
+                result = executor.run(intent.script_path, intent.args)
+            print(f"{label:>14} '{text}': {result.output}")
+
+        assert all(t.volume_db == 0 and not t.mute and not t.solo for t in daw.tracks)
+        print(f"{'':>14} {daw.channel_writes} channel writes, {executor.invocations} osascript calls")
+
+    # Nothing to do: the snapshot, no writes
+    before = executor.invocations
+    print()
+    print(f"Already reset: {router.execute(router.route('reset mixer')).output} "
+          f"({executor.invocations - before} osascript call)")
+    assert executor.invocations - before == 1
+
+    # A fader moved by hand right after a snapshot is still reset
+    daw.tracks[12].volume_db = -4.0
+    result = router.execute(router.route("reset all volumes"))
+    print(f"Moved by hand: {result.output}")
+    assert daw.tracks[12].volume_db == 0
@@ -7,13 +7,17 @@ Built by Jarvis & Adam - February 2026
 
 import json
 import re
-import subprocess
 from pathlib import Path
 
+from batch import CommandBatch
+from executor import OsascriptExecutor
+from text_normalizer import strip_units
+
 class MixingParser:
-    def __init__(self):
+    def __init__(self, executor=None):
         self.commands_file = Path(__file__).parent / "mixing_commands.json"
         self.script_dir = Path(__file__).parent.parent / "logic-automation"
+        self.executor = executor or OsascriptExecutor()
         self.load_commands()
     
     def load_commands(self):
@@ -34,9 +38,8 @@ class MixingParser:
         if not amount_str:
             return None
         
-        # Remove common words
-        amount_str = amount_str.lower().strip()
-        amount_str = amount_str.replace('db', '').replace('decibel', '').strip()
+        # Remove units ("6 db", "6 decibels")
+        amount_str = strip_units(amount_str.lower())
         
         # Check fuzzy amounts
         if amount_str in self.fuzzy_amounts:
@@ -70,7 +73,7 @@ class MixingParser:
                 
                 regex_pattern = re.escape(pattern)
                 regex_pattern = regex_pattern.replace(r'\{track\}', r'(?P<track>[\w\s-]+?)')
-                regex_pattern = regex_pattern.replace(r'\{amount\}', r'(?P<amount>[\w\s.]+?)')
+                regex_pattern = regex_pattern.replace(r'\{amount\}', r'(?P<amount>[\w\s.-]+?)')
                 regex_pattern = regex_pattern.replace(r'\{group\}', r'(?P<group>[\w\s-]+?)')
                 regex_pattern = regex_pattern.replace(r'\{preset\}', r'(?P<preset>\w+)')
                 regex_pattern = '^' + regex_pattern + '$'
@@ -206,40 +209,63 @@ class MixingParser:
         print(f"🎛️  {message}")
         
         # Execute AppleScript
-        try:
-            result = subprocess.run(
-                ['osascript'] + params,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                # Parse AppleScript return value (if any)
-                output = result.stdout.strip()
-                return {
-                    'success': True,
-                    'message': message,
-                    'output': output,
-                    'command_type': cmd_type
-                }
-            else:
-                error = result.stderr.strip()
-                return {
-                    'success': False,
-                    'message': f"AppleScript error: {error}"
-                }
+        result = self.executor.run(params[0], params[1:], timeout=10)
         
-        except subprocess.TimeoutExpired:
+        if result.success:
+            return {
+                'success': True,
+                'message': message,
+                'output': result.output,
+                'command_type': cmd_type
+            }
+        elif result.timed_out:
             return {
                 'success': False,
                 'message': "Command timed out"
             }
-        except Exception as e:
+        else:
             return {
                 'success': False,
-                'message': f"Execution error: {str(e)}"
+                'message': f"AppleScript error: {result.error}"
             }
+    
+    def execute_batch(self, texts):
+        """
+        Parse and execute several mixing commands in one osascript call
+        Returns: one result dict per input text, in order
+        """
+        batch = CommandBatch(self.executor)
+        parsed = []
+        
+        for text in texts:
+            success, cmd_type, params, message = self.parse(text)
+            parsed.append((success, cmd_type, message))
+            if success:
+                batch.add(params[0], params[1:])
+        
+        if len(batch):
+            print(f"🎛️  Running {len(batch)} mixing commands as one batch")
+        batch_results = iter(batch.execute())
+        
+        results = []
+        for success, cmd_type, message in parsed:
+            if not success:
+                results.append({'success': False, 'message': message})
+                continue
+            
+            result = next(batch_results)
+            if result.success:
+                results.append({
+                    'success': True,
+                    'message': message,
+                    'output': result.output,
+                    'command_type': cmd_type
+                })
+            else:
+                results.append({'success': False, 'message': result.error})
+        
+        return results
+
 
 
 # ============================================================
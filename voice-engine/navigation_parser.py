@@ -2,19 +2,59 @@
 MiDAS AI - Navigation Command Parser
 Parses natural language navigation commands into AppleScript calls
 
+Marker jumps and loops are resolved against a marker table (loaded once from
+list-markers, kept current by create-marker) and sent as absolute bar
+positions, so the script doesn't walk Logic's marker list on every call.
+Names missing from the table still go to the script's own lookup.
+Parsing never touches Logic: resolve() looks markers up when the command
+runs (the router may parse while another command is still executing).
+
 Built by Jarvis & Adam - February 2026
 """
 
 import json
 import re
-import subprocess
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from batch import CommandBatch
+from executor import OsascriptExecutor
+from text_normalizer import strip_units
+
+# One listMarkers() line: "3. Chorus (bar 21)"
+MARKER_LINE = re.compile(r'^\s*\d+\.\s+(?P<name>.+?)\s+\(bar\s+(?P<position>[\d.,]+)\)\s*$')
+
+
+def parse_marker_list(output):
+    """[(name, bar)] from list-markers output, in the order Logic listed them"""
+    markers = []
+    for line in output.replace('\r', '\n').split('\n'):
+        match = MARKER_LINE.match(line)
+        if match:
+            markers.append((match.group('name'), float(match.group('position').replace(',', '.'))))
+    return markers
+
 
 class NavigationParser:
-    def __init__(self):
+    def __init__(self, executor=None, playhead=None):
+        """
+        Args:
+            executor: Executor for AppleScript calls
+            playhead: callable returning the current bar, or None if unknown
+                      (lets next/previous marker resolve locally)
+        """
         self.commands_file = Path(__file__).parent / "navigation_commands.json"
         self.script_dir = Path(__file__).parent.parent / "logic-automation"
+        self.executor = executor or OsascriptExecutor()
+        self.playhead = playhead
         self.load_commands()
+        
+        # Marker table: (bar, name) in song order + lowercase/normalized name -> (bar, name)
+        self.markers: List[Tuple[float, str]] = []
+        self.marker_names: Dict[str, Tuple[float, str]] = {}
+        self.markers_loaded = False
+        self.marker_hits = 0
+        self.marker_misses = 0
     
     def load_commands(self):
         """Load command patterns from JSON"""
@@ -29,8 +69,7 @@ class NavigationParser:
         if not amount_str:
             return None
         
-        amount_str = amount_str.lower().strip()
-        amount_str = amount_str.replace('bars', '').replace('bar', '').strip()
+        amount_str = strip_units(amount_str.lower())
         
         # Check fuzzy amounts
         if amount_str in self.fuzzy_amounts:
@@ -52,6 +91,131 @@ class NavigationParser:
         
         return section_lower
     
+    # ============================================================
+    # MARKER TABLE
+    # ============================================================
+    
+    def load_markers(self):
+        """Fill the marker table from list-markers (one call; failures leave it empty)"""
+        result = self.executor.run(self.script_dir / 'navigation.scpt', ['list-markers'], timeout=10)
+        self.set_markers(parse_marker_list(result.output) if result.success else [])
+    
+    def set_markers(self, markers):
+        """Replace the table with [(name, bar), ...]"""
+        self.markers = sorted((position, name) for name, position in markers)
+        self.marker_names = {}
+        for position, name in self.markers:
+            self._index_marker(name, position)
+        self.markers_loaded = True
+    
+    def add_marker(self, name, position):
+        """Record a marker created at position"""
+        self.markers.append((position, name))
+        self.markers.sort()
+        self._index_marker(name, position)
+    
+    def invalidate_markers(self):
+        """Reload the table before the next marker command (markers changed in Logic)"""
+        self.markers = []
+        self.marker_names = {}
+        self.markers_loaded = False
+    
+    def _index_marker(self, name, position):
+        # First marker wins, like the script's lookup
+        for key in (name.lower(), self.normalize_section_name(name)):
+            self.marker_names.setdefault(key, (position, name))
+    
+    def find_marker(self, name) -> Optional[Tuple[float, str]]:
+        """(bar, name) for a spoken marker name: exact or normalized, then first containing it"""
+        if not self.markers_loaded:
+            self.load_markers()
+        
+        name = name.lower().strip()
+        found = self.marker_names.get(name) or self.marker_names.get(self.normalize_section_name(name))
+        if found is None:
+            found = next((m for m in self.markers if name in m[1].lower()), None)
+        
+        if found is None:
+            self.marker_misses += 1
+        else:
+            self.marker_hits += 1
+        return found
+    
+    def adjacent_marker(self, direction) -> Optional[Tuple[float, str]]:
+        """(bar, name) of the next (+1) / previous (-1) marker, None if unknown locally"""
+        here = self.playhead() if self.playhead else None
+        if here is None:
+            return None
+        if not self.markers_loaded:
+            self.load_markers()
+        
+        if direction > 0:
+            candidates = [m for m in self.markers if m[0] > here]
+            found = candidates[0] if candidates else None
+        else:
+            candidates = [m for m in self.markers if m[0] < here]
+            found = candidates[-1] if candidates else None
+        
+        if found is None:
+            self.marker_misses += 1
+        else:
+            self.marker_hits += 1
+        return found
+    
+    def resolve(self, args):
+        """
+        Script args for a marker command, looked up when it runs: absolute
+        bars from the marker table (loaded on first use), or the script's
+        own lookup for markers the table doesn't have
+        args: command name, then arguments (as parsed)
+        """
+        cmd = args[0] if args else ''
+        
+        if cmd == 'jump-marker':
+            target = self.find_marker(args[1])
+            if target:
+                return ['locate', f"{target[0]:g}", target[1]]
+            return ['jump-marker', self.normalize_section_name(args[1])]
+        
+        if cmd in ('next-marker', 'prev-marker'):
+            target = self.adjacent_marker(1 if cmd == 'next-marker' else -1)
+            if target:
+                return ['locate', f"{target[0]:g}", target[1]]
+            return list(args)
+        
+        if cmd == 'jump-marker-num':
+            num = int(args[1])
+            if not self.markers_loaded:
+                self.load_markers()
+            if 1 <= num <= len(self.markers):
+                position, name = self.markers[num - 1]
+                return ['locate', f"{position:g}", name]
+            return list(args)
+        
+        if cmd == 'loop-between-markers':
+            start, end = self.find_marker(args[1]), self.find_marker(args[2])
+            if start and end:
+                return ['set-loop', f"{start[0]:g}", f"{end[0]:g}"]
+            return ['loop-between-markers', self.normalize_section_name(args[1]),
+                    self.normalize_section_name(args[2])]
+        
+        return list(args)
+    
+    def observe(self, cmd_type, args, output=''):
+        """Keep the marker table current after a command ran successfully"""
+        if cmd_type == 'list-markers':
+            self.set_markers(parse_marker_list(output))
+        elif cmd_type == 'create-marker' and self.markers_loaded:
+            here = self.playhead() if self.playhead else None
+            if here is None:
+                self.invalidate_markers()
+            else:
+                self.add_marker(args[0], here)
+    
+    def marker_stats(self):
+        return {'markers': len(self.markers), 'loaded': self.markers_loaded,
+                'hits': self.marker_hits, 'misses': self.marker_misses}
+    
     def match_pattern(self, text, patterns):
         """Match text against command patterns"""
         text_lower = text.lower().strip()
@@ -67,7 +231,7 @@ class NavigationParser:
             else:
                 # Convert pattern to regex
                 regex_pattern = re.escape(pattern)
-                regex_pattern = regex_pattern.replace(r'\{amount\}', r'(?P<amount>[\d\s]+?)')
+                regex_pattern = regex_pattern.replace(r'\{amount\}', r'(?P<amount>[\d\s]+?)(?: bars)?')
                 regex_pattern = regex_pattern.replace(r'\{marker\}', r'(?P<marker>[\w\s]+)')
                 regex_pattern = regex_pattern.replace(r'\{start_marker\}', r'(?P<start_marker>[\w\s]+?)')
                 regex_pattern = regex_pattern.replace(r'\{end_marker\}', r'(?P<end_marker>[\w\s]+)')
@@ -143,11 +307,11 @@ class NavigationParser:
             return (True, 'rewind', [script_path, 'rewind', str(amount)],
                     f"Jumping back {amount} bars")
         
-        # Marker navigation
+        # Marker navigation (the spoken name is kept - resolve() looks it up)
         elif cmd_type == 'jump_to_marker':
-            marker = params.get('marker')
-            marker = self.normalize_section_name(marker)
-            return (True, 'jump-marker', [script_path, 'jump-marker', marker],
+            spoken = params.get('marker').lower().strip()
+            marker = self.normalize_section_name(spoken)
+            return (True, 'jump-marker', [script_path, 'jump-marker', spoken],
                     f"Jumping to {marker}")
         
         elif cmd_type == 'marker_nav':
@@ -185,11 +349,12 @@ class NavigationParser:
         
         # Loop between markers
         elif cmd_type == 'loop_markers':
-            start_marker = self.normalize_section_name(params.get('start_marker', ''))
-            end_marker = self.normalize_section_name(params.get('end_marker', ''))
+            start_marker = params.get('start_marker', '').lower().strip()
+            end_marker = params.get('end_marker', '').lower().strip()
             return (True, 'loop-between-markers',
                     [script_path, 'loop-between-markers', start_marker, end_marker],
-                    f"Looping {start_marker} to {end_marker}")
+                    f"Looping {self.normalize_section_name(start_marker)} to "
+                    f"{self.normalize_section_name(end_marker)}")
         
         # Loop from here
         elif cmd_type == 'loop_from_here':
@@ -245,39 +410,71 @@ class NavigationParser:
         print(f"🎵 {message}")
         
         # Execute AppleScript
-        try:
-            result = subprocess.run(
-                ['osascript'] + params,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                output = result.stdout.strip()
-                return {
-                    'success': True,
-                    'message': message,
-                    'output': output,
-                    'command_type': cmd_type
-                }
-            else:
-                error = result.stderr.strip()
-                return {
-                    'success': False,
-                    'message': f"AppleScript error: {error}"
-                }
+        args = self.resolve(params[1:])
+        result = self.executor.run(params[0], args, timeout=10)
         
-        except subprocess.TimeoutExpired:
+        if result.success:
+            self.observe(args[0], args[1:], result.output)
+            return {
+                'success': True,
+                'message': message,
+                'output': result.output,
+                'command_type': cmd_type
+            }
+        elif result.timed_out:
             return {
                 'success': False,
                 'message': "Command timed out"
             }
-        except Exception as e:
+        else:
             return {
                 'success': False,
-                'message': f"Execution error: {str(e)}"
+                'message': f"AppleScript error: {result.error}"
             }
+    
+    def execute_batch(self, texts):
+        """
+        Parse and execute several navigation commands in one osascript call
+        Returns: one result dict per input text, in order
+        """
+        batch = CommandBatch(self.executor)
+        parsed = []
+        
+        for text in texts:
+            success, cmd_type, params, message = self.parse(text)
+            if success:
+                params = [params[0]] + self.resolve(params[1:])
+                cmd_type = params[1]
+                batch.add(params[0], params[1:])
+            parsed.append((success, cmd_type, params, message))
+        
+        if len(batch):
+            print(f"🎵 Running {len(batch)} navigation commands as one batch")
+        batch_results = iter(batch.execute())
+        
+        results = []
+        for success, cmd_type, params, message in parsed:
+            if not success:
+                results.append({'success': False, 'message': message})
+                continue
+            
+            result = next(batch_results)
+            if result.success:
+                if cmd_type == 'create-marker':
+                    self.invalidate_markers()  # playhead mid-batch isn't known here
+                else:
+                    self.observe(cmd_type, params[2:], result.output)
+                results.append({
+                    'success': True,
+                    'message': message,
+                    'output': result.output,
+                    'command_type': cmd_type
+                })
+            else:
+                results.append({'success': False, 'message': result.error})
+        
+        return results
+
 
 
 # ============================================================
@@ -329,3 +526,43 @@ if __name__ == "__main__":
     print("To test with Logic Pro:")
     print("  parser = NavigationParser()")
     print("  parser.execute('play')")
+    
+    # Marker table vs the script's marker lookup, on the simulated DAW
+    from executor import SimulatedExecutor
+    from router import CommandRouter
+    from simulated_logic import SimulatedLogic
+    
+    print()
+    session = ["jump to intro", "jump to chorus", "next marker", "marker 5", "previous marker",
+               "loop verse to chorus", "jump to verse 2", "mark this as solo", "jump to solo"]
+    for label, use_table in [("script lookup", False), ("marker table", True)]:
+        daw = SimulatedLogic(["Lead Vocal"])
+        for name, bar in [("Intro", 1), ("Verse 1", 5), ("Hook", 21), ("Verse 2", 37),
+                          ("Bridge", 53), ("Outro", 69)]:
+            daw.add_marker(name, bar)
+        executor = SimulatedExecutor(daw, realtime=False)
+        router = CommandRouter(executor=executor)
+        if not use_table:
+            router.navigation.set_markers([])  # every name falls through to the script
+        
+        ok = 0
+        for text in session:
+            before = daw.playhead
+            result = router.execute(router.route(text))
+            ok += result.success
+            if use_table:
+                print(f"   {text:<22} → {(result.output or result.error):<24} bar {before:g} → {daw.playhead:g}")
+        print(f"{label:>14}: {ok}/{len(session)} ok, {daw.marker_reads} markers read in Logic, "
+              f"{executor.invocations} osascript calls")
+    
+    print(f"Marker table: {router.navigation.marker_stats()}")
+    
+    # Routing never calls Logic (markers are looked up when the jump runs)
+    router.navigation.invalidate_markers()
+    before = executor.invocations
+    intent = router.route("jump to bridge")
+    assert executor.invocations == before and intent.action == 'jump-marker'
+    assert router.execute(intent).success and daw.playhead == 53
+    # Marker numbers start at 1 - "marker 0" isn't the last marker
+    assert router.navigation.resolve(['jump-marker-num', '0']) == ['jump-marker-num', '0']
+    print("✅ Markers resolved at execution, none read while routing")
@@ -0,0 +1,224 @@
+"""
+MiDAS AI - Next-Command Prediction
+First-order Markov model over executed actions, learned from the session log
+
+Sessions follow a handful of routines - "start punch" → "next take" →
+"keep it", "solo vocals" → "unsolo all" - so the action after the current
+one is usually predictable. Every executed intent is logged as
+'<source>.<action>' and counted as a transition from the action before it.
+When one successor clearly dominates, the router pre-warms it while the
+user is idle: compiles its script and resolves what it will need (track
+index, marker table, snapshot sections). A prediction is scored when the
+next action arrives; the pre-warm time counts as saved on a hit and wasted
+on a miss. The log persists between sessions.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import json
+from collections import Counter
+from pathlib import Path
+
+DEFAULT_LOG_FILE = Path.home() / '.midas' / 'session_log.json'
+
+
+def intent_key(source, action):
+    """Log key for an action, e.g. 'punchobot.nextTake' or 'mixing.solo'"""
+    return f"{source}.{action}"
+
+
+class NextCommandPredictor:
+    """Predicts the next action from transition counts"""
+
+    def __init__(self, log_file=DEFAULT_LOG_FILE, min_samples=3, threshold=0.5,
+                 max_sessions=50, save_every=20):
+        """
+        Args:
+            log_file: JSON session log (None = in-memory only)
+            min_samples: transitions seen from an action before it predicts anything
+            threshold: share of those transitions the predicted successor needs
+            max_sessions: past sessions kept in the log
+            save_every: write the log after this many new actions
+        """
+        self.log_file = Path(log_file) if log_file else None
+        self.min_samples = min_samples
+        self.threshold = threshold
+        self.max_sessions = max_sessions
+        self.save_every = save_every
+
+        self.sessions = []   # past sessions, each a list of keys
+        self.current = []    # this session's keys
+        self.transitions = {}  # key -> Counter of following keys
+        self._unsaved = 0
+
+        self._pending = None  # (predicted key, pre-warm seconds) awaiting the next action
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0.0
+        self.wasted = 0.0
+        self.load()
+
+    def train(self, sessions):
+        """Count transitions from past sessions (lists of keys)"""
+        for keys in sessions:
+            for previous, key in zip(keys, keys[1:]):
+                self.transitions.setdefault(previous, Counter())[key] += 1
+
+    def observe(self, key):
+        """Log an executed action; scores the pending prediction against it"""
+        if self._pending is not None:
+            predicted, seconds = self._pending
+            if key == predicted:
+                self.hits += 1
+                self.saved += seconds
+            else:
+                self.misses += 1
+                self.wasted += seconds
+            self._pending = None
+
+        if self.current:
+            self.transitions.setdefault(self.current[-1], Counter())[key] += 1
+        self.current.append(key)
+
+        self._unsaved += 1
+        if self.log_file and self._unsaved >= self.save_every:
+            self.save()
+
+    def predict(self, key=None):
+        """
+        Most likely action after key (default: the last observed)
+        Returns: (key, probability) or None if no successor is likely enough
+        """
+        if key is None:
+            key = self.current[-1] if self.current else None
+        following = self.transitions.get(key)
+        if not following:
+            return None
+
+        total = sum(following.values())
+        successor, count = following.most_common(1)[0]
+        probability = count / total
+        if total < self.min_samples or probability < self.threshold:
+            return None
+        return (successor, probability)
+
+    def record_prewarm(self, key, seconds):
+        """Note that key was pre-warmed (scored by the next observe())"""
+        self._pending = (key, seconds)
+
+    def stats(self):
+        scored = self.hits + self.misses
+        return {
+            'actions': len(self.current),
+            'predictions': scored,
+            'hits': self.hits,
+            'hit_rate': self.hits / scored if scored else None,
+            'saved': self.saved,
+            'wasted': self.wasted,
+        }
+
+    def load(self):
+        """Load and learn from the session log (missing or corrupt file = start fresh)"""
+        if not self.log_file or not self.log_file.exists():
+            return
+        try:
+            with open(self.log_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        self.sessions = [list(keys) for keys in data.get('sessions', [])][-self.max_sessions:]
+        self.train(self.sessions)
+
+    def save(self):
+        """Write past sessions plus this one to the log"""
+        if not self.log_file:
+            return
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        sessions = (self.sessions + [self.current])[-self.max_sessions:]
+        with open(self.log_file, 'w') as f:
+            json.dump({'sessions': sessions}, f)
+        self._unsaved = 0
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+
+    from executor import SimulatedExecutor
+    from router import CommandRouter
+    from simulated_logic import SimulatedLogic
+
+    print("🔮 MiDAS AI - Next-Command Prediction")
+    print("=" * 60)
+    print()
+
+    # Past sessions: punch-in loops and solo checks, with some noise
+    random.seed(7)
+    routines = [
+        ['punchobot.startPunch', 'punchobot.nextTake'],
+        ['punchobot.startPunch', 'punchobot.keepIt'],
+        ['punchobot.startPunch', 'punchobot.nextTake'],
+        ['mixing.solo', 'mixing.unsolo-all'],
+        ['navigation.jump-marker', 'navigation.play'],
+        ['mixing.adjust', 'mixing.status'],
+    ]
+    past = [sum((random.choice(routines) for _ in range(12)), []) for _ in range(10)]
+
+    log_file = Path(tempfile.mkdtemp()) / 'session_log.json'
+    with open(log_file, 'w') as f:
+        json.dump({'sessions': past}, f)
+    predictor = NextCommandPredictor(log_file=log_file)
+    for key in ['punchobot.startPunch', 'mixing.solo', 'mixing.adjust', 'navigation.play']:
+        print(f"after {key:<24} → {predictor.predict(key)}")
+
+    session = [
+        "start punch", "next take", "start punch", "next take", "start punch", "keep it",
+        "solo vocals", "unsolo all", "drums down 3", "what's drums at",
+        "jump to chorus", "play", "stop", "solo bass", "unsolo all",
+        "start punch", "next take", "start punch", "trash it", "start punch", "keep it",
+    ]
+
+    def run(predictor):
+        """Critical-path seconds per utterance (route + execute); pre-warm runs between"""
+        daw = SimulatedLogic(["Lead Vocals", "Drums", "Bass", "Guitars"])
+        daw.add_marker("verse", 5)
+        daw.add_marker("chorus", 21)
+        executor = SimulatedExecutor(daw, spawn_latency=0.030, command_latency=0.005,
+                                     compile_latency=0.040, realtime=True)
+        router = CommandRouter(executor=executor, dedupe_window=0, predictor=predictor)
+        latencies = []
+        for text in session:
+            start = time.perf_counter()
+            result = router.execute(router.route(text))
+            latencies.append(time.perf_counter() - start)
+            assert result.success, (text, result.error)
+            router.prewarm_next()  # the user is still talking - idle time
+        return latencies
+
+    cold = run(None)
+    warm = run(predictor)
+
+    print()
+    print(f"{'utterance':<18} {'no prediction':>14} {'pre-warmed':>11}")
+    for text, before, after in zip(session, cold, warm):
+        print(f"{text:<18} {before * 1000:>11.0f} ms {after * 1000:>8.0f} ms")
+
+    stats = predictor.stats()
+    print()
+    print(f"Stats: {stats}")
+    print(f"Hit rate {stats['hit_rate']:.0%}, {stats['saved'] * 1000:.0f} ms of work moved off "
+          f"the critical path ({stats['wasted'] * 1000:.0f} ms wasted on misses)")
+    print(f"Session total: {sum(cold) * 1000:.0f} ms → {sum(warm) * 1000:.0f} ms")
+    assert sum(warm) < sum(cold)
+
+    predictor.save()
+    reloaded = NextCommandPredictor(log_file=log_file)
+    assert len(reloaded.sessions) == len(past) + 1
+    assert reloaded.predict('punchobot.startPunch')[0] == 'punchobot.nextTake'
+    print("✅ Session log persisted and reloaded")
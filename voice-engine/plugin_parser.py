@@ -7,11 +7,13 @@ Built: February 18, 2026
 
 import json
 import re
-import subprocess
 from pathlib import Path
 
+from executor import OsascriptExecutor
+from track_selection import SELECTED, TrackSelection
+
 class PluginParser:
-    def __init__(self):
+    def __init__(self, executor=None, selection=None):
         # Load command patterns
         commands_file = Path(__file__).parent / 'plugin_commands.json'
         with open(commands_file, 'r') as f:
@@ -19,6 +21,10 @@ class PluginParser:
         
         # AppleScript file path
         self.script_path = Path(__file__).parent.parent / 'logic-automation' / 'plugin_control.scpt'
+        self.executor = executor or OsascriptExecutor()
+        
+        # Selected track for "load {plugin}" (shared with TrackParser by the router)
+        self.selection = selection or TrackSelection(self.executor)
         
     def parse(self, text):
         """Parse natural language command and return AppleScript command"""
@@ -116,7 +122,7 @@ class PluginParser:
             args = ['load_plugin', vars_dict['num'], plugin, '1']  # Default to slot 1
         elif action == 'load_plugin_selected':
             plugin = self._normalize_plugin_name(vars_dict['plugin'])
-            args = ['load_plugin', '1', plugin, '1']  # Current track, slot 1
+            args = ['load_plugin', SELECTED, plugin, '1']  # Current track (resolved when it runs), slot 1
         elif action == 'load_logic_plugin':
             # Extract plugin type from pattern
             args = ['load_logic', vars_dict['num'], 'compressor']  # Placeholder
@@ -204,41 +210,25 @@ class PluginParser:
         if not command:
             return {"success": False, "error": "No command parsed"}
         
-        try:
-            # Build osascript command
-            cmd = ['osascript', str(self.script_path)] + command['args']
-            
-            # Execute
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                return {
-                    "success": True,
-                    "output": result.stdout.strip(),
-                    "description": command['description']
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": result.stderr.strip(),
-                    "description": command['description']
-                }
+        args = self.selection.resolve(command['args'])
+        error = self.selection.check(args)
+        if error:
+            return {"success": False, "error": error, "description": command['description']}
         
-        except subprocess.TimeoutExpired:
+        # Execute AppleScript
+        result = self.executor.run(self.script_path, args, timeout=10)
+        
+        if result.success:
+            self.selection.observe(self.script_path.name, args)
             return {
-                "success": False,
-                "error": "Command timed out",
+                "success": True,
+                "output": result.output,
                 "description": command['description']
             }
-        except Exception as e:
+        else:
             return {
                 "success": False,
-                "error": str(e),
+                "error": result.error,
                 "description": command['description']
             }
     
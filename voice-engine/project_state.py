@@ -0,0 +1,670 @@
+"""
+MiDAS AI - Shadow Project State
+In-process copy of mixer and transport state so queries skip osascript
+
+Seeded from project_analyzer.scpt's JSON `snapshot` (the whole project in
+one call) or the smaller mixing/navigation snapshots, and kept current by
+applying every successful write the router executes. Each section has a
+staleness bound; a query on a stale section refreshes it first.
+
+    mixer    - tracks: fader dB, mute, solo
+    plugins  - track types, colors and insert plugins (full snapshot only)
+    tempo    - project tempo
+    markers  - marker names and positions
+    position - playhead, extrapolated while playing (transport_clock.py)
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from batch import ARG_SEPARATOR, COMMAND_SEPARATOR
+from executor import ExecutionResult
+from simulated_logic import clamp_db
+from track_index import GROUP_SEPARATOR, parse_track_reference
+from transport_clock import TransportClock
+
+SCRIPT_DIR = Path(__file__).parent.parent / "logic-automation"
+
+# Seconds a section stays trustworthy without a snapshot (Logic can be edited by hand)
+DEFAULT_MAX_AGE = {
+    'mixer': 30.0,
+    'plugins': 120.0,
+    'tempo': 120.0,
+    'markers': 120.0,
+    'position': 30.0,
+}
+
+# Which script's snapshot fills which sections
+FULL_SNAPSHOT_SCRIPT = 'project_analyzer.scpt'
+SNAPSHOT_SCRIPTS = {
+    'mixing.scpt': ('mixer',),
+    'navigation.scpt': ('tempo', 'markers', 'position'),
+}
+
+# (source, action) -> section a query reads
+QUERY_SECTIONS = {
+    ('mixing', 'status'): 'mixer',
+    ('mixing', 'list'): 'mixer',
+    ('navigation', 'get-tempo'): 'tempo',
+    ('navigation', 'get-position'): 'position',
+}
+
+# setVolumePreset() in mixing.scpt
+VOLUME_PRESETS = {'loud': 3, 'normal': 0, 'quiet': -6, 'whisper': -12}
+
+# Navigation commands that move the playhead, change play state, tempo or cycle
+TRANSPORT_ACTIONS = {
+    'play', 'stop', 'pause', 'toggle-play', 'rewind-start', 'fast-forward', 'rewind',
+    'locate', 'jump-marker', 'jump-marker-num', 'next-marker', 'prev-marker',
+    'set-loop', 'toggle-loop', 'loop-selection', 'loop-between-markers', 'loop-from-here',
+    'set-tempo', 'adjust-tempo',
+}
+
+# Plugin commands that change a track's inserts
+PLUGIN_ACTIONS = {'load_plugin', 'load_logic', 'vocal_chain', 'drum_bus', 'remove', 'remove_all'}
+
+# Track/session commands that change which tracks exist or their names
+TRACK_LAYOUT_ACTIONS = {
+    'create_audio', 'create_midi', 'create_aux', 'duplicate', 'delete', 'rename',
+    'group', 'group_named', 'ungroup', 'ungroup_named', 'move_up', 'move_down', 'move_up_amount', 'move_down_amount',
+    'move_to_top', 'move_to_bottom',
+    'vocal_session', 'beat_session', 'full_song_session',
+}
+
+
+@dataclass
+class TrackState:
+    """Mixer state of one track"""
+    name: str
+    volume_db: float = 0.0
+    mute: bool = False
+    solo: bool = False
+    kind: Optional[str] = None             # audio / midi / aux / folder (None = unknown)
+    plugins: Optional[List[str]] = None    # insert slots in order (None = unknown)
+    color: Optional[str] = None            # palette color name (None = unknown)
+
+
+@dataclass
+class MarkerState:
+    """One marker (position in bars)"""
+    name: str
+    position: float
+
+
+@dataclass
+class ProjectState:
+    """Everything the shadow model knows about the open project"""
+    tracks: List[TrackState] = field(default_factory=list)
+    markers: List[MarkerState] = field(default_factory=list)
+    transport: TransportClock = field(default_factory=TransportClock)
+
+    @property
+    def tempo(self) -> Optional[float]:
+        return self.transport.tempo
+
+    @property
+    def playhead(self) -> Optional[float]:
+        """Playhead in bars right now (extrapolated while playing)"""
+        return self.transport.position()
+
+    @property
+    def playing(self) -> bool:
+        return self.transport.playing
+
+    def find_track(self, name):
+        """First track whose name contains name (case-insensitive, like findTrack())"""
+        reference = parse_track_reference(name)
+        if reference:
+            index, name = reference
+            if index <= len(self.tracks) and self.tracks[index - 1].name == name:
+                return self.tracks[index - 1]
+
+        name = name.lower()
+        for track in self.tracks:
+            if name in track.name.lower():
+                return track
+        return None
+
+    def find_marker(self, name):
+        name = name.lower()
+        for marker in self.markers:
+            if name in marker.name.lower():
+                return marker
+        return None
+
+    def track_at(self, number):
+        """Track by 1-based channel number"""
+        if 1 <= number <= len(self.tracks):
+            return self.tracks[number - 1]
+        return None
+
+
+def parse_snapshot(output):
+    """
+    Parse `snapshot` output from mixing.scpt / navigation.scpt
+    Returns: dict with any of 'tracks', 'markers', 'tempo', 'position', 'playing',
+             'cycle' ((enabled, start, end))
+    """
+    parsed = {}
+    for record in output.strip().split(COMMAND_SEPARATOR):
+        fields = record.strip('\r\n').split(ARG_SEPARATOR)
+        kind = fields[0]
+
+        if kind == 'track' and len(fields) == 5:
+            parsed.setdefault('tracks', []).append(TrackState(
+                fields[1], float(fields[2]), fields[3] == 'true', fields[4] == 'true'))
+        elif kind == 'marker' and len(fields) == 3:
+            parsed.setdefault('markers', []).append(MarkerState(fields[1], float(fields[2])))
+        elif kind in ('tempo', 'position') and len(fields) == 2:
+            parsed[kind] = float(fields[1])
+        elif kind == 'playing' and len(fields) == 2:
+            parsed['playing'] = fields[1] == 'true'
+        elif kind == 'cycle' and len(fields) == 4:
+            parsed['cycle'] = (fields[1] == 'true', float(fields[2]), float(fields[3]))
+
+    return parsed
+
+
+def parse_project_json(output):
+    """
+    Parse project_analyzer.scpt's JSON snapshot (same shape as parse_snapshot())
+    Raises ValueError on anything that isn't a snapshot document.
+    """
+    data = json.loads(output)
+    if not isinstance(data, dict) or 'tracks' not in data:
+        raise ValueError("Not a project snapshot")
+
+    parsed = {
+        'tracks': [TrackState(t['name'], float(t.get('volume_db', 0.0)),
+                              bool(t.get('mute', False)), bool(t.get('solo', False)),
+                              t.get('type'), t.get('plugins'), t.get('color'))
+                   for t in data['tracks']],
+        'markers': [MarkerState(m['name'], float(m['position'])) for m in data.get('markers', [])],
+        'playing': bool(data.get('playing', False)),
+    }
+    for key in ('tempo', 'position'):
+        if data.get(key) is not None:
+            parsed[key] = float(data[key])
+    cycle = data.get('cycle')
+    if cycle:
+        parsed['cycle'] = (bool(cycle['enabled']), float(cycle['start']), float(cycle['end']))
+    return parsed
+
+
+class ProjectStateCache:
+    """Answers status/list/tempo/position queries from the shadow state"""
+
+    def __init__(self, executor, max_age=None, clock=time.monotonic):
+        """
+        Args:
+            executor: Executor used for snapshots
+            max_age: {section: seconds} overrides for DEFAULT_MAX_AGE
+            clock: time source (seconds)
+        """
+        self.executor = executor
+        self.clock = clock
+        self.max_age = dict(DEFAULT_MAX_AGE)
+        self.max_age.update(max_age or {})
+
+        self.state = ProjectState(transport=TransportClock(clock=clock))
+        self.tracks_version = 0  # bumped whenever the track list is replaced
+        self.refreshed_at: Dict[str, Optional[float]] = {s: None for s in DEFAULT_MAX_AGE}
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    # ============================================================
+    # FRESHNESS
+    # ============================================================
+
+    def is_fresh(self, section):
+        refreshed = self.refreshed_at[section]
+        if refreshed is None:
+            return False
+        if section == 'position' and self.state.playing:
+            # Extrapolated locally until the next resync is due
+            transport = self.state.transport
+            return transport.known() and not transport.needs_resync()
+        return self.clock() - refreshed <= self.max_age[section]
+
+    def invalidate(self, *sections):
+        """Mark sections (default: all) as needing a snapshot"""
+        for section in sections or self.refreshed_at:
+            self.refreshed_at[section] = None
+
+    def _touch(self, *sections):
+        now = self.clock()
+        for section in sections:
+            self.refreshed_at[section] = now
+
+    # ============================================================
+    # SNAPSHOTS
+    # ============================================================
+
+    def ensure_fresh(self, *sections):
+        """Refresh whichever of sections are stale; True if all are fresh afterwards"""
+        stale = [s for s in sections if not self.is_fresh(s)]
+        if stale:
+            self.refresh(stale)
+        return all(self.is_fresh(s) for s in sections)
+
+    def refresh(self, sections=None):
+        """
+        Re-read sections (default: all) from Logic.
+        Needs spanning several scripts (or plugin data) use the full JSON
+        snapshot - one call - and fall back to one snapshot per script.
+        Returns: True if every requested section was refreshed
+        """
+        wanted = set(sections or self.refreshed_at)
+        self.refreshes += 1
+
+        scripts = [name for name, covered in SNAPSHOT_SCRIPTS.items() if wanted.intersection(covered)]
+        if 'plugins' in wanted or len(scripts) > 1:
+            result = self.executor.run(SCRIPT_DIR / FULL_SNAPSHOT_SCRIPT, ['snapshot'], timeout=10)
+            if result.success:
+                try:
+                    self.load_snapshot(parse_project_json(result.output), tuple(self.refreshed_at))
+                    return True
+                except (ValueError, KeyError, TypeError):
+                    pass
+
+        ok = 'plugins' not in wanted
+        for script_name, covered in SNAPSHOT_SCRIPTS.items():
+            if not wanted.intersection(covered):
+                continue
+            result = self.executor.run(SCRIPT_DIR / script_name, ['snapshot'], timeout=10)
+            if not result.success:
+                ok = False
+                continue
+            try:
+                snapshot = parse_snapshot(result.output)
+            except ValueError:
+                ok = False  # unreadable output keeps the old state
+                continue
+            self.load_snapshot(snapshot, covered)
+
+        return ok
+
+    def load_snapshot(self, snapshot, sections):
+        """Replace sections with parsed snapshot data"""
+        if 'mixer' in sections:
+            tracks = snapshot.get('tracks', [])
+            known = {t.name: t for t in self.state.tracks}
+            for track in tracks:
+                if track.name not in known:
+                    continue
+                if 'plugins' not in sections:
+                    # Mixer-only snapshot: keep what we knew about types and plugins
+                    track.kind, track.plugins = known[track.name].kind, known[track.name].plugins
+                if track.color is None:
+                    # Logic doesn't always report colors - keep the last one we set
+                    track.color = known[track.name].color
+            self.state.tracks = tracks
+            self.tracks_version += 1
+        if 'markers' in sections:
+            self.state.markers = sorted(snapshot.get('markers', []), key=lambda m: m.position)
+        transport = self.state.transport
+        if 'position' in sections:
+            transport.sync(snapshot.get('position'), snapshot.get('playing', False),
+                           snapshot.get('tempo') if 'tempo' in sections else None,
+                           snapshot.get('cycle'))
+        elif 'tempo' in sections and snapshot.get('tempo') is not None:
+            transport.set_tempo(snapshot['tempo'])
+        self._touch(*sections)
+
+    def sync_transport(self, values):
+        """Resync the transport clock from a navigation result's values (transportValues())"""
+        try:
+            snapshot = {
+                'position': float(values['position']),
+                'playing': bool(values['playing']),
+                'tempo': float(values['tempo']),
+                'cycle': (bool(values['cycle']), float(values['cycle_start']),
+                          float(values['cycle_end'])),
+            }
+        except (KeyError, TypeError, ValueError):
+            self.invalidate('position')
+            return False
+        self.load_snapshot(snapshot, ('tempo', 'position'))
+        return True
+
+    # ============================================================
+    # QUERIES
+    # ============================================================
+
+    def current_position(self) -> Optional[float]:
+        """Playhead if the position section is fresh, else None (never calls Logic)"""
+        return self.state.playhead if self.is_fresh('position') else None
+
+    def answer(self, intent) -> Optional[ExecutionResult]:
+        """
+        Answer a query intent from the shadow state.
+        Returns: ExecutionResult, or None if the query has to go to Logic
+        """
+        section = QUERY_SECTIONS.get((intent.source, intent.action))
+        if section is None:
+            return None
+
+        if not self.is_fresh(section):
+            self.misses += 1
+            self.refresh([section])
+            if not self.is_fresh(section):
+                return None
+        else:
+            self.hits += 1
+
+        state = self.state
+        if intent.action == 'status':
+            name = intent.args[1]
+            track = state.find_track(name)
+            if track is None:
+                return ExecutionResult(False, error=f"Track not found: {name}")
+            status = f"{name}: {round(track.volume_db)} dB"
+            if track.mute:
+                status += " (muted)"
+            if track.solo:
+                status += " (solo)"
+            return ExecutionResult(True, output=status)
+
+        if intent.action == 'list':
+            lines = [f"{t.name}: {round(t.volume_db)} dB" for t in state.tracks]
+            return ExecutionResult(True, output="\n".join(lines))
+
+        if intent.action == 'get-tempo':
+            return ExecutionResult(True, output=f"Tempo: {state.tempo:g} BPM")
+
+        return ExecutionResult(True, output=state.transport.describe())
+
+    # ============================================================
+    # WRITES
+    # ============================================================
+
+    def observe(self, intent, result):
+        """Apply a successfully executed write to the shadow state"""
+        if not result.success:
+            return
+
+        if intent.source == 'mixing':
+            self._observe_mixing(intent.action, intent.args[1:], result.values)
+        elif intent.source == 'navigation':
+            self._observe_navigation(intent.action, intent.args[1:])
+            if 'position' in result.values:
+                self.sync_transport(result.values)
+        elif intent.source in ('track', 'session'):
+            if intent.action in TRACK_LAYOUT_ACTIONS:
+                self.invalidate('mixer', 'plugins')
+            elif intent.action == 'color':
+                track = self.state.track_at(int(intent.args[1]))
+                if track is not None:
+                    track.color = intent.args[2]
+            elif intent.action == 'reset_mixer':
+                for track in self.state.tracks:
+                    track.mute = track.solo = False
+            elif intent.action == 'set_tempo':
+                self.state.transport.set_tempo(float(intent.args[1]))
+                self._touch('tempo')
+        elif intent.source == 'plugin' and intent.action in PLUGIN_ACTIONS:
+            self.invalidate('plugins')
+        elif intent.source == 'punchobot':
+            if intent.action == 'startPunch':
+                self.state.transport.play()
+            elif intent.action in ('nextTake', 'keepIt', 'trashIt'):
+                self.state.transport.stop()
+                self.invalidate('position')
+
+    def _observe_mixing(self, action, args, values):
+        tracks = self.state.tracks
+
+        if action == 'unsolo-all':
+            for track in tracks:
+                track.solo = False
+        elif action == 'reset-all':
+            for track in tracks:
+                track.volume_db = 0.0
+        elif action == 'group-adjust':
+            pattern, change = args[0], float(args[1])
+            if parse_track_reference(pattern):
+                matched = [self.state.find_track(ref) for ref in pattern.split(GROUP_SEPARATOR)]
+            else:
+                matched = [t for t in tracks if pattern.lower() in t.name.lower()]
+            for track in matched:
+                if track is not None:
+                    track.volume_db = clamp_db(track.volume_db + change)
+        elif action in ('adjust', 'set', 'preset', 'mute', 'unmute',
+                        'toggle-mute', 'solo', 'unsolo'):
+            track = self.state.find_track(args[0])
+            if track is None:
+                self.invalidate('mixer')  # Logic found a track we don't know about
+                return
+
+            if values.get('track') == track.name:
+                # Logic read the channel back - no need to redo the arithmetic
+                track.volume_db = float(values['volume_db'])
+                track.mute, track.solo = bool(values['mute']), bool(values['solo'])
+            elif action == 'adjust':
+                track.volume_db = clamp_db(track.volume_db + float(args[1]))
+            elif action == 'set':
+                track.volume_db = clamp_db(float(args[1]))
+            elif action == 'preset':
+                track.volume_db = float(VOLUME_PRESETS[args[1]])
+            elif action in ('mute', 'unmute'):
+                track.mute = action == 'mute'
+            elif action == 'toggle-mute':
+                track.mute = not track.mute
+            elif action in ('solo', 'unsolo'):
+                track.solo = action == 'solo'
+
+    def _observe_navigation(self, action, args):
+        state = self.state
+        transport = state.transport
+
+        if action == 'play':
+            transport.play()
+        elif action == 'toggle-play':
+            if transport.playing:
+                transport.stop()
+            else:
+                transport.play()
+        elif action == 'stop':
+            transport.stop()
+        elif action == 'pause':
+            transport.pause()
+        elif action == 'rewind-start':
+            transport.stop()
+            transport.locate(1.0)
+            self._touch('position')
+        elif action in ('fast-forward', 'rewind'):
+            # Same arithmetic as the script, from the extrapolated playhead
+            bars = float(args[0])
+            transport.jump(bars if action == 'fast-forward' else -bars)
+        elif action == 'locate':
+            transport.locate(float(args[0]))
+            self._touch('position')
+        elif action in ('jump-marker', 'jump-marker-num', 'next-marker', 'prev-marker'):
+            target = self._marker_target(action, args)
+            transport.locate(target)
+            if target is not None:
+                self._touch('position')
+        elif action == 'create-marker':
+            if state.playhead is None or state.playing:
+                self.invalidate('markers')
+            else:
+                state.markers.append(MarkerState(args[0], state.playhead))
+                state.markers.sort(key=lambda m: m.position)
+        elif action == 'set-loop':
+            transport.set_cycle(True, float(args[0]), float(args[1]))
+        elif action == 'toggle-loop':
+            transport.set_cycle(not transport.cycle, transport.cycle_start, transport.cycle_end)
+        elif action == 'loop-selection':
+            transport.set_cycle(True)
+        elif action == 'loop-between-markers':
+            start, end = state.find_marker(args[0]), state.find_marker(args[1])
+            if self.is_fresh('markers') and start and end:
+                transport.set_cycle(True, start.position, end.position)
+            else:
+                transport.set_cycle(True)
+        elif action == 'loop-from-here':
+            here = state.playhead
+            if here is None:
+                transport.set_cycle(True)
+            else:
+                transport.set_cycle(True, here, here + float(args[0]))
+        elif action == 'set-tempo':
+            transport.set_tempo(float(args[0]))
+            self._touch('tempo')
+        elif action == 'adjust-tempo' and state.tempo is not None:
+            transport.set_tempo(state.tempo + float(args[0]))
+
+        if action in TRANSPORT_ACTIONS and state.playhead is None:
+            self.invalidate('position')
+
+    def _marker_target(self, action, args):
+        """Playhead after a marker jump (None if the shadow markers can't tell)"""
+        state = self.state
+        if not self.is_fresh('markers'):
+            return None
+
+        if action == 'jump-marker':
+            marker = state.find_marker(args[0])
+            return marker.position if marker else None
+        if action == 'jump-marker-num':
+            number = int(float(args[0]))
+            return state.markers[number - 1].position if 1 <= number <= len(state.markers) else None
+        if state.playhead is None:
+            return None
+        if action == 'next-marker':
+            ahead = [m for m in state.markers if m.position > state.playhead]
+            return ahead[0].position if ahead else state.playhead
+        before = [m for m in state.markers if m.position < state.playhead]
+        return before[-1].position if before else state.playhead
+
+    def stats(self):
+        """Query hit/miss counts"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes,
+            'hit_rate': self.hits / total if total else None,
+        }
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    from executor import SimulatedExecutor
+    from router import CommandRouter
+    from simulated_logic import SimulatedLogic
+
+    print("🪞 MiDAS AI - Shadow Project State")
+    print("=" * 60)
+    print()
+
+    daw = SimulatedLogic(["Lead Vocals", "Drums", "Bass", "Guitars"])
+    daw.add_marker("verse", 5)
+    daw.add_marker("chorus", 21)
+    executor = SimulatedExecutor(daw, spawn_latency=0.150, command_latency=0.020, realtime=False)
+    router = CommandRouter(executor=executor)
+
+    session = [
+        "what's vocals at",      # first query seeds the mixer section
+        "vocals up 3 db",
+        "what's vocals at",
+        "mute drums",
+        "what's drums at",
+        "set tempo 95",
+        "what's the tempo",
+        "jump to chorus",
+        "where am i",
+        "list tracks",
+    ]
+
+    for text in session:
+        before = (executor.invocations, executor.virtual_time)
+        intent = router.route(text)
+        result = router.execute(intent)
+        spawns = executor.invocations - before[0]
+        cost = (executor.virtual_time - before[1]) * 1000
+        answer = (result.output or result.error).replace("\n", " | ")
+        print(f"{text:<20} → {answer:<48} {spawns} spawn(s), {cost:4.0f} ms")
+
+    # Shadow state agrees with the DAW
+    for track in daw.tracks:
+        shadow = router.state.state.find_track(track.name)
+        assert (shadow.volume_db, shadow.mute, shadow.solo) == (track.volume_db, track.mute, track.solo)
+    assert router.state.state.tempo == daw.tempo and router.state.state.playhead == daw.playhead
+
+    # Queries after a snapshot are in-process
+    start = time.perf_counter()
+    for _ in range(1000):
+        router.execute(router.route("what's vocals at"))
+    per_query = (time.perf_counter() - start) / 1000 * 1e6
+
+    # Forced refresh picks up a change made by hand in Logic
+    daw.find_track("Bass").volume_db = -6.0
+    router.execute(router.route("refresh"))
+    assert router.state.state.find_track("Bass").volume_db == -6.0
+
+    # A comma-decimal reply ("-3,5") fails the refresh instead of raising
+    run = executor.run
+    executor.run = lambda path, args, timeout=None: ExecutionResult(
+        True, output="track\x1fBass\x1f-3,5\x1ffalse\x1ffalse")
+    assert router.state.refresh(['mixer']) is False
+    assert router.state.state.find_track("Bass").volume_db == -6.0
+    executor.run = run
+
+    print()
+    print(f"Stats: {router.state.stats()}")
+    print(f"Cached query incl. routing: {per_query:.0f} µs")
+    print("✅ Shadow state matches the simulated DAW")
+
+    # Full JSON snapshot: whole project in one call, typed model for the advice parser
+    daw.tracks[0].plugins = ["Channel EQ", "Compressor"]
+    daw.tracks[1].volume_db = 2.0
+    executor = SimulatedExecutor(daw, spawn_latency=0.150, command_latency=0.020, realtime=False)
+    router = CommandRouter(executor=executor)
+    router.execute(router.route("refresh"))
+    refresh_calls = executor.invocations
+
+    print()
+    for text in ["project info", "analyze track 1", "analyze the mix"]:
+        result = router.execute(router.route(text))
+        print(f"'{text}':")
+        print("   " + result.output.replace("\n", "\n   "))
+    assert executor.invocations == refresh_calls == 1
+    assert router.state.state.track_at(1).plugins == ["Channel EQ", "Compressor"]
+    print(f"✅ Full snapshot in {refresh_calls} call, analysis answered in-process")
+
+    # Playback: the transport clock answers position queries while Logic plays
+    daw = SimulatedLogic(["Lead Vocals", "Drums"])
+    executor = SimulatedExecutor(daw, spawn_latency=0.150, command_latency=0.020, realtime=False)
+    router = CommandRouter(executor=executor)
+    now = [0.0]
+    router.state.clock = router.state.state.transport.clock = lambda: now[0]
+
+    def wait(seconds):
+        now[0] += seconds
+        daw.advance(seconds)
+
+    print()
+    for text, seconds in [("play", 5), ("where am i", 0), ("forward 4", 3), ("where am i", 0),
+                          ("loop 4 from here", 9), ("where am i", 3), ("where am i", 0),
+                          ("pause", 0), ("where am i", 0)]:
+        before = executor.invocations
+        result = router.execute(router.route(text))
+        local = router.state.state.playhead
+        print(f"{text:<18} → {result.output:<28} {executor.invocations - before} spawn(s)  "
+              f"clock bar {local:6.3f}  Logic bar {daw.playhead:6.3f}")
+        assert abs(local - daw.playhead) < 1e-9
+        wait(seconds)
+    # 12 s after the last sync the second loop query resyncs (resync_interval = 10 s)
+    print(f"Transport: {router.state.state.transport.stats()}")
+    print("✅ Extrapolated playhead matches the simulated DAW")
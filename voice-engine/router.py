@@ -0,0 +1,894 @@
+"""
+MiDAS AI - Command Router
+Routes recognized speech to the right parser and turns it into an Intent
+
+All parsers share one executor, so routing + execution can run against
+real Logic Pro, a dry run, or the simulated DAW.
+
+Parsers are tried most specific first; mixing's catch-all patterns
+("{track} to {amount}", "check {track}") only get what nothing else claims.
+
+"Cancel" / "never mind" never queue - it only signals the scheduler and the
+executor, so it acts immediately. Other control commands ("refresh") touch
+the shared executor, so they queue ahead of everything else and run on the
+scheduler's worker, never beside the job it is running. Recognized text that
+routes to the same intent as one accepted within the dedupe window
+(dedupe.py) is dropped before it reaches either.
+
+Status/list/tempo/position queries are answered from the shadow project
+state (project_state.py), which every successful write keeps up to date.
+The playhead is extrapolated locally while playing (transport_clock.py) and
+resynced from the transport state every transport command's result carries
+(script_result.py).
+Mixing commands are sent with track references resolved by the track index
+(track_index.py) instead of names the script has to search for. Mixer
+resets only send the channels that differ from the target (mixer_diff.py).
+Saved snapshots (session_snapshots.py) are recalled the same way: only what
+differs from the current project, as one batched plan. Voice macros
+(macros.py) record executed intents and replay them as one batch.
+Punchobot takes are processed in the background while the next one records
+(take_pipeline.py) and recorded in the take store (take_store.py).
+Track moves are sent as exact positions from the track order (track_order.py),
+looked up when they run, and its folder tree checks group commands before
+they are sent. "This"
+commands go to the selected track, followed from the commands that select
+one (track_selection.py). Fader rides ("bring vocals up slowly over 4 bars")
+are written as decimated automation breakpoints in one call (automation.py).
+
+With a predictor (next_command.py), every executed intent is logged and the
+likely next one is pre-warmed in idle time: prewarm_next() runs as a
+background job on the scheduler, or is called by the caller between
+utterances when intents are executed directly.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import json
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import List, Optional
+
+from advice_parser import AdviceParser
+from automation import DEFAULT_RIDE_DB, AutomationEngine, parse_ride
+from batch import CommandBatch
+from commander import Commander
+from dedupe import DEFAULT_WINDOW, IntentDeduplicator
+from executor import ExecutionResult, OsascriptExecutor
+from macros import MacroStore
+from mixer_diff import clear_mute_solo_target, plan_mixer_changes, reset_volumes_target
+from mixing_parser import MixingParser
+from navigation_parser import NavigationParser
+from next_command import NextCommandPredictor, intent_key
+from plugin_parser import PluginParser
+from project_state import QUERY_SECTIONS, TRACK_LAYOUT_ACTIONS, ProjectStateCache
+from scheduler import PRIORITY_BACKGROUND, CommandScheduler
+from session_parser import SessionParser
+from session_snapshots import SnapshotStore, capture_snapshot, plan_recall
+from simulated_logic import MIN_DB, clamp_db
+from take_pipeline import TakePipeline
+from take_store import TakeStore
+from text_normalizer import normalize
+from track_index import GROUP_SEPARATOR, TrackIndex, parse_track_reference
+from track_parser import TrackParser
+from track_selection import SELECTED
+
+
+@dataclass
+class Intent:
+    """A parsed command, ready to execute"""
+    source: str                  # control / macro / automation / navigation / mixing / track / plugin / session / advice / punchobot
+    action: str                  # parser action or command type
+    script_path: Optional[Path]  # None for control intents
+    args: List[str] = field(default_factory=list)  # argv: command name, then arguments
+    description: str = ''
+    text: str = ''               # original utterance
+    handler: bool = False        # True = script library handler call (punchobot)
+    confidence: float = 1.0
+
+
+class CommandRouter:
+    """Finds the parser for an utterance and executes the resulting intent"""
+
+    # Long-running scripts get a longer default timeout
+    TIMEOUTS = {'session': 30}
+    DEFAULT_TIMEOUT = 10
+
+    # Mixing commands whose first argument is a track name
+    TRACK_ARG_ACTIONS = {'adjust', 'set', 'preset', 'mute', 'unmute', 'toggle-mute',
+                         'solo', 'unsolo', 'status'}
+
+    # Navigation commands resolved from the marker table when they execute
+    MARKER_ACTIONS = {'jump-marker', 'jump-marker-num', 'next-marker', 'prev-marker',
+                      'loop-between-markers'}
+
+    # Script -> intent source, for observing plan commands
+    SCRIPT_SOURCES = {'mixing.scpt': 'mixing', 'navigation.scpt': 'navigation',
+                      'track_management.scpt': 'track', 'plugin_control.scpt': 'plugin'}
+
+    def __init__(self, executor=None, dedupe_window=DEFAULT_WINDOW, predictor=None,
+                 snapshots=None, macros=None, take_pipeline=None):
+        """
+        Args:
+            executor: Executor shared by every parser (default: real Logic Pro)
+            dedupe_window: seconds an identical recognized intent is ignored (0 = off)
+            predictor: NextCommandPredictor for pre-warming (default: learned and
+                       persisted in ~/.midas for real Logic Pro, off for other executors)
+            snapshots: SnapshotStore for saved mixes (default: ~/.midas/snapshots for
+                       real Logic Pro, in-memory for other executors)
+            macros: MacroStore for voice macros (default: ~/.midas/macros.json for
+                    real Logic Pro, in-memory for other executors)
+            take_pipeline: TakePipeline for punchobot takes (default: on, with its own
+                           executor sharing this one's latency stats, for real Logic
+                           Pro; off for other executors)
+        """
+        self.executor = executor or OsascriptExecutor()
+        self.state = ProjectStateCache(self.executor)
+
+        self.navigation = NavigationParser(executor=self.executor, playhead=self.state.current_position)
+        self.mixing = MixingParser(executor=self.executor)
+        self.automation = AutomationEngine(self.executor, self.mixing.script_dir / 'mixing.scpt')
+        self.tracks = TrackParser(executor=self.executor)
+        self.plugins = PluginParser(executor=self.executor, selection=self.tracks.selection)
+        self.session = SessionParser(executor=self.executor)
+        self.advice = AdviceParser(executor=self.executor, project_state=self.state)
+        self.commander = Commander(executor=self.executor, take_pipeline=take_pipeline,
+                                   take_store=TakeStore() if executor is None else None)
+        if take_pipeline is None and executor is None:
+            # Own executor (cancel() mustn't hit take processing), one latency stats file
+            pipeline_executor = OsascriptExecutor(timeouts=self.executor.timeouts)
+            self.commander.set_take_pipeline(TakePipeline(pipeline_executor, self.commander.script_path))
+        self.scheduler: Optional[CommandScheduler] = None
+        self.track_index = TrackIndex(self.mixing.track_aliases)
+        self.dedupe = IntentDeduplicator(dedupe_window)
+        if predictor is None and executor is None:
+            predictor = NextCommandPredictor()
+        self.predictor = predictor
+        if snapshots is None:
+            snapshots = SnapshotStore() if executor is None else SnapshotStore(directory=None)
+        self.snapshots = snapshots
+        if macros is None:
+            macros = MacroStore() if executor is None else MacroStore(macro_file=None)
+        self.macros = macros
+        self.predicted: Optional[str] = None  # key of the intent to pre-warm
+        self._script_paths = {}               # key -> script path, as last executed
+
+        with open(Path(__file__).parent / 'control_commands.json', 'r') as f:
+            self.control_commands = json.load(f)
+
+        # (source, action) -> callable(intent) answering without osascript
+        # A handler returning None falls through to the script
+        self.local_handlers = {
+            ('control', 'cancel'): lambda intent: self.cancel(),
+            ('control', 'refresh'): lambda intent: self.refresh_state(),
+            ('control', 'prewarm'): lambda intent: self.prewarm_next(),
+            ('automation', 'ride'): self.write_ride,
+            ('mixing', 'reset-all'): lambda intent: self.reset_mixer(
+                reset_volumes_target, "Reset all volumes to 0 dB"),
+            ('session', 'reset_mixer'): lambda intent: self.reset_mixer(
+                clear_mute_solo_target, "Reset mixer: cleared all solo/mute states"),
+        }
+        for query in QUERY_SECTIONS:
+            self.local_handlers[query] = self.state.answer
+        for action in AdviceParser.STATIC_ACTIONS:
+            self.local_handlers[('advice', action)] = lambda intent: ExecutionResult(
+                True, output=self.advice.static_advice(intent.action))
+        for action in AdviceParser.PROJECT_ACTIONS:
+            self.local_handlers[('advice', action)] = self._analyze_project
+        for action in self.session.templates:
+            self.local_handlers[('session', action)] = self._run_template
+        for action in ('group', 'group_named', 'ungroup', 'ungroup_named'):
+            self.local_handlers[('track', action)] = self._check_grouping
+        self.local_handlers[('session', 'organize')] = self._organize
+        self.local_handlers.update({
+            ('session', 'snapshot_save'): lambda intent: self.save_snapshot(intent.args[1]),
+            ('session', 'snapshot_recall'): lambda intent: self.recall_snapshot(intent.args[1]),
+            ('session', 'snapshot_list'): lambda intent: self.list_snapshots(),
+            ('session', 'snapshot_compare'): lambda intent: self.compare_snapshots(
+                intent.args[1], intent.args[2]),
+            ('session', 'snapshot_delete'): lambda intent: self.delete_snapshot(intent.args[1]),
+            ('macro', 'start'): lambda intent: self.start_macro(intent.args[0]),
+            ('macro', 'stop'): lambda intent: self.stop_macro(),
+            ('macro', 'discard'): lambda intent: self.discard_macro(),
+            ('macro', 'list'): lambda intent: self.list_macros(),
+            ('macro', 'delete'): lambda intent: self.delete_macro(intent.args[0]),
+            ('macro', 'run'): lambda intent: self.run_macro(intent.args[0]),
+        })
+
+    def start_scheduler(self, **kwargs):
+        """Queue submitted intents through a priority scheduler (see submit())"""
+        if self.scheduler is None:
+            self.scheduler = CommandScheduler(self.execute, cancel=self.executor.cancel,
+                                              cancel_scope=self.executor.cancel_scope, **kwargs)
+        self.scheduler.start()
+        return self.scheduler
+
+    def stop_scheduler(self):
+        if self.scheduler:
+            self.scheduler.stop()
+
+    def _route_control(self, text):
+        for patterns_list in self.control_commands.values():
+            for pattern_group in patterns_list:
+                if text in pattern_group['patterns']:
+                    return Intent('control', pattern_group['action'], None, [],
+                                  pattern_group['action'].capitalize(), text)
+        return None
+
+    def route(self, text) -> Optional[Intent]:
+        """
+        Parse text with each parser in turn.
+        Punchobot is tried last - its fuzzy matching would swallow e.g. "next marker".
+        The text is normalized once first (text_normalizer.py): spoken numbers
+        become digits and units are stripped, so parsers only match one spelling.
+        """
+        text = normalize(text)
+
+        intent = self._route_control(text)
+        if intent:
+            return intent
+
+        macro = self.macros.parse(text)
+        if macro:
+            action, name = macro
+            description = f"Macro: {action}" + (f" {name}" if name else "")
+            return Intent('macro', action, None, [name] if name else [], description, text)
+
+        ride = parse_ride(text)
+        if ride:
+            amount = f" {ride['amount']}" if ride['amount'] else ""
+            return Intent('automation', 'ride', self.mixing.script_dir / 'mixing.scpt',
+                          [ride['track'], ride['direction'], ride['amount'] or '', ride['shape'],
+                           f"{ride['bars']:g}"],
+                          f"Ride {ride['track']} {ride['direction']}{amount} over {ride['bars']:g} bars "
+                          f"({ride['shape']})", text)
+
+        intent = self._route_tuple('navigation', self.navigation, text)
+        if intent:
+            return intent
+
+        # Most specific first. Mixing goes last: its "{track} to {amount}", "make {track}
+        # {preset}", "check {track}" and "{x} up {n}" would read "track 3 to top",
+        # "make track 3 red", "check the mix" or "parameter up 3" as a mix move.
+        # Session before plugin - "recall {name}" would load a plugin preset named "snapshot ..."
+        for source, parser in [('track', self.tracks), ('session', self.session),
+                               ('plugin', self.plugins), ('advice', self.advice)]:
+            intent = self._route_parsed(source, parser, text)
+            if intent:
+                return intent
+
+        intent = self._route_tuple('mixing', self.mixing, text)
+        if intent:
+            return intent
+
+        command = self.commander.parse(text)
+        if command:
+            return Intent('punchobot', command.action, Path(self.commander.script_path),
+                          [command.action], f"Punchobot: {command.action}", text,
+                          handler=True, confidence=command.confidence)
+
+        return None
+
+    def _route_tuple(self, source, parser, text):
+        """Intent from a parser returning (success, type, [script, argv...], message), or None"""
+        success, cmd_type, params, message = parser.parse(text)
+        if not success:
+            return None
+        return Intent(source, cmd_type, Path(params[0]), [str(p) for p in params[1:]],
+                      message, text)
+
+    def _route_parsed(self, source, parser, text):
+        """Intent from a parser returning command dicts, or None"""
+        command = parser.parse(text)
+        if not command:
+            return None
+        return Intent(source, command['action'], Path(parser.script_path),
+                      list(command['args']), command['description'], text)
+
+    def execute(self, intent: Intent) -> ExecutionResult:
+        """Execute an intent (in-process if a local handler exists)"""
+        start = time.perf_counter()
+        result = self._execute(intent)
+        if self.macros.recording is not None and result.success and intent.source not in (
+                'control', 'macro') and (intent.source, intent.action) not in QUERY_SECTIONS:
+            self.macros.capture(self._macro_step(intent), time.perf_counter() - start)
+        if self.predictor is not None and intent.source != 'control':
+            self._predict_next(intent)
+        return result
+
+    def _execute(self, intent):
+        if intent.source == 'track':
+            intent = self.resolve_track_layout(intent)  # before the grouping check reads it
+        elif intent.source == 'plugin':
+            intent = self.resolve_selection(intent)
+        if intent.source in ('track', 'plugin'):
+            error = self.tracks.selection.check(intent.args)
+            if error:
+                return ExecutionResult(False, error=error)
+        local = self.local_handlers.get((intent.source, intent.action))
+        if local:
+            result = local(intent)
+            if result is not None:
+                return result
+
+        if intent.source == 'mixing':
+            intent = self.resolve_tracks(intent)
+        elif intent.source == 'navigation' and intent.action in self.MARKER_ACTIONS:
+            intent = self.resolve_markers(intent)
+
+        timeout = self.TIMEOUTS.get(intent.source, self.DEFAULT_TIMEOUT)
+        if intent.handler:
+            result = self.commander.run(intent.args[0], timeout=timeout)
+        else:
+            result = self.executor.run(intent.script_path, intent.args, timeout=timeout)
+        self._observe(intent, result)
+        return result
+
+    def _observe(self, intent, result):
+        """Apply an executed script command to the shadow state and indexes"""
+        self.state.observe(intent, result)
+        if intent.source == 'navigation' and result.success:
+            self.navigation.observe(intent.action, intent.args[1:], result.output)
+        if result.success and intent.action in TRACK_LAYOUT_ACTIONS:
+            self.track_index.invalidate()
+            if intent.source == 'track':
+                self.tracks.order.apply(intent.args)
+            else:
+                self.tracks.order.invalidate()  # session templates
+        if result.success and intent.script_path is not None:
+            self.tracks.selection.observe(intent.script_path.name, intent.args, self.tracks.order.count)
+
+    def reset_mixer(self, make_target, message):
+        """
+        Reset via the smallest set of channel changes
+        make_target: callable(current tracks) -> {track name: TrackState}
+        Returns None (run the script's own reset) if the mixer can't be read.
+        """
+        # Always re-read: a fader moved by hand since the last snapshot must be reset too
+        if not self.state.refresh(['mixer']):
+            return None
+        return self._apply_mixer(make_target(self.state.state.tracks), message)
+
+    def restore_mixer(self, target, message="Mixer restored"):
+        """Move the mixer to target ({track name: TrackState}) in one batched call"""
+        if not self.state.refresh(['mixer']):
+            return ExecutionResult(False, error="Could not read mixer state")
+        return self._apply_mixer(target, message)
+
+    def _apply_mixer(self, target, message):
+        """Send the channel changes from the just-read mixer to target"""
+        commands = plan_mixer_changes(self.state.state.tracks, target)
+        if not commands:
+            return ExecutionResult(True, output=f"{message} (nothing to change)")
+
+        script_path = self.mixing.script_dir / 'mixing.scpt'
+        results = self.executor.run_batch(script_path, commands, timeout=self.DEFAULT_TIMEOUT)
+
+        errors = []
+        for args, result in zip(commands, results):
+            self.state.observe(Intent('mixing', args[0], script_path, args), result)
+            if not result.success:
+                errors.append(result.error)
+        if errors:
+            self.state.invalidate('mixer')
+            return ExecutionResult(False, error="; ".join(errors))
+        return ExecutionResult(True, output=f"{message} ({len(commands)} channel change(s))")
+
+    def save_snapshot(self, name):
+        """Capture the project (one full snapshot if stale) under name"""
+        if not self.state.ensure_fresh('mixer', 'plugins', 'markers', 'tempo'):
+            return ExecutionResult(False, error="Could not read project state")
+        snapshot = capture_snapshot(name, self.state.state)
+        self.snapshots.save(snapshot)
+        return ExecutionResult(True, output=f"Saved snapshot '{name}' ({len(snapshot.tracks)} tracks, "
+                                            f"{len(snapshot.markers)} markers)")
+
+    def recall_snapshot(self, name):
+        """Move the project to a saved snapshot, sending only what differs"""
+        snapshot = self.snapshots.load(name)
+        if snapshot is None:
+            return ExecutionResult(False, error=f"No snapshot named '{name}'")
+        # The mixer is re-read even if fresh - faders may have been moved by hand
+        self.state.invalidate('mixer')
+        if not self.state.ensure_fresh('mixer', 'plugins', 'markers', 'tempo', 'position'):
+            return ExecutionResult(False, error="Could not read project state")
+
+        commands, missing = plan_recall(self.state.state, snapshot)
+        note = f"; not in project: {', '.join(missing)}" if missing else ""
+        if not commands:
+            return ExecutionResult(True, output=f"Recalled '{name}' (nothing to change{note})")
+
+        batch = CommandBatch(self.executor, timeout_per_command=self.DEFAULT_TIMEOUT)
+        for script_name, args in commands:
+            batch.add(self.mixing.script_dir / script_name, args)
+        results = batch.execute()
+
+        errors = []
+        for (script_name, args), result in zip(commands, results):
+            intent = Intent(self.SCRIPT_SOURCES[script_name], args[0],
+                            self.mixing.script_dir / script_name, args)
+            self._observe(intent, result)
+            if not result.success:
+                errors.append(result.error)
+        if any(script_name == 'track_management.scpt' for script_name, args in commands):
+            self.track_index.invalidate()
+        if errors:
+            self.state.invalidate('mixer', 'plugins', 'markers')
+            return ExecutionResult(False, error="; ".join(errors))
+        return ExecutionResult(True, output=f"Recalled '{name}' ({len(commands)} change(s){note})")
+
+    def list_snapshots(self):
+        entries = self.snapshots.list()
+        if not entries:
+            return ExecutionResult(True, output="No snapshots saved")
+        lines = ["Snapshots:"]
+        for number, entry in enumerate(entries, 1):
+            saved = time.strftime('%b %d %H:%M', time.localtime(entry['saved_at']))
+            tempo = f", {entry['tempo']:g} BPM" if entry['tempo'] is not None else ""
+            lines.append(f"{number}. {entry['name']} ({entry['track_count']} tracks{tempo}, {saved})")
+        return ExecutionResult(True, output="\n".join(lines))
+
+    def compare_snapshots(self, a, b):
+        differences = self.snapshots.compare(a, b)
+        if differences is None:
+            return ExecutionResult(False, error=f"Need two saved snapshots: '{a}', '{b}'")
+        if not differences:
+            return ExecutionResult(True, output=f"'{a}' and '{b}' are identical")
+        return ExecutionResult(True, output="\n".join(differences))
+
+    def delete_snapshot(self, name):
+        if self.snapshots.delete(name):
+            return ExecutionResult(True, output=f"Deleted snapshot '{name}'")
+        return ExecutionResult(False, error=f"No snapshot named '{name}'")
+
+    def start_macro(self, name):
+        self.macros.start(name)
+        return ExecutionResult(True, output=f"Recording macro '{name}' - say 'stop macro' when done")
+
+    def stop_macro(self):
+        macro = self.macros.stop()
+        if macro is None:
+            return ExecutionResult(False, error="No macro recorded")
+        return ExecutionResult(True, output=f"Saved macro '{macro['name']}' ({len(macro['steps'])} steps)")
+
+    def discard_macro(self):
+        if self.macros.discard():
+            return ExecutionResult(True, output="Macro recording discarded")
+        return ExecutionResult(True, output="Not recording a macro")
+
+    def list_macros(self):
+        if not self.macros.macros:
+            return ExecutionResult(True, output="No macros saved")
+        lines = ["Macros:"] + [f"{number}. {macro['name']} ({len(macro['steps'])} steps)"
+                               for number, macro in enumerate(self.macros.macros.values(), 1)]
+        return ExecutionResult(True, output="\n".join(lines))
+
+    def delete_macro(self, name):
+        if self.macros.delete(name):
+            return ExecutionResult(True, output=f"Deleted macro '{name}'")
+        return ExecutionResult(False, error=f"No macro named '{name}'")
+
+    def _macro_step(self, intent):
+        """Executed intent as a JSON-ready macro step (mixing tracks resolved)"""
+        if intent.source == 'mixing':
+            intent = self.resolve_tracks(intent)
+        return {
+            'source': intent.source,
+            'action': intent.action,
+            'script': intent.script_path.name if intent.script_path else None,
+            'args': list(intent.args),
+            'description': intent.description,
+            'handler': intent.handler,
+        }
+
+    def _step_intent(self, step):
+        script_path = self.mixing.script_dir / step['script'] if step['script'] else None
+        return Intent(step['source'], step['action'], script_path, list(step['args']),
+                      step['description'], handler=step['handler'])
+
+    def _validate_reference(self, reference):
+        """Current reference for a recorded '#<index>:<name>' (None if the track is gone)"""
+        index, name = parse_track_reference(reference)
+        if index <= len(self.track_index.names) and self.track_index.names[index - 1] == name:
+            return reference
+        if name in self.track_index.names:
+            return self.track_index.reference(name)
+        return None
+
+    def _validate_macro(self, intents):
+        """
+        Re-check recorded track references before anything is sent
+        Returns: (intents with moved tracks re-resolved, list of errors)
+        """
+        checked, errors = [], []
+        self._ensure_track_index()
+        for intent in intents:
+            if intent.source == 'mixing' and len(intent.args) > 1 and parse_track_reference(intent.args[1]):
+                references = intent.args[1].split(GROUP_SEPARATOR)
+                current = [self._validate_reference(ref) for ref in references]
+                for ref, now in zip(references, current):
+                    if now is None:
+                        errors.append(f"Track not found: {parse_track_reference(ref)[1]}")
+                if None not in current:
+                    intent = replace(intent, args=[intent.args[0], GROUP_SEPARATOR.join(current)]
+                                     + intent.args[2:])
+            checked.append(intent)
+        return checked, errors
+
+    def run_macro(self, name):
+        """Replay a macro: validated up front, script steps batched"""
+        macro = self.macros.get(name)
+        if macro is None:
+            return ExecutionResult(False, error=f"No macro named '{name}'")
+
+        start = time.perf_counter()
+        intents, errors = self._validate_macro([self._step_intent(step) for step in macro['steps']])
+        if errors:
+            return ExecutionResult(False, error=f"Macro '{macro['name']}' not run: {'; '.join(errors)}")
+
+        results = []
+        batch = CommandBatch(self.executor, timeout_per_command=self.DEFAULT_TIMEOUT)
+        queued = []
+
+        def flush():
+            for intent, result in zip(queued, batch.execute()):
+                self._observe(intent, result)
+                results.append(result)
+            queued.clear()
+
+        for intent in intents:
+            if intent.handler or (intent.source, intent.action) in self.local_handlers or (
+                    intent.action in ('next-marker', 'prev-marker')) or (
+                    intent.source == 'track' and intent.args and intent.args[0] in self.tracks.ORDER_COMMANDS) or (
+                    intent.args[1:2] == [SELECTED]):
+                # Next/previous marker depend on where earlier steps left the playhead,
+                # track moves and "this" on where they left the tracks and selection
+                flush()
+                results.append(self._execute(intent))
+            else:
+                if intent.source == 'navigation' and intent.action in self.MARKER_ACTIONS:
+                    intent = self.resolve_markers(intent)
+                batch.add(intent.script_path, intent.args)
+                queued.append(intent)
+        flush()
+        self.macros.record_replay(name, time.perf_counter() - start)
+
+        failed = [result.error for result in results if not result.success]
+        if failed:
+            return ExecutionResult(False, error=f"Macro '{macro['name']}': {'; '.join(failed)}")
+        return ExecutionResult(True, output=f"Ran macro '{macro['name']}' ({len(results)} steps)")
+
+    def resolve_tracks(self, intent):
+        """
+        Replace the track name (or group pattern) in a mixing intent with a
+        resolved reference. Rebuilds the index from a mixer snapshot if needed;
+        unresolved names are left for the script to search.
+        """
+        if len(intent.args) < 2:
+            return intent
+        if intent.action not in self.TRACK_ARG_ACTIONS and intent.action != 'group-adjust':
+            return intent
+
+        self._ensure_track_index()
+        if intent.action == 'group-adjust':
+            reference = self.track_index.group(intent.args[1])
+        else:
+            reference = self.track_index.reference(intent.args[1])
+        if reference is None:
+            return intent
+        return replace(intent, args=[intent.args[0], reference] + intent.args[2:])
+
+    def resolve_track_layout(self, intent):
+        """
+        Track moves and folder ungroups as exact positions from the track order,
+        "this" as the selected track - done when the intent runs (one snapshot
+        if the order isn't known yet)
+        """
+        self._sync_track_order(fetch=self.tracks.needs_order(intent.args))
+        args = self.tracks.resolve(intent.args)
+        if args == intent.args:
+            return intent
+        return replace(intent, args=args)
+
+    def resolve_selection(self, intent):
+        """"This" as the selected track number - done when the intent runs"""
+        args = self.tracks.selection.resolve(intent.args)
+        if args == intent.args:
+            return intent
+        return replace(intent, args=args)
+
+    def resolve_markers(self, intent):
+        """
+        Marker jump/loop as absolute bars from the marker table - done when the
+        intent runs, never while routing (which may overlap a running command)
+        """
+        args = self.navigation.resolve(intent.args)
+        if args == intent.args:
+            return intent
+        return replace(intent, action=args[0], args=args)
+
+    def _ensure_track_index(self):
+        """Rebuild the track index if the track layout changed (snapshot if needed)"""
+        if not self.track_index.valid or self.track_index.version != self.state.tracks_version:
+            if not self.track_index.valid:
+                self.state.ensure_fresh('mixer')
+            self.track_index.rebuild([t.name for t in self.state.state.tracks],
+                                     self.state.tracks_version)
+
+    def _sync_track_order(self, fetch=False):
+        """Rebuild the track order from a newer shadow track list (snapshot only if fetch)"""
+        order = self.tracks.order
+        if fetch and not order.valid:
+            self.state.ensure_fresh('mixer')
+        if self.state.is_fresh('mixer') and (not order.valid or order.version != self.state.tracks_version):
+            tracks = self.state.state.tracks
+            order.rebuild([t.name for t in tracks], self.state.tracks_version, [t.kind for t in tracks])
+
+    def _predict_next(self, intent):
+        """Log an executed intent and queue a pre-warm for the likely next one"""
+        key = intent_key(intent.source, intent.action)
+        self.predictor.observe(key)
+        if intent.script_path is not None:
+            self._script_paths[key] = intent.script_path
+
+        prediction = self.predictor.predict(key)
+        self.predicted = prediction[0] if prediction else None
+        if self.predicted and self.scheduler and self.scheduler.is_running:
+            self.scheduler.submit(Intent('control', 'prewarm', None, [],
+                                         f"Pre-warm {self.predicted}"),
+                                  priority=PRIORITY_BACKGROUND)
+
+    def prewarm_next(self):
+        """Pre-warm the predicted next intent (call in idle time)"""
+        key, self.predicted = self.predicted, None
+        if key is None:
+            return ExecutionResult(True, output="Nothing to pre-warm")
+
+        start = time.perf_counter()
+        source, action = key.split('.', 1)
+        self.prewarm(source, action, self._script_paths.get(key))
+        self.predictor.record_prewarm(key, time.perf_counter() - start)
+        return ExecutionResult(True, output=f"Pre-warmed {key}")
+
+    def prewarm(self, source, action, script_path=None):
+        """Compile the intent's script and resolve what it will look up"""
+        if script_path is not None:
+            self.executor.prewarm(script_path)
+
+        if (source, action) in QUERY_SECTIONS:
+            self.state.ensure_fresh(QUERY_SECTIONS[(source, action)])
+        elif source == 'mixing' and (action in self.TRACK_ARG_ACTIONS or action == 'group-adjust'):
+            self._ensure_track_index()
+        elif source == 'navigation' and action in self.MARKER_ACTIONS:
+            if not self.navigation.markers_loaded:
+                self.navigation.load_markers()
+
+    def _run_template(self, intent):
+        """Session template as one batch of compiled steps (session_parser.py)"""
+        result = self.session.run_template(intent.action)
+        # Tracks were created even if the template stopped part way
+        self.state.invalidate('mixer', 'plugins')
+        self.track_index.invalidate()
+        self.tracks.order.invalidate()
+        self.tracks.selection.invalidate()
+        return result
+
+    def write_ride(self, intent):
+        """Fader ride from the current level as automation breakpoints (automation.py)"""
+        name, direction, amount, shape, bars = intent.args
+        self._ensure_track_index()
+        reference = self.track_index.reference(name)
+        if reference is None or not self.state.ensure_fresh('mixer'):
+            return ExecutionResult(False, error=f"Track not found: {name}")
+
+        current = self.state.state.find_track(reference).volume_db
+        start_db, end_db = current, MIN_DB
+        if direction in ('up', 'down'):
+            change = self.mixing.parse_amount(amount) if amount else DEFAULT_RIDE_DB
+            end_db = clamp_db(current + abs(change) * (1 if direction == 'up' else -1))
+        elif direction == 'in':
+            start_db, end_db = MIN_DB, current if current > MIN_DB else 0.0
+
+        start_bar = self.state.current_position() or 1.0
+        return self.automation.write(reference, start_db, end_db, float(bars), shape, start_bar)
+
+    def _check_grouping(self, intent):
+        """Reject a group/ungroup the folder tree says can't work (None = run it)"""
+        error = self.tracks.order.check(intent.args)
+        if error:
+            return ExecutionResult(False, error=error)
+        return None
+
+    def _organize(self, intent):
+        """Organization guidelines plus the folder layout from the track order"""
+        result = self.executor.run(intent.script_path, intent.args, timeout=self.DEFAULT_TIMEOUT)
+        if result.success and self.tracks.order.valid:
+            result.output += f"\n\nCurrent layout:\n{self.tracks.order.describe()}"
+        return result
+
+    def _analyze_project(self, intent):
+        """Advice analysis from the project snapshot (None = ask the script)"""
+        result = self.advice.analyze_project(intent.action, intent.args)
+        if result is None:
+            return None
+        return ExecutionResult(result['success'], output=result.get('output', ''),
+                               error=result.get('error', ''))
+
+    def refresh_state(self):
+        """Force a fresh snapshot of the shadow project state"""
+        self.navigation.invalidate_markers()
+        if self.state.refresh():
+            return ExecutionResult(True, output="Project state refreshed")
+        return ExecutionResult(False, error="Could not read project state")
+
+    def cancel(self):
+        """Abort the in-flight command and drain queued work that depends on it"""
+        if self.scheduler:
+            jobs = self.scheduler.cancel()
+            if not jobs:
+                return ExecutionResult(True, output="Nothing to cancel")
+            # The running job reports its own outcome when it ends (it may finish anyway)
+            stopping = [job.intent.description for job in jobs if job.status == 'running']
+            drained = [job.intent.description for job in jobs if job.status == 'cancelled']
+            parts = ([f"Stopping: {', '.join(stopping)}"] if stopping else []) + \
+                    ([f"Cancelled: {', '.join(drained)}"] if drained else [])
+            return ExecutionResult(True, output="; ".join(parts))
+
+        if self.executor.cancel():
+            return ExecutionResult(True, output="Cancelled running command")
+        return ExecutionResult(True, output="Nothing to cancel")
+
+    def submit(self, text, depends_on=None):
+        """
+        Route and queue on the scheduler ("cancel" runs immediately).
+        Returns: (intent, Job) - Job is None for "cancel" and suppressed repeats
+        """
+        intent = self.route(text)
+        if intent is None:
+            print(f"❓ Unknown command: '{text}'")
+            return (None, None)
+        if self._is_repeat(intent):
+            return (intent, None)
+
+        if (intent.source, intent.action) == ('control', 'cancel') or self.scheduler is None:
+            result = self.execute(intent)
+            print(f"🔷 {result.output or result.error}")
+            return (intent, None)
+
+        print(f"🔷 {intent.description} (queued)")
+        return (intent, self.scheduler.submit(intent, depends_on=depends_on))
+
+    def _is_repeat(self, intent):
+        """True (and reported) if intent echoes one accepted within the dedupe window"""
+        if self.dedupe.is_duplicate(intent.source, intent.action, intent.args):
+            print(f"🔁 Ignored repeat: {intent.description}")
+            return True
+        return False
+
+    def handle(self, text):
+        """
+        Route and execute immediately
+        Returns: (intent, result), (intent, None) for a suppressed repeat, or (None, None)
+        """
+        intent = self.route(text)
+        if intent is None:
+            print(f"❓ Unknown command: '{text}'")
+            return (None, None)
+        if self._is_repeat(intent):
+            return (intent, None)
+
+        print(f"🔷 {intent.description}")
+        return (intent, self.execute(intent))
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    from executor import DryRunExecutor
+
+    router = CommandRouter(executor=DryRunExecutor())
+
+    print("🔷 MiDAS AI - Command Router")
+    print("=" * 60)
+    print()
+
+    test_commands = [
+        ("cancel", 'control'),
+        ("never mind", 'control'),
+        ("start macro drum check", 'macro'),
+        ("stop macro", 'macro'),
+        ("refresh", 'control'),
+        ("play", 'navigation'),
+        ("stop", 'navigation'),
+        ("next marker", 'navigation'),
+        ("jump to chorus", 'navigation'),
+        ("vocals up 3 db", 'mixing'),
+        ("solo drums", 'mixing'),
+        ("Set drums to minus two.", 'mixing'),
+        ("forward a couple of bars", 'navigation'),
+        ("bring vocals up slowly over 4 bars", 'automation'),
+        ("fade drums out over 8 bars", 'automation'),
+        ("create audio track", 'track'),
+        ("move track 3 up", 'track'),
+        ("move 3 to top", 'track'),
+        ("group tracks 1 to 4 as drums", 'track'),
+        ("make this red", 'track'),
+        ("make track 3 red", 'track'),
+        ("track 3 to top", 'track'),
+        ("only show track 3", 'track'),
+        ("vocal chain on track 2", 'plugin'),
+        ("add reverb to 3", 'plugin'),
+        ("turn off plugin 2 on 3", 'plugin'),
+        ("parameter up 3", 'plugin'),
+        ("set tempo to 120", 'session'),
+        ("unmute all", 'session'),
+        ("clean up project", 'session'),
+        ("create full song session", 'session'),
+        ("save snapshot verse mix", 'session'),
+        ("recall snapshot verse mix", 'session'),
+        ("recall bright vocal", 'plugin'),
+        ("how do i mix vocals", 'advice'),
+        ("help", 'advice'),
+        ("check the mix", 'advice'),
+        ("check for clipping", 'advice'),
+        ("start punch", 'punchobot'),
+        ("next take", 'punchobot'),
+        ("keep it", 'punchobot'),
+    ]
+
+    passed = 0
+    for text, expected in test_commands:
+        intent = router.route(text)
+        source = intent.source if intent else None
+        ok = source == expected
+        passed += ok
+        print(f"{'✅' if ok else '❌'} '{text}' → {source}: {intent.action if intent else '-'}")
+
+    print()
+    print(f"RESULTS: {passed} passed, {len(test_commands) - passed} failed")
+
+    # Every pattern in the command files reaches its own parser (or another file that
+    # lists the same pattern, e.g. "tempo {bpm}" in navigation and session)
+    import re
+
+    samples = {'track': 'drums', 'group': 'drums', 'amount': '3', 'num': '3', 'number': '2',
+               'slot': '2', 'start': '1', 'end': '4', 'bpm': '120', 'marker': 'chorus',
+               'start_marker': 'verse', 'end_marker': 'chorus', 'name': 'guitar',
+               'other': 'verse mix', 'plugin': 'compressor', 'preset': 'loud', 'color': 'red'}
+
+    def patterns(node):
+        if isinstance(node, dict):
+            if 'patterns' in node:
+                yield from node['patterns']
+                return
+            node = list(node.values())
+        if isinstance(node, list):
+            for child in node:
+                yield from patterns(child)
+
+    owners = {}
+    for source in ['control', 'navigation', 'mixing', 'track', 'plugin', 'session', 'advice']:
+        with open(Path(__file__).parent / f'{source}_commands.json') as f:
+            for pattern in patterns(json.load(f)):
+                owners.setdefault(pattern, set()).add(source)
+    misrouted = []
+    for pattern, sources in owners.items():
+        text = re.sub(r'\{(\w+)\}', lambda m: samples[m.group(1)], pattern)
+        intent = router.route(text)
+        if intent is None or intent.source not in sources:
+            misrouted.append(f"'{text}' → {intent.source if intent else None} (owned by {'/'.join(sorted(sources))})")
+    for line in misrouted:
+        print(f"❌ {line}")
+    print(f"{'✅' if not misrouted else '❌'} {len(owners) - len(misrouted)}/{len(owners)} "
+          f"command-file patterns route to their own parser")
+    assert not misrouted
+
+    # Echoed recognition: the second identical intent never executes
+    executor = DryRunExecutor()
+    router = CommandRouter(executor=executor)
+    for text in ["duplicate track 2", "duplicate track 2", "duplicate track 3"]:
+        router.handle(text)
+    assert executor.invocations == 2
+    print(f"Dedupe: {router.dedupe.stats()}")
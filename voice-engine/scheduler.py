@@ -0,0 +1,508 @@
+"""
+MiDAS AI - Priority Command Scheduler
+Queues intents so transport commands jump ahead of long jobs
+
+Priority classes (lower runs first):
+    0 TRANSPORT  - navigation/transport and punchobot recording
+    1 MIXING     - levels, mute, solo
+    2 EDIT       - track and plugin operations
+    3 BACKGROUND - session templates and analysis/advice
+
+One worker thread runs jobs one at a time (Logic's UI can only do one thing).
+When the backlog grows past max_backlog, the oldest lowest-priority jobs are
+dropped; jobs that waited longer than their class's stale_after are dropped too.
+A job submitted with depends_on waits for that job and is drained if it
+fails, is cancelled or is dropped.
+
+cancel() drains queued jobs depending on the target and cancels the running
+one through its CancelToken: the executor refuses every later call the job
+makes (Executor.cancel_scope) and the call in flight is interrupted. The job
+ends 'cancelled' only if a call was actually stopped - a command that
+finished before the cancel reached it ends 'done' with its real result.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from latency_stats import LatencyHistogram
+
+PRIORITY_TRANSPORT = 0
+PRIORITY_MIXING = 1
+PRIORITY_EDIT = 2
+PRIORITY_BACKGROUND = 3
+
+PRIORITY_NAMES = {
+    PRIORITY_TRANSPORT: 'transport',
+    PRIORITY_MIXING: 'mixing',
+    PRIORITY_EDIT: 'edit',
+    PRIORITY_BACKGROUND: 'background',
+}
+
+SOURCE_PRIORITIES = {
+    'control': PRIORITY_TRANSPORT,  # "refresh" - "cancel" never queues
+    'navigation': PRIORITY_TRANSPORT,
+    'punchobot': PRIORITY_TRANSPORT,
+    'mixing': PRIORITY_MIXING,
+    'track': PRIORITY_EDIT,
+    'plugin': PRIORITY_EDIT,
+    'session': PRIORITY_BACKGROUND,
+    'advice': PRIORITY_BACKGROUND,
+}
+
+# Seconds a queued job may wait before it is considered stale (None = never)
+DEFAULT_STALE_AFTER = {
+    PRIORITY_TRANSPORT: None,
+    PRIORITY_MIXING: 5.0,
+    PRIORITY_EDIT: 15.0,
+    PRIORITY_BACKGROUND: 60.0,
+}
+
+
+def succeeded(result):
+    """True unless a job's result is an exception or reports failure"""
+    return not isinstance(result, Exception) and getattr(result, 'success', True) is not False
+
+
+def priority_for(intent):
+    """Priority class for an intent"""
+    return SOURCE_PRIORITIES.get(intent.source, PRIORITY_EDIT)
+
+
+@dataclass
+class CancelToken:
+    """A job's cancel request, checked by the executor before every call"""
+    requested: bool = False
+    stopped: bool = False  # set by the executor when a call was interrupted or refused
+
+
+@dataclass
+class Job:
+    """One queued intent"""
+    id: int
+    intent: Any
+    priority: int
+    depends_on: Optional[int] = None  # id of a job this one needs to succeed first
+    submitted_at: float = field(default_factory=time.perf_counter)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    status: str = 'queued'  # queued / running / done / dropped / cancelled
+    result: Any = None
+    cancel_token: CancelToken = field(default_factory=CancelToken)
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def queue_wait(self):
+        if self.started_at is None:
+            return None
+        return self.started_at - self.submitted_at
+
+    def wait(self, timeout=None):
+        """Block until the job finishes, is dropped or is cancelled"""
+        return self.done.wait(timeout)
+
+
+class CommandScheduler:
+    """Priority queue + single worker in front of an execute function"""
+
+    def __init__(self, execute, cancel=None, max_backlog=20, stale_after=None, on_complete=None,
+                 cancel_scope=None):
+        """
+        Args:
+            execute: callable(intent) -> result (e.g. CommandRouter.execute)
+            cancel: callable() -> bool that aborts the in-flight execute (e.g. Executor.cancel)
+            cancel_scope: callable(CancelToken) -> context manager each job runs in, so
+                          its calls check the token (e.g. Executor.cancel_scope); without
+                          one, a job counts as cancelled if cancel() returned True
+            max_backlog: queued jobs allowed before low-priority work is dropped
+            stale_after: {priority: seconds} overrides for DEFAULT_STALE_AFTER
+            on_complete: optional callable(job) after each job finishes or is dropped
+        """
+        self.execute = execute
+        self.cancel_running = cancel
+        self.max_backlog = max_backlog
+        self.stale_after = dict(DEFAULT_STALE_AFTER)
+        self.stale_after.update(stale_after or {})
+        self.on_complete = on_complete
+        self.cancel_scope = cancel_scope
+
+        self._heap = []  # (priority, seq, job)
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        self._lock = threading.Condition()
+        self._pending = 0
+        self._unfinished = {}  # job id -> queued or running Job (for depends_on)
+        self.current: Optional[Job] = None
+
+        self.queue_waits = {p: LatencyHistogram() for p in PRIORITY_NAMES}
+        self.dropped = {p: 0 for p in PRIORITY_NAMES}
+        self.cancel_latency = LatencyHistogram()  # cancel() call -> job finished
+        self._cancel_requested = {}  # job id -> time cancel() was called
+
+        self.is_running = False
+        self._worker = None
+
+    # ============================================================
+    # LIFECYCLE
+    # ============================================================
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self._worker = threading.Thread(target=self._run_loop, daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout=2):
+        with self._lock:
+            self.is_running = False
+            self._lock.notify_all()
+        if self._worker:
+            self._worker.join(timeout=timeout)
+
+    # ============================================================
+    # QUEUE
+    # ============================================================
+
+    def submit(self, intent, priority=None, depends_on=None):
+        """
+        Queue an intent; returns its Job
+        depends_on: a Job (or job id) - if it fails or is cancelled, this job is drained too
+        """
+        if priority is None:
+            priority = priority_for(intent)
+        if isinstance(depends_on, Job):
+            depends_on = depends_on.id
+        job = Job(next(self._ids), intent, priority, depends_on)
+
+        with self._lock:
+            heapq.heappush(self._heap, (priority, next(self._seq), job))
+            self._unfinished[job.id] = job
+            self._pending += 1
+            self._shed_backlog()
+            self._lock.notify()
+
+        return job
+
+    def backlog(self):
+        """Queued (not yet running) jobs in run order"""
+        with self._lock:
+            return [job for _, _, job in sorted(self._heap) if job.status == 'queued']
+
+    def _drop(self, job, status='dropped'):
+        """Mark a queued job as dropped or cancelled (caller holds the lock)"""
+        job.status = status
+        job.finished_at = time.perf_counter()
+        self._pending -= 1
+        self._unfinished.pop(job.id, None)
+        if status == 'dropped':
+            self.dropped[job.priority] += 1
+        job.done.set()
+        if self.on_complete:
+            self.on_complete(job)
+        if status == 'dropped':
+            self._drain_dependents({job.id})
+
+    def _shed_backlog(self):
+        """Drop the oldest lowest-priority jobs while over max_backlog (caller holds the lock)"""
+        while self._pending > self.max_backlog:
+            queued = [job for _, _, job in self._heap if job.status == 'queued']
+            droppable = [job for job in queued if job.priority != PRIORITY_TRANSPORT]
+            if not droppable:
+                return
+            lowest = max(job.priority for job in droppable)
+            oldest = min((job for job in droppable if job.priority == lowest),
+                         key=lambda job: job.submitted_at)
+            self._drop(oldest)
+
+    def _drain_dependents(self, job_ids):
+        """Cancel queued jobs depending (transitively) on job_ids (caller holds the lock)"""
+        drained = []
+        changed = True
+        while changed:
+            changed = False
+            for _, _, job in self._heap:
+                if job.status == 'queued' and job.depends_on in job_ids:
+                    self._drop(job, 'cancelled')
+                    job_ids.add(job.id)
+                    drained.append(job)
+                    changed = True
+        return drained
+
+    def cancel(self, job_id=None):
+        """
+        Cancel the running job (or a specific job id) and drain its dependents.
+        A running target is only asked to stop - its final status says whether it did.
+        Returns: list of jobs cancelled or asked to stop (empty if nothing to cancel)
+        """
+        with self._lock:
+            target = None
+            if job_id is None or (self.current and self.current.id == job_id):
+                target = self.current
+            else:
+                for _, _, job in self._heap:
+                    if job.id == job_id and job.status == 'queued':
+                        target = job
+            if target is None:
+                return []
+
+            cancelled = [target]
+            if target.status == 'queued':
+                self._drop(target, 'cancelled')
+            else:
+                target.cancel_token.requested = True
+                self._cancel_requested[target.id] = time.perf_counter()
+            cancelled += self._drain_dependents({target.id})
+
+        if target.status == 'running' and self.cancel_running:
+            if self.cancel_running() and self.cancel_scope is None:
+                target.cancel_token.stopped = True
+        return cancelled
+
+    def _is_stale(self, job, now):
+        limit = self.stale_after.get(job.priority)
+        return limit is not None and now - job.submitted_at > limit
+
+    def _next_job(self):
+        """
+        Pop the next runnable job, dropping stale ones (caller holds the lock).
+        Jobs whose dependency has not finished yet stay queued.
+        """
+        waiting = []
+        job = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            candidate = entry[2]
+            if candidate.status != 'queued':
+                continue
+            if self._is_stale(candidate, time.perf_counter()):
+                self._drop(candidate)
+                continue
+            if candidate.depends_on in self._unfinished:
+                waiting.append(entry)
+                continue
+            job = candidate
+            break
+
+        for entry in waiting:
+            heapq.heappush(self._heap, entry)
+        return job
+
+    # ============================================================
+    # WORKER
+    # ============================================================
+
+    def _run_loop(self):
+        while True:
+            with self._lock:
+                job = self._next_job()
+                while job is None and self.is_running:
+                    self._lock.wait()
+                    job = self._next_job()
+                if job is None:
+                    return
+
+                job.status = 'running'
+                job.started_at = time.perf_counter()
+                self._pending -= 1
+                self.current = job
+                self.queue_waits[job.priority].record(job.queue_wait)
+
+            scope = self.cancel_scope(job.cancel_token) if self.cancel_scope else nullcontext()
+            try:
+                with scope:
+                    job.result = self.execute(job.intent)
+            except Exception as e:
+                job.result = e
+
+            with self._lock:
+                job.finished_at = time.perf_counter()
+                self._unfinished.pop(job.id, None)
+                requested = self._cancel_requested.pop(job.id, None)
+                if requested is not None and job.cancel_token.stopped:
+                    job.status = 'cancelled'
+                    self.cancel_latency.record(job.finished_at - requested)
+                else:
+                    job.status = 'done'
+                self.current = None
+                if job.status == 'cancelled' or not succeeded(job.result):
+                    self._drain_dependents({job.id})
+            job.done.set()
+            if self.on_complete:
+                self.on_complete(job)
+
+    # ============================================================
+    # STATS
+    # ============================================================
+
+    def stats(self):
+        """Queue-wait summary (seconds) and drop counts per priority class"""
+        report = {}
+        for priority, name in PRIORITY_NAMES.items():
+            summary = self.queue_waits[priority].summary()
+            summary['dropped'] = self.dropped[priority]
+            report[name] = summary
+        return report
+
+    def cancel_stats(self):
+        """How long cancel() took to free the worker (seconds)"""
+        return self.cancel_latency.summary()
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    from types import SimpleNamespace
+
+    from executor import OsascriptExecutor, SimulatedExecutor
+    from latency_stats import AdaptiveTimeouts
+    from router import CommandRouter
+    from simulated_logic import SimulatedLogic
+
+    print("🚦 MiDAS AI - Priority Command Scheduler")
+    print("=" * 60)
+    print()
+
+    executor = SimulatedExecutor(
+        SimulatedLogic(["Lead Vocals", "Drums", "Bass"]),
+        command_latency=0.02,
+        action_latency={'create_track': 0.04, 'vocal_chain': 0.3},
+        ui_waits=False
+    )
+    router = CommandRouter(executor=executor)
+    order = []
+    scheduler = CommandScheduler(router.execute, max_backlog=6,
+                                 on_complete=lambda job: order.append((job.status, job.intent.text)))
+
+    texts = [
+        "create full song session",
+        "vocal chain on track 2",
+        "vocals up 3 db",
+        "mute drums",
+        "create beat session",
+        "stop",
+    ]
+    jobs = [scheduler.submit(router.route(text)) for text in texts]
+    scheduler.start()
+    for job in jobs:
+        job.wait(5)
+    scheduler.stop()
+
+    print("Execution order:")
+    for status, text in order:
+        print(f"   {status:>7}: {text}")
+
+    ran = [text for status, text in order if status == 'done']
+    assert ran[0] == "stop", "transport should run first"
+    print()
+    print(f"{'class':<12} {'runs':>5} {'p50 wait':>10} {'max wait':>10} {'dropped':>8}")
+    for name, s in scheduler.stats().items():
+        p50 = f"{s['p50'] * 1000:.0f} ms" if s['p50'] is not None else '-'
+        worst = f"{s['max'] * 1000:.0f} ms" if s['max'] is not None else '-'
+        print(f"{name:<12} {s['count']:>5} {p50:>10} {worst:>10} {s['dropped']:>8}")
+
+    # Backlog shedding: flood with low-priority work
+    shed = CommandScheduler(router.execute, max_backlog=3)
+    for _ in range(5):
+        shed.submit(router.route("how do i mix drums"))
+    shed.submit(router.route("play"))
+    print()
+    print(f"Flooded backlog kept {len(shed.backlog())} jobs, "
+          f"dropped {shed.stats()['background']['dropped']} background jobs")
+
+    # Cancellation: abort a long session template by voice, its follow-ups are drained
+    print()
+    cancel_router = CommandRouter(executor=SimulatedExecutor(
+        SimulatedLogic(["Lead Vocals", "Drums"]),
+        action_latency={'create_track': 10.0},
+        ui_waits=False
+    ))
+    cancel_router.start_scheduler()
+    _, session_job = cancel_router.submit("create full song session")
+    _, chain_job = cancel_router.submit("vocal chain on track 1", depends_on=session_job)
+    time.sleep(0.1)
+    cancel_router.submit("never mind")
+    session_job.wait(2)
+    chain_job.wait(2)
+    cancel_router.stop_scheduler()
+
+    assert session_job.status == 'cancelled' and chain_job.status == 'cancelled'
+    freed = cancel_router.scheduler.cancel_stats()['max']
+    print(f"Cancelled session template + dependent in {freed * 1000:.1f} ms")
+    assert freed < 0.1
+
+    # The cancel sticks for the rest of the job: later executor calls are refused
+    sim = SimulatedExecutor(SimulatedLogic(["Lead Vocals", "Drums"]), command_latency=0.3)
+    script = cancel_router.mixing.script_dir / 'mixing.scpt'
+    steps = CommandScheduler(lambda intent: [sim.run(script, ['mute', name]) for name in intent.args],
+                             cancel=sim.cancel, cancel_scope=sim.cancel_scope)
+    steps.start()
+    multi = steps.submit(SimpleNamespace(source='mixing', args=['Drums', 'Lead Vocals', 'Drums']))
+    time.sleep(0.1)
+    steps.cancel()
+    multi.wait(2)
+    assert multi.status == 'cancelled' and sim.invocations == 1, (multi.status, sim.invocations)
+    assert all(result.cancelled for result in multi.result)
+    print(f"Cancelled a 3-call job after {sim.invocations} call, in "
+          f"{steps.cancel_stats()['max'] * 1000:.1f} ms")
+
+    # A job that finishes before the cancel reaches it is reported done, with its real result
+    steps.execute = lambda intent: (time.sleep(0.2), 'finished')[1]  # no executor call to stop
+    late = steps.submit(SimpleNamespace(source='mixing', args=[]))
+    time.sleep(0.1)
+    steps.cancel()
+    late.wait(2)
+    steps.stop()
+    assert late.status == 'done' and late.result == 'finished'
+    print(f"Cancel with nothing to stop: job {late.status} ({late.result})")
+
+    # A failed dependency drains its dependents
+    fail_router = CommandRouter(executor=SimulatedExecutor(SimulatedLogic(["Drums"]), command_latency=0.01),
+                                dedupe_window=0)
+    fail_router.start_scheduler()
+    _, missing = fail_router.submit("mute trombones")
+    _, after = fail_router.submit("solo drums", depends_on=missing)
+    after.wait(2)
+    fail_router.stop_scheduler()
+    assert not missing.result.success and after.status == 'cancelled'
+    print(f"Failed dependency ({missing.result.error}) → dependent {after.status}")
+
+    # "Refresh" mid-job queues behind it instead of taking over the executor, so a
+    # following "cancel" still reaches the running job
+    chain_daw = SimulatedLogic(["Lead Vocals", "Drums"])
+    refresh_router = CommandRouter(executor=SimulatedExecutor(
+        chain_daw, command_latency=0.01, action_latency={'vocal_chain': 2.0}), dedupe_window=0)
+    refresh_router.refresh_state()
+    refresh_router.start_scheduler()
+    _, chain = refresh_router.submit("vocal chain on track 1")
+    time.sleep(0.2)
+    _, refresh = refresh_router.submit("refresh")
+    time.sleep(0.05)
+    refresh_router.submit("cancel")
+    chain.wait(2)
+    refresh.wait(2)
+    refresh_router.stop_scheduler()
+    assert chain.status == 'cancelled' and not chain_daw.tracks[0].plugins, chain.status
+    assert refresh.status == 'done' and refresh.result.success
+    print(f"Refresh during a vocal chain: chain {chain.status}, refresh ran after it")
+
+    # Real process: SIGTERM a hung child the way an osascript call would be aborted
+    osascript = OsascriptExecutor(timeouts=AdaptiveTimeouts(stats_file=None))
+    outcome = {}
+    worker = threading.Thread(target=lambda: outcome.update(result=osascript._spawn(['sleep', '10'], 30)))
+    worker.start()
+    time.sleep(0.2)
+    start = time.perf_counter()
+    osascript.cancel()
+    worker.join(5)
+    print(f"Terminated running process in {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"(cancelled={outcome['result'].cancelled})")
+    assert outcome['result'].cancelled
@@ -0,0 +1,130 @@
+"""
+MiDAS AI - Script Library
+One source for the AppleScript handlers every Logic script shares
+
+The result envelope (replaceText, jsonString, jsonNumber, nowMillis,
+resultEnvelope) is written once, in logic-automation/result_envelope.applescript.
+osascript runs each .scpt as a standalone text file, and `load script` would
+need a compiled library at a fixed path on every machine, so each script
+carries a generated copy between BEGIN/END marker lines instead. Edit the
+shared file, then regenerate:
+
+    python script_library.py           → check the copies (exit 1 if one drifted)
+    python script_library.py --write   → rewrite the copies from the shared file
+
+Copies keep their script's indentation (tabs, or 4 spaces in mixing.scpt and
+navigation.scpt).
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import re
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent.parent / 'logic-automation'
+SHARED_FILES = ('result_envelope.applescript',)
+
+
+def markers(name):
+    """BEGIN / END lines around the generated copy of a shared file"""
+    return (f"-- BEGIN {name} (generated by voice-engine/script_library.py - edit the shared file, not this copy)",
+            f"-- END {name}")
+
+
+def _indent_unit(script_text):
+    """Tabs, unless the script indents with spaces"""
+    if re.search(r'^\t', script_text, re.M) or not re.search(r'^    \S', script_text, re.M):
+        return '\t'
+    return '    '
+
+
+def render(name, script_text, script_dir=SCRIPT_DIR):
+    """Marked copy of a shared file, indented the way script_text is"""
+    body = (script_dir / name).read_text(encoding='utf-8').rstrip('\n')
+    unit = _indent_unit(script_text)
+    if unit != '\t':
+        body = re.sub(r'^\t+', lambda m: unit * len(m.group()), body, flags=re.M)
+    begin, end = markers(name)
+    return f"{begin}\n{body}\n{end}"
+
+
+def regenerate(script_text, script_dir=SCRIPT_DIR):
+    """script_text with every marked copy replaced by the current shared file"""
+    for name in SHARED_FILES:
+        begin, end = markers(name)
+        block = re.compile(re.escape(begin) + r'\n.*?' + re.escape(end), re.S)
+        if block.search(script_text):
+            copy = render(name, script_text, script_dir)
+            script_text = block.sub(lambda m: copy, script_text)
+    return script_text
+
+
+def sync(script_dir=SCRIPT_DIR, write=True):
+    """
+    Regenerate the shared blocks in every .scpt under script_dir
+    Returns: names of the scripts whose copy was stale (rewritten if write)
+    """
+    stale = []
+    for path in sorted(script_dir.glob('*.scpt')):
+        text = path.read_text(encoding='utf-8')
+        updated = regenerate(text, script_dir)
+        if updated != text:
+            stale.append(path.name)
+            if write:
+                path.write_text(updated, encoding='utf-8')
+    return stale
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    import shutil
+    import sys
+    import tempfile
+
+    if '--write' in sys.argv:
+        rewritten = sync()
+        print(f"Rewrote {len(rewritten)} script(s): {', '.join(rewritten) or '-'}")
+        sys.exit(0)
+
+    print("📚 MiDAS AI - Script Library")
+    print("=" * 60)
+    print()
+
+    scripts = sorted(SCRIPT_DIR.glob('*.scpt'))
+    begin, end = markers('result_envelope.applescript')
+    for path in scripts:
+        text = path.read_text(encoding='utf-8')
+        count = text.count(begin)
+        print(f"{'✅' if count == 1 else '❌'} {path.name:<24} {count} envelope block(s), "
+              f"indent {_indent_unit(text)!r}")
+        assert count == 1 and text.count(end) == 1
+        # The copy is the only definition of each shared handler
+        for handler in ('replaceText', 'jsonString', 'jsonNumber', 'nowMillis', 'resultEnvelope'):
+            assert len(re.findall(rf'^on {handler}\(', text, re.M)) == 1, (path.name, handler)
+
+    stale = sync(write=False)
+    print()
+    print(f"{'✅' if not stale else '❌'} Copies match result_envelope.applescript"
+          f"{'' if not stale else ': stale in ' + ', '.join(stale)}")
+    if stale:
+        print("   Run: python script_library.py --write")
+        sys.exit(1)
+
+    # An edit to the shared file reaches every copy, in each script's indentation
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for path in scripts + [SCRIPT_DIR / name for name in SHARED_FILES]:
+            shutil.copy(path, tmp / path.name)
+        shared = tmp / 'result_envelope.applescript'
+        shared.write_text(shared.read_text().replace(
+            'return my replaceText(theNumber as text, ",", ".")',
+            'set numberText to theNumber as text\n\treturn my replaceText(numberText, ",", ".")'))
+        assert sorted(sync(tmp, write=False)) == [p.name for p in scripts]
+        assert sorted(sync(tmp)) == [p.name for p in scripts] and sync(tmp) == []
+        assert '\n    set numberText to' in (tmp / 'mixing.scpt').read_text()
+        assert '\n\tset numberText to' in (tmp / 'session_manager.scpt').read_text()
+    print("✅ A change to the shared file regenerates all "
+          f"{len(scripts)} scripts, indentation preserved")
@@ -0,0 +1,99 @@
+"""
+MiDAS AI - Script Result Protocol
+Decodes the JSON result envelope every automation script returns
+
+    {"status": "ok" | "error", "message": "...", "values": {...}, "ms": 12.5}
+
+    status  - whether the handler succeeded
+    message - text for the user (snapshots carry their payload here)
+    values  - state read back from Logic after the command (track fader/mute/solo,
+              playhead/tempo/cycle), so the shadow state doesn't re-query
+    ms      - time spent inside the script, excluding osascript start-up
+
+Anything that isn't an envelope (a script from an older install, an AppleScript
+record printed as text) is still decoded, with "Error..." text and
+"success:false" records treated as failures.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import json
+import re
+
+# How osascript prints a {success:..., message:...} record
+RECORD_OUTPUT = re.compile(r'^success:(?P<success>true|false), message:(?P<message>.*?)(?:, \w+:.*)?$',
+                           re.DOTALL)
+
+
+def encode_result(success, message, values=None, ms=None):
+    """Envelope text as the scripts produce it (used by the simulator)"""
+    return json.dumps({
+        'status': 'ok' if success else 'error',
+        'message': message,
+        'values': values or {},
+        'ms': ms,
+    })
+
+
+def decode_result(output):
+    """
+    Decode one script result
+    Returns: {'success': bool, 'message': str, 'values': dict, 'ms': float or None}
+    """
+    output = output.strip()
+    if output.startswith('{'):
+        try:
+            envelope = json.loads(output, strict=False)  # snapshots carry raw separators
+        except ValueError:
+            envelope = None
+        if isinstance(envelope, dict) and 'status' in envelope:
+            values = envelope.get('values')
+            return {
+                'success': envelope['status'] == 'ok',
+                'message': str(envelope.get('message', '')),
+                'values': values if isinstance(values, dict) else {},
+                'ms': envelope.get('ms'),
+            }
+
+    record = RECORD_OUTPUT.match(output)
+    if record:
+        return {'success': record.group('success') == 'true', 'message': record.group('message'),
+                'values': {}, 'ms': None}
+
+    return {'success': not output.startswith('Error'), 'message': output, 'values': {}, 'ms': None}
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    print("📦 MiDAS AI - Script Result Protocol")
+    print("=" * 60)
+    print()
+
+    tests = [
+        ('{"status":"ok","message":"Bass up 3 dB","values":{"track":"Bass","volume_db":3,'
+         '"mute":false,"solo":false},"ms":41.2}', True, {'track': 'Bass', 'volume_db': 3,
+                                                         'mute': False, 'solo': False}),
+        ('{"status":"error","message":"Track not found: Strings","values":{},"ms":12}', False, {}),
+        ('{"status":"ok","message":"track\x1fKick\x1f0\x1ffalse\x1ffalse","values":{},"ms":3}', True, {}),
+        ("success:false, message:Track not found: Strings", False, {}),
+        ("success:true, message:Bar 5, position:5", True, {}),
+        ("Error: Unknown command 'foo'", False, {}),
+        ("Loaded vocal chain on track 2", True, {}),
+    ]
+
+    passed = 0
+    for output, success, values in tests:
+        decoded = decode_result(output)
+        ok = decoded['success'] == success and decoded['values'] == values
+        passed += ok
+        print(f"{'✅' if ok else '❌'} {output[:48]!r:<52} → {decoded['success']}, {decoded['message']!r}")
+
+    round_trip = decode_result(encode_result(True, "Playing", {'position': 5.0, 'playing': True}, 8.0))
+    assert round_trip == {'success': True, 'message': "Playing",
+                          'values': {'position': 5.0, 'playing': True}, 'ms': 8.0}
+
+    print()
+    print(f"RESULTS: {passed} passed, {len(tests) - passed} failed")
@@ -2,23 +2,50 @@
 """
 MiDAS - Phase 7: Session Management Voice Command Parser
 Parses natural language commands for session templates and organization
+
+Templates are data (session_templates.json) compiled into one batch of UI
+steps - create, rename, color, group - whose waits come from a delay
+profile (delay_profile.py): polling steps get a generous ceiling, the
+color step a settle time calibrated on measured UI responses.
+Snapshot commands (save/recall/compare a mix) are parsed here and run by
+the router against the shadow project state (session_snapshots.py).
 Built: February 18, 2026
 """
 
 import json
 import re
-import subprocess
 from pathlib import Path
 
+from delay_profile import DelayProfile
+from executor import ExecutionResult, OsascriptExecutor
+
 class SessionParser:
-    def __init__(self):
+    # Actions the router runs from the project state (no session_manager.scpt command)
+    SNAPSHOT_ACTIONS = {'snapshot_save', 'snapshot_recall', 'snapshot_list',
+                        'snapshot_compare', 'snapshot_delete'}
+    
+    def __init__(self, executor=None, delay_profile=None):
+        """
+        Args:
+            executor: Executor to run commands with (default: real Logic Pro)
+            delay_profile: DelayProfile for template steps (default: calibrated and
+                           persisted in ~/.midas for real Logic Pro, in-memory otherwise)
+        """
         # Load command patterns
         commands_file = Path(__file__).parent / 'session_commands.json'
         with open(commands_file, 'r') as f:
             self.commands = json.load(f)
         
+        # Template definitions
+        with open(Path(__file__).parent / 'session_templates.json', 'r') as f:
+            self.templates = json.load(f)
+        
         # AppleScript file path
         self.script_path = Path(__file__).parent.parent / 'logic-automation' / 'session_manager.scpt'
+        if delay_profile is None:
+            delay_profile = DelayProfile() if executor is None else DelayProfile(profile_file=None)
+        self.delay_profile = delay_profile
+        self.executor = executor or OsascriptExecutor()
         
     def parse(self, text):
         """Parse natural language command and return session command"""
@@ -63,6 +90,9 @@ class SessionParser:
             if var == 'bpm':
                 # Match BPM values (30-300)
                 regex_pattern = regex_pattern.replace(f'{{{var}}}', r'(\d+)')
+            elif var in ('name', 'other'):
+                # Snapshot names (any words)
+                regex_pattern = regex_pattern.replace(f'{{{var}}}', r'(.+?)')
         
         # Try to match
         regex_pattern = '^' + regex_pattern + '$'
@@ -95,6 +125,8 @@ class SessionParser:
             args = ['reset_mixer']
         elif action == 'set_tempo':
             args = ['set_tempo', vars_dict['bpm']]
+        elif action in self.SNAPSHOT_ACTIONS:
+            args = [action] + [vars_dict[var] for var in ('name', 'other') if var in vars_dict]
         
         return {
             'action': action,
@@ -118,48 +150,111 @@ class SessionParser:
             return "Resetting mixer (clearing solo/mute)"
         elif action == 'set_tempo':
             return f"Setting project tempo to {vars_dict['bpm']} BPM"
+        elif action == 'snapshot_save':
+            return f"Saving snapshot '{vars_dict['name']}'"
+        elif action == 'snapshot_recall':
+            return f"Recalling snapshot '{vars_dict['name']}'"
+        elif action == 'snapshot_list':
+            return "Listing snapshots"
+        elif action == 'snapshot_compare':
+            return f"Comparing '{vars_dict['name']}' with '{vars_dict['other']}'"
+        elif action == 'snapshot_delete':
+            return f"Deleting snapshot '{vars_dict['name']}'"
         return "Executing session command"
     
+    def compile_template(self, action):
+        """
+        Compile a template into UI steps for session_manager.scpt's batch mode
+        Returns: {'action', 'steps': [argv, ...], 'tracks': [name, ...], 'folders': [name, ...],
+                  'max_seconds': wait if no polling step finishes early} or None
+        Raises ValueError if a folder's tracks aren't consecutive in the template.
+        """
+        template = self.templates.get(action)
+        if template is None:
+            return None
+        
+        names = [track['name'] for track in template['tracks']]
+        folders = {}
+        for folder in template.get('folders', []):
+            end = names.index(folder['tracks'][-1]) + 1
+            if names[end - len(folder['tracks']):end] != folder['tracks']:
+                raise ValueError(f"Folder {folder['name']}: tracks must be consecutive")
+            folders[folder['tracks'][-1]] = folder
+        
+        wait = self.delay_profile.wait_for
+        steps = []
+        for track in template['tracks']:
+            steps.append(['create_track', track['type'], str(wait('create_track'))])
+            steps.append(['rename_current', track['name'], str(wait('rename_current'))])
+            steps.append(['color_current', track['color'], str(wait('color_current'))])
+            
+            # Pack the folder once its last track exists; the folder is then selected
+            folder = folders.get(track['name'])
+            if folder:
+                steps.append(['group_last', str(len(folder['tracks'])), str(wait('group_last'))])
+                steps.append(['rename_current', folder['name'], str(wait('rename_current'))])
+                steps.append(['color_current', folder['color'], str(wait('color_current'))])
+        
+        return {
+            'action': action,
+            'steps': steps,
+            'tracks': names,
+            'folders': [folder['name'] for folder in template.get('folders', [])],
+            'max_seconds': sum(float(step[-1]) for step in steps),
+        }
+    
+    def run_template(self, action):
+        """
+        Run a compiled template in one osascript call
+        Measured UI responses are fed back into the delay profile; a polling step
+        that hit its ceiling is recorded as a timeout (censored, not a sample).
+        Returns: ExecutionResult
+        """
+        plan = self.compile_template(action)
+        results = self.executor.run_batch(self.script_path, plan['steps'], timeout=10)
+        
+        for step, (args, result) in enumerate(zip(plan['steps'], results), 1):
+            if 'response_ms' in result.values:
+                self.delay_profile.record(args[0], result.values['response_ms'] / 1000)
+            elif result.values.get('timed_out'):
+                self.delay_profile.record_timeout(args[0])
+            if not result.success:
+                # The batch stops here - later steps never ran
+                return ExecutionResult(False, error=f"Template stopped at step {step} "
+                                                    f"({' '.join(args[:2])}): {result.error}",
+                                       cancelled=result.cancelled, timed_out=result.timed_out)
+        
+        template = self.templates[action]
+        output = f"Created {len(plan['tracks'])}-track {template['description']}"
+        if plan['folders']:
+            output += f" in {len(plan['folders'])} folders ({', '.join(plan['folders'])})"
+        output += "\nTracks: " + ", ".join(plan['tracks'])
+        return ExecutionResult(True, output=output)
+    
     def execute(self, command):
         """Execute AppleScript command"""
         if not command:
             return {"success": False, "error": "No command parsed"}
+        if command['action'] in self.SNAPSHOT_ACTIONS:
+            return {"success": False, "error": "Snapshots need the project state - run them through CommandRouter",
+                    "description": command['description']}
         
-        try:
-            # Build osascript command
-            cmd = ['osascript', str(self.script_path)] + command['args']
-            
-            # Execute
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30  # Longer timeout for template creation
-            )
-            
-            if result.returncode == 0:
-                return {
-                    "success": True,
-                    "output": result.stdout.strip(),
-                    "description": command['description']
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": result.stderr.strip(),
-                    "description": command['description']
-                }
+        # Execute AppleScript (longer timeout for template creation)
+        if command['action'] in self.templates:
+            result = self.run_template(command['action'])
+        else:
+            result = self.executor.run(self.script_path, command['args'], timeout=30)
         
-        except subprocess.TimeoutExpired:
+        if result.success:
             return {
-                "success": False,
-                "error": "Command timed out",
+                "success": True,
+                "output": result.output,
                 "description": command['description']
             }
-        except Exception as e:
+        else:
             return {
                 "success": False,
-                "error": str(e),
+                "error": result.error,
                 "description": command['description']
             }
     
@@ -207,7 +302,13 @@ def test_parser():
         "clear mixer",
         "set tempo to 120",
         "tempo 140",
-        "90 bpm"
+        "90 bpm",
+        
+        # Snapshots
+        "save snapshot verse mix",
+        "recall snapshot verse mix",
+        "list snapshots",
+        "compare verse mix with chorus mix"
     ]
     
     print("=" * 60)
@@ -234,5 +335,64 @@ def test_parser():
     print("=" * 60)
 
 
+def test_templates():
+    """Compiled templates vs the fixed-delay scripts on the simulated DAW"""
+    from executor import SimulatedExecutor
+    from simulated_logic import SimulatedLogic
+    
+    print("\n" + "=" * 60)
+    print("COMPILED SESSION TEMPLATES (simulated Logic Pro)")
+    print("=" * 60)
+    
+    parser = SessionParser(executor=SimulatedExecutor(realtime=False))
+    uncalibrated = parser.compile_template('full_song_session')['max_seconds']
+    for action in parser.templates:
+        legacy = SimulatedExecutor(SimulatedLogic(), realtime=False)
+        legacy.run(parser.script_path, [action], timeout=60)
+        
+        daw = SimulatedLogic()
+        compiled = SimulatedExecutor(daw, realtime=False)
+        parser.executor = compiled
+        plan = parser.compile_template(action)
+        result = parser.run_template(action)
+        
+        # Steps ran in plan order and built the template's tracks in order
+        ran = [args for script, args in daw.log]
+        assert result.success and ran == plan['steps'], result.error
+        assert [t.name for t in daw.tracks if t.kind != 'folder'] == plan['tracks']
+        assert [t.name for t in daw.tracks if t.kind == 'folder'] == plan['folders']
+        
+        print(f"\n{action}: {len(plan['steps'])} steps in {compiled.invocations} call(s)")
+        print(f"   fixed delays: {legacy.virtual_time:5.1f} s")
+        print(f"   compiled:     {compiled.virtual_time:5.1f} s (at most {plan['max_seconds']:.1f} s)")
+    
+    # Fast responses recorded along the way never shorten a polling step's ceiling
+    profile = parser.delay_profile
+    print(f"\nDelay profile waits: { {k: s['wait'] for k, s in profile.stats().items()} }")
+    assert parser.compile_template('full_song_session')['max_seconds'] == uncalibrated
+    
+    # A UI twice as slow as the old fixed delay still builds the template
+    daw = SimulatedLogic()
+    daw.ui_response['create_track'] = 2.0
+    parser.executor = SimulatedExecutor(daw, realtime=False)
+    result = parser.run_template('vocal_session')
+    assert result.success, result.error
+    print(f"Slow UI (2 s per new track): {result.output.splitlines()[0]}")
+    
+    # A hung UI stops the batch instead of typing into the wrong track, and the
+    # timeout raises the ceiling rather than leaving only fast samples behind
+    ceiling = profile.ceiling_for('create_track')
+    daw = SimulatedLogic()
+    daw.ui_response['create_track'] = 30.0
+    parser.executor = SimulatedExecutor(daw, realtime=False)
+    result = parser.run_template('vocal_session')
+    assert not result.success and len(daw.tracks) == 0
+    assert profile.censored['create_track'] == 1 and profile.ceiling_for('create_track') > ceiling
+    print(f"Hung UI: {result.error}")
+    print(f"   create_track ceiling {ceiling:.2f} s → {profile.ceiling_for('create_track'):.2f} s")
+    print("✅ Template steps ran in order, faster than the fixed delays")
+
+
 if __name__ == '__main__':
     test_parser()
+    test_templates()
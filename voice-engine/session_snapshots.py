@@ -0,0 +1,478 @@
+"""
+MiDAS AI - Session Snapshots
+Saved mixes ("verse mix", "rough 2") and minimal-diff recall
+
+A snapshot captures the shadow project state - faders, mute/solo, colors,
+names, insert plugins, markers and tempo - from one full project snapshot
+and stores it as a compact versioned JSON file:
+
+    {"version": 1, "name": "verse mix", "saved_at": 1771400000.0, "tempo": 120,
+     "tracks": [["Lead Vocals", -3, 2, "red", "audio", ["Channel EQ"]], ...],
+     "markers": [["verse", 5], ...]}
+
+Track rows follow TRACK_COLUMNS; flags are MUTE | SOLO bits. An index
+file keeps every snapshot's summary plus a digest per track, so listing
+snapshots and finding which tracks differ between two of them never opens
+the snapshot files.
+
+Recall diffs the snapshot against the current state and sends only what
+differs - renames, colors, faders, mute/solo, plugin slots, tempo, missing
+markers - as one batched plan (router.recall_snapshot()).
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from mixer_diff import DB_TOLERANCE, plan_mixer_changes
+from project_state import MarkerState, TrackState
+
+DEFAULT_SNAPSHOT_DIR = Path.home() / '.midas' / 'snapshots'
+INDEX_FILE = 'index.json'
+
+# Bumped when the file layout changes; older files are still read
+FORMAT_VERSION = 1
+
+TRACK_COLUMNS = ('name', 'volume_db', 'flags', 'color', 'kind', 'plugins')
+MUTE = 1
+SOLO = 2
+
+# Marker positions closer than this (bars) are the same marker
+POSITION_TOLERANCE = 0.001
+
+
+@dataclass
+class SessionSnapshot:
+    """One saved state of the project"""
+    name: str
+    tracks: List[TrackState] = field(default_factory=list)
+    markers: List[MarkerState] = field(default_factory=list)
+    tempo: Optional[float] = None
+    saved_at: float = 0.0
+
+
+def snapshot_key(name):
+    """Lookup key for a snapshot name ("Verse Mix" and "verse mix" are the same)"""
+    return " ".join(name.lower().split())
+
+
+def capture_snapshot(name, state, clock=time.time):
+    """Copy a ProjectState into a snapshot"""
+    return SessionSnapshot(
+        name,
+        [TrackState(t.name, t.volume_db, t.mute, t.solo, t.kind,
+                    list(t.plugins) if t.plugins is not None else None, t.color)
+         for t in state.tracks],
+        [MarkerState(m.name, m.position) for m in state.markers],
+        state.tempo,
+        clock(),
+    )
+
+
+# ============================================================
+# FILE FORMAT
+# ============================================================
+
+def encode_track(track):
+    """TrackState as a TRACK_COLUMNS row"""
+    flags = (MUTE if track.mute else 0) | (SOLO if track.solo else 0)
+    return [track.name, round(track.volume_db, 2), flags, track.color, track.kind, track.plugins]
+
+
+def decode_track(row):
+    name, volume_db, flags, color, kind, plugins = row
+    return TrackState(name, float(volume_db), bool(flags & MUTE), bool(flags & SOLO),
+                      kind, plugins, color)
+
+
+def encode_snapshot(snapshot):
+    """Snapshot as a JSON-ready dict"""
+    return {
+        'version': FORMAT_VERSION,
+        'name': snapshot.name,
+        'saved_at': snapshot.saved_at,
+        'tempo': snapshot.tempo,
+        'tracks': [encode_track(t) for t in snapshot.tracks],
+        'markers': [[m.name, m.position] for m in snapshot.markers],
+    }
+
+
+def decode_snapshot(data):
+    """
+    Snapshot from a decoded file
+    Raises ValueError for files written by a newer format version.
+    """
+    version = data.get('version', 0)
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Snapshot format v{version} is newer than this MiDAS (v{FORMAT_VERSION})")
+    return SessionSnapshot(
+        data['name'],
+        [decode_track(row) for row in data['tracks']],
+        [MarkerState(name, float(position)) for name, position in data.get('markers', [])],
+        data.get('tempo'),
+        data.get('saved_at', 0.0),
+    )
+
+
+def digest(value):
+    """Short stable hash of a JSON-ready value"""
+    text = json.dumps(value, separators=(',', ':'), sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:10]
+
+
+def summarize(snapshot):
+    """Index entry: what list() shows plus the digests changed_tracks() compares"""
+    return {
+        'name': snapshot.name,
+        'saved_at': snapshot.saved_at,
+        'tempo': snapshot.tempo,
+        'track_count': len(snapshot.tracks),
+        'marker_count': len(snapshot.markers),
+        'tracks': {t.name: digest(encode_track(t)) for t in snapshot.tracks},
+        'markers': digest([[m.name, m.position] for m in snapshot.markers]),
+    }
+
+
+# ============================================================
+# COMPARE / RECALL
+# ============================================================
+
+def compare_snapshots(a, b):
+    """
+    Differences going from snapshot a to snapshot b
+    Returns: list of human-readable lines (empty = identical)
+    """
+    lines = []
+    before = {t.name: t for t in a.tracks}
+    after = {t.name: t for t in b.tracks}
+
+    for track in b.tracks:
+        old = before.get(track.name)
+        if old is None:
+            lines.append(f"{track.name}: only in {b.name}")
+            continue
+        changes = []
+        if abs(old.volume_db - track.volume_db) > DB_TOLERANCE:
+            changes.append(f"{old.volume_db:g} → {track.volume_db:g} dB")
+        if old.mute != track.mute:
+            changes.append("muted" if track.mute else "unmuted")
+        if old.solo != track.solo:
+            changes.append("soloed" if track.solo else "unsoloed")
+        if old.color != track.color:
+            changes.append(f"color {old.color or '?'} → {track.color or '?'}")
+        if old.plugins != track.plugins:
+            changes.append(f"plugins {', '.join(old.plugins or []) or 'none'} → "
+                           f"{', '.join(track.plugins or []) or 'none'}")
+        if changes:
+            lines.append(f"{track.name}: {', '.join(changes)}")
+    for track in a.tracks:
+        if track.name not in after:
+            lines.append(f"{track.name}: only in {a.name}")
+
+    if a.tempo != b.tempo:
+        lines.append(f"Tempo: {_bpm(a.tempo)} → {_bpm(b.tempo)} BPM")
+    added = [m.name for m in b.markers if not _has_marker(a.markers, m)]
+    removed = [m.name for m in a.markers if not _has_marker(b.markers, m)]
+    if added:
+        lines.append(f"Markers only in {b.name}: {', '.join(added)}")
+    if removed:
+        lines.append(f"Markers only in {a.name}: {', '.join(removed)}")
+    return lines
+
+
+def _bpm(tempo):
+    return f"{tempo:g}" if tempo is not None else "?"
+
+
+def _has_marker(markers, marker):
+    return any(m.name == marker.name and abs(m.position - marker.position) <= POSITION_TOLERANCE
+               for m in markers)
+
+
+def plan_recall(current, snapshot):
+    """
+    Smallest set of commands that moves the project to snapshot
+    Args:
+        current: ProjectState with fresh mixer, plugins, markers, tempo and position
+        snapshot: SessionSnapshot to recall
+    Returns: (commands, missing) - commands are (script name, argv) in run order,
+             missing are snapshot tracks the project no longer has
+    """
+    tracks = [TrackState(t.name, t.volume_db, t.mute, t.solo, t.kind, t.plugins, t.color)
+              for t in current.tracks]
+    target = {t.name: t for t in snapshot.tracks}
+    existing = {t.name for t in tracks}
+    commands = []
+
+    # Renamed tracks: a snapshot name missing from the project whose channel
+    # holds a track the snapshot doesn't know
+    for number, wanted in enumerate(snapshot.tracks, 1):
+        if wanted.name in existing or number > len(tracks):
+            continue
+        track = tracks[number - 1]
+        if track.name not in target:
+            commands.append(('track_management.scpt', ['rename', str(number), wanted.name]))
+            existing.discard(track.name)
+            existing.add(wanted.name)
+            track.name = wanted.name
+
+    # Colors (unknown current colors are set - Logic may not report them)
+    for number, track in enumerate(tracks, 1):
+        wanted = target.get(track.name)
+        if wanted is not None and wanted.color and wanted.color != track.color:
+            commands.append(('track_management.scpt', ['color', str(number), wanted.color]))
+
+    commands += [('mixing.scpt', args) for args in plan_mixer_changes(tracks, target)]
+
+    # Plugins: keep the common leading slots, remove the rest from the end, load the missing
+    for number, track in enumerate(tracks, 1):
+        wanted = target.get(track.name)
+        if wanted is None or wanted.plugins is None or track.plugins is None:
+            continue
+        keep = 0
+        while (keep < min(len(track.plugins), len(wanted.plugins))
+               and track.plugins[keep] == wanted.plugins[keep]):
+            keep += 1
+        for slot in range(len(track.plugins), keep, -1):
+            commands.append(('plugin_control.scpt', ['remove', str(number), str(slot)]))
+        for slot, plugin in enumerate(wanted.plugins[keep:], keep + 1):
+            commands.append(('plugin_control.scpt', ['load_plugin', str(number), plugin, str(slot)]))
+
+    if snapshot.tempo is not None and (current.tempo is None
+                                       or abs(current.tempo - snapshot.tempo) > 0.01):
+        commands.append(('navigation.scpt', ['set-tempo', f"{snapshot.tempo:g}"]))
+
+    # Markers can be added but not deleted by script; create at a stopped playhead, then return
+    missing_markers = [m for m in snapshot.markers if not _has_marker(current.markers, m)]
+    if missing_markers:
+        if current.playing:
+            commands.append(('navigation.scpt', ['stop']))
+        for marker in missing_markers:
+            commands.append(('navigation.scpt', ['locate', f"{marker.position:g}"]))
+            commands.append(('navigation.scpt', ['create-marker', marker.name]))
+        if current.playhead is not None:
+            commands.append(('navigation.scpt', ['locate', f"{current.playhead:g}"]))
+
+    missing = [t.name for t in snapshot.tracks if t.name not in existing]
+    return commands, missing
+
+
+# ============================================================
+# STORE
+# ============================================================
+
+class SnapshotStore:
+    """Snapshot files plus an index for listing and quick comparisons"""
+
+    def __init__(self, directory=DEFAULT_SNAPSHOT_DIR):
+        """
+        Args:
+            directory: folder for snapshot files (None = in-memory only)
+        """
+        self.directory = Path(directory) if directory else None
+        self.index = {}      # key -> summarize() entry plus 'file'
+        self._memory = {}    # key -> encoded snapshot (in-memory store)
+        self._load_index()
+
+    def _file_for(self, key):
+        slug = re.sub(r'[^a-z0-9]+', '-', key).strip('-') or 'snapshot'
+        return f"{slug}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:6]}.json"
+
+    def save(self, snapshot):
+        """Store a snapshot (replaces one with the same name)"""
+        key = snapshot_key(snapshot.name)
+        data = encode_snapshot(snapshot)
+        entry = summarize(snapshot)
+
+        if self.directory is None:
+            self._memory[key] = data
+        else:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            entry['file'] = self.index.get(key, {}).get('file') or self._file_for(key)
+            with open(self.directory / entry['file'], 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+        self.index[key] = entry
+        self._save_index()
+
+    def load(self, name) -> Optional[SessionSnapshot]:
+        """Snapshot by name, or None"""
+        key = snapshot_key(name)
+        if key not in self.index:
+            return None
+        if self.directory is None:
+            return decode_snapshot(self._memory[key])
+        try:
+            with open(self.directory / self.index[key]['file'], 'r') as f:
+                return decode_snapshot(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def delete(self, name):
+        """Remove a snapshot; True if it existed"""
+        key = snapshot_key(name)
+        entry = self.index.pop(key, None)
+        if entry is None:
+            return False
+        self._memory.pop(key, None)
+        if self.directory is not None:
+            (self.directory / entry['file']).unlink(missing_ok=True)
+        self._save_index()
+        return True
+
+    def list(self):
+        """Index entries, oldest first (no snapshot files are read)"""
+        return sorted(self.index.values(), key=lambda entry: entry['saved_at'])
+
+    def changed_tracks(self, a, b):
+        """
+        Which tracks differ between two snapshots, from the index digests alone
+        Returns: {'changed', 'added', 'removed': [track names], 'markers', 'tempo': bool}
+                 or None if either snapshot doesn't exist
+        """
+        first, second = self.index.get(snapshot_key(a)), self.index.get(snapshot_key(b))
+        if first is None or second is None:
+            return None
+        before, after = first['tracks'], second['tracks']
+        return {
+            'changed': [name for name, value in after.items() if name in before and before[name] != value],
+            'added': [name for name in after if name not in before],
+            'removed': [name for name in before if name not in after],
+            'markers': first['markers'] != second['markers'],
+            'tempo': first['tempo'] != second['tempo'],
+        }
+
+    def compare(self, a, b):
+        """Detailed differences between two snapshots (None if either doesn't exist)"""
+        first, second = self.load(a), self.load(b)
+        if first is None or second is None:
+            return None
+        return compare_snapshots(first, second)
+
+    def _load_index(self):
+        """Read the index (rebuilt from the snapshot files if missing or corrupt)"""
+        if self.directory is None or not self.directory.exists():
+            return
+        try:
+            with open(self.directory / INDEX_FILE, 'r') as f:
+                data = json.load(f)
+            if data.get('version', 0) <= FORMAT_VERSION:
+                self.index = data['snapshots']
+                return
+        except (OSError, ValueError, KeyError):
+            pass
+
+        for path in self.directory.glob('*.json'):
+            if path.name == INDEX_FILE:
+                continue
+            try:
+                with open(path, 'r') as f:
+                    snapshot = decode_snapshot(json.load(f))
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            entry = summarize(snapshot)
+            entry['file'] = path.name
+            self.index[snapshot_key(snapshot.name)] = entry
+        self._save_index()
+
+    def _save_index(self):
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / INDEX_FILE, 'w') as f:
+            json.dump({'version': FORMAT_VERSION, 'snapshots': self.index}, f, separators=(',', ':'))
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    from executor import SimulatedExecutor
+    from router import CommandRouter
+    from simulated_logic import SimulatedLogic
+
+    print("📸 MiDAS AI - Session Snapshots")
+    print("=" * 60)
+    print()
+
+    daw = SimulatedLogic(["Lead Vocals", "Drums", "Bass", "Guitars", "Keys", "Pads"])
+    daw.add_marker("verse", 5)
+    daw.add_marker("chorus", 21)
+    daw.tracks[0].plugins = ["Channel EQ", "Compressor"]
+    executor = SimulatedExecutor(daw, spawn_latency=0.150, command_latency=0.020, realtime=False)
+    directory = Path(tempfile.mkdtemp())
+    router = CommandRouter(executor=executor, snapshots=SnapshotStore(directory), dedupe_window=0)
+
+    for text in ["color track 1 red", "vocals up 3 db", "mute keys", "save snapshot verse mix"]:
+        result = router.execute(router.route(text))
+        print(f"{text:<28} → {result.output or result.error}")
+
+    # Change the mix by hand and by voice
+    daw.tracks[1].volume_db = -4.0
+    daw.tracks[0].plugins.append("DeEsser 2")
+    daw.tracks[3].name = "Gtr DI"
+    daw.tempo = 96.0
+    router.refresh_state()
+    for text in ["solo bass", "color track 1 blue", "save snapshot chorus mix",
+                 "list snapshots", "compare verse mix with chorus mix"]:
+        result = router.execute(router.route(text))
+        print(f"{text:<28} → {(result.output or result.error).replace(chr(10), chr(10) + ' ' * 31)}")
+
+    before = (executor.invocations, executor.virtual_time)
+    result = router.execute(router.route("recall snapshot verse mix"))
+    calls, cost = executor.invocations - before[0], (executor.virtual_time - before[1]) * 1000
+    print(f"{'recall snapshot verse mix':<28} → {result.output or result.error}")
+    print(f"   {calls} osascript call(s), {cost:.0f} ms")
+    assert result.success, result.error
+
+    # The project matches the saved snapshot again
+    saved = router.snapshots.load("verse mix")
+    for track, wanted in zip(daw.tracks, saved.tracks):
+        assert (track.name, track.volume_db, track.mute, track.solo, track.color, track.plugins) == \
+               (wanted.name, wanted.volume_db, wanted.mute, wanted.solo, wanted.color, wanted.plugins)
+    assert daw.tempo == saved.tempo
+    result = router.execute(router.route("recall snapshot verse mix"))
+    print(f"{'recall snapshot verse mix':<28} → {result.output}")
+    print("✅ Recall restored the snapshot with a minimal batched plan")
+
+    # Many snapshots: listing and "what changed" come from the index
+    print()
+    random.seed(5)
+    store = SnapshotStore(directory)
+    base = store.load("verse mix")
+    for i in range(500):
+        for track in base.tracks:
+            if random.random() < 0.2:
+                track.volume_db = float(random.randint(-12, 3))
+        base.name, base.saved_at = f"take {i}", base.saved_at + 1
+        store.save(base)
+
+    reopened = SnapshotStore(directory)
+    start = time.perf_counter()
+    entries = reopened.list()
+    list_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    changes = [reopened.changed_tracks(f"take {i}", f"take {i + 1}") for i in range(499)]
+    index_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    detailed = [reopened.compare(f"take {i}", f"take {i + 1}") for i in range(499)]
+    file_ms = (time.perf_counter() - start) * 1000
+
+    assert len(entries) == 502
+    assert all(bool(c['changed']) == bool(d) for c, d in zip(changes, detailed))
+    size = sum(path.stat().st_size for path in directory.glob('*.json')
+               if path.name != INDEX_FILE) / len(entries)
+    print(f"{len(entries)} snapshots, {size:.0f} bytes each on average")
+    print(f"list:                 {list_ms:6.2f} ms")
+    print(f"499 index compares:   {index_ms:6.2f} ms")
+    print(f"499 file compares:    {file_ms:6.2f} ms")
+    print("✅ Index answers listing and change detection without opening snapshot files")
@@ -0,0 +1,762 @@
+"""
+MiDAS AI - Simulated Logic Pro
+In-process model of a Logic Pro project for testing the execution path off a Mac
+
+Understands the same argv commands as the automation scripts, so parsers can
+run end-to-end against it through SimulatedExecutor.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from batch import ARG_SEPARATOR, COMMAND_SEPARATOR
+from track_index import GROUP_SEPARATOR, parse_track_reference
+
+# dbToFader() clamps the fader to 0-1, i.e. -18 dB to +6 dB
+MIN_DB = -18.0
+MAX_DB = 6.0
+
+# Seconds the simulated UI takes to reflect each compiled template step
+UI_RESPONSE = {'create_track': 0.15, 'rename_current': 0.05, 'color_current': 0.2, 'group_last': 0.25}
+
+# Commands whose result values carry the track state (trackValues() in mixing.scpt)
+TRACK_VALUE_COMMANDS = {'set', 'adjust', 'mute', 'unmute', 'toggle-mute', 'solo', 'unsolo', 'status'}
+
+# Commands whose result values carry the transport state (withTransport() in navigation.scpt)
+TRANSPORT_VALUE_COMMANDS = {
+    'play', 'stop', 'pause', 'toggle-play', 'rewind-start', 'fast-forward', 'rewind', 'locate',
+    'jump-marker', 'jump-marker-num', 'next-marker', 'prev-marker', 'set-loop', 'toggle-loop',
+    'loop-selection', 'loop-between-markers', 'loop-from-here', 'set-tempo', 'adjust-tempo',
+    'get-tempo', 'get-position', 'is-playing',
+}
+
+
+def clamp_db(db):
+    return min(MAX_DB, max(MIN_DB, db))
+
+
+@dataclass
+class SimTrack:
+    """One track in the simulated project"""
+    name: str
+    kind: str = 'audio'  # audio / midi / aux / folder
+    volume_db: float = 0.0
+    mute: bool = False
+    solo: bool = False
+    color: Optional[str] = None
+    plugins: List[str] = field(default_factory=list)
+    hidden: bool = False
+    locked: bool = False
+    record_enabled: bool = False
+    automation: List[Tuple[float, float]] = field(default_factory=list)  # volume (bar, dB)
+
+
+@dataclass
+class SimMarker:
+    """One marker (position in bars)"""
+    name: str
+    position: float
+
+
+class SimulatedLogic:
+    """Simulated DAW state plus a dispatcher for each automation script"""
+
+    # selectTrackByNumber() steps up 50 times before stepping down
+    SELECT_RESET_STEPS = 50
+
+    def __init__(self, track_names=None):
+        self.tracks: List[SimTrack] = [SimTrack(name) for name in (track_names or [])]
+        self.markers: List[SimMarker] = []
+        self.tempo = 120.0
+        self.playhead = 1.0
+        self.playing = False
+        self.play_start = 1.0
+        self.recording = False
+        self.cycle = False
+        self.cycle_start = 1.0
+        self.cycle_end = 5.0
+        self.selected = 1 if self.tracks else 0  # 1-based, 0 = nothing selected
+
+        # Punchobot script properties
+        self.take_counter = 0
+        self.takes = []          # takes moved to the vocal track, in order
+        self.take_stages = {}    # take number -> pipeline stages done (stopTake onwards)
+
+        # Instrumentation
+        self.ui_steps = 0      # simulated keystrokes / UI moves
+        self.name_comparisons = 0  # track names checked by findTrack()-style scans
+        self.channel_writes = 0    # fader/mute/solo properties set on a channel
+        self.marker_reads = 0      # markers examined by marker lookups
+        self.busy = 0.0            # seconds the last command spent in delays / waiting on the UI
+        self.ui_response = dict(UI_RESPONSE)
+        self.log = []          # (script name, args) in execution order
+        self.lock = threading.RLock()  # executors on several threads share one DAW
+
+        # Result envelope values of the last command (script_result.py)
+        self.last_values = {}
+        self._touched_track = None
+
+    # ============================================================
+    # HELPERS
+    # ============================================================
+
+    def find_track(self, name):
+        """
+        First track whose name contains name (case-insensitive, like AppleScript).
+        '#<index>:<name>' references are checked directly, like findTrack().
+        """
+        reference = parse_track_reference(name)
+        if reference:
+            index, name = reference
+            track = self.track_at(index)
+            self.name_comparisons += 1
+            if track is not None and track.name == name:
+                return track
+
+        name = name.lower()
+        for track in self.tracks:
+            self.name_comparisons += 1
+            if name in track.name.lower():
+                return track
+        return None
+
+    def advance(self, seconds, beats_per_bar=4):
+        """Let playback run for seconds (the playhead only moves while playing)"""
+        if not self.playing:
+            return
+        start = self.playhead
+        self.playhead += seconds * self.tempo / 60.0 / beats_per_bar
+        length = self.cycle_end - self.cycle_start
+        if self.cycle and length > 0 and start < self.cycle_end <= self.playhead:
+            self.playhead = self.cycle_start + (self.playhead - self.cycle_end) % length
+
+    def label(self, name):
+        """Name shown in messages (the track name for references, like trackLabel())"""
+        reference = parse_track_reference(name)
+        return reference[1] if reference else name
+
+    def track_at(self, number):
+        """Track by 1-based number"""
+        number = int(number)
+        if 1 <= number <= len(self.tracks):
+            return self.tracks[number - 1]
+        return None
+
+    def select(self, number):
+        """Mirror selectTrackByNumber() including its UI step cost"""
+        number = int(number)
+        self.ui_steps += self.SELECT_RESET_STEPS + max(number - 1, 0)
+        self.selected = number
+
+    def add_track(self, name, kind='audio'):
+        """Create a track after the last one and select it"""
+        self.tracks.append(SimTrack(name, kind))
+        self.selected = len(self.tracks)
+        self.ui_steps += 1
+        return self.tracks[-1]
+
+    def ui_wait(self, step, settle, polled):
+        """
+        Spend a template step's wait: polled steps end when the UI responds,
+        others sleep the full settle time. Returns the response time, or None
+        if the UI was slower than settle (the step fails; polled steps report
+        timed_out).
+        """
+        response = self.ui_response[step]
+        if response > settle:
+            self.busy += settle
+            self.last_values = {'timed_out': True} if polled else {}
+            return None
+        self.busy += response if polled else settle
+        self.last_values = {'response_ms': round(response * 1000, 1)} if polled else {}
+        return response
+
+    def add_marker(self, name, position):
+        self.markers.append(SimMarker(name, float(position)))
+        self.markers.sort(key=lambda m: m.position)
+
+    def find_marker(self, name):
+        name = name.lower()
+        for marker in self.markers:
+            self.marker_reads += 1
+            if name in marker.name.lower():
+                return marker
+        return None
+
+    # ============================================================
+    # DISPATCH
+    # ============================================================
+
+    def handle(self, script_name, args):
+        """
+        Run one argv-style command for a script
+        Returns: (success, message)
+        """
+        self.log.append((script_name, list(args)))
+        self.last_values = {}
+        self._touched_track = None
+        self.busy = 0.0
+        if not args:
+            return (False, "No command specified")
+
+        handlers = {
+            'mixing.scpt': self._mixing,
+            'navigation.scpt': self._navigation,
+            'track_management.scpt': self._track_management,
+            'session_manager.scpt': self._session_manager,
+            'plugin_control.scpt': self._plugin_control,
+            'project_analyzer.scpt': self._project_analyzer,
+            'punchobot.scpt': self._punchobot,
+        }
+        handler = handlers.get(script_name)
+        if handler is None:
+            return (False, f"Unknown script: {script_name}")
+
+        try:
+            ok, message = handler(args[0], list(args[1:]))
+        except (IndexError, ValueError) as e:
+            return (False, f"Bad arguments for {args[0]}: {e}")
+
+        if ok and script_name == 'mixing.scpt' and args[0] in TRACK_VALUE_COMMANDS:
+            self.last_values = self.track_values(self._touched_track)
+        elif ok and script_name == 'navigation.scpt' and args[0] in TRANSPORT_VALUE_COMMANDS:
+            self.last_values = self.transport_values()
+        return (ok, message)
+
+    def track_values(self, track):
+        return {'track': track.name, 'volume_db': round(track.volume_db, 2),
+                'mute': track.mute, 'solo': track.solo}
+
+    def transport_values(self):
+        return {'position': self.playhead, 'playing': self.playing, 'tempo': self.tempo,
+                'cycle': self.cycle, 'cycle_start': self.cycle_start, 'cycle_end': self.cycle_end}
+
+    def _mixing(self, cmd, args):
+        if cmd == 'unsolo-all':
+            for track in self.tracks:
+                track.solo = False
+            self.channel_writes += len(self.tracks)
+            return (True, "Cleared all solos")
+
+        if cmd == 'reset-all':
+            for track in self.tracks:
+                track.volume_db = 0.0
+            self.channel_writes += len(self.tracks)
+            return (True, "Reset all volumes to 0 dB")
+
+        if cmd == 'list':
+            lines = [f"{t.name}: {round(t.volume_db)} dB" for t in self.tracks]
+            return (True, "\n".join(lines))
+
+        if cmd == 'snapshot':
+            records = [ARG_SEPARATOR.join(['track', t.name, f"{t.volume_db:g}",
+                                             str(t.mute).lower(), str(t.solo).lower()])
+                       for t in self.tracks]
+            return (True, COMMAND_SEPARATOR.join(records))
+
+        if cmd == 'group-adjust':
+            pattern, change = args[0].lower(), float(args[1])
+            if parse_track_reference(args[0]):
+                matched = [t for t in (self.find_track(ref) for ref in args[0].split(GROUP_SEPARATOR))
+                           if t is not None]
+                if not matched:
+                    return (False, "No tracks found for resolved group")
+            else:
+                self.name_comparisons += len(self.tracks)
+                matched = [t for t in self.tracks if pattern in t.name.lower()]
+                if not matched:
+                    return (False, f"No tracks found matching: {args[0]}")
+            for track in matched:
+                track.volume_db = clamp_db(track.volume_db + change)
+            self.channel_writes += len(matched)
+            direction = "up" if change >= 0 else "down"
+            return (True, f"{len(matched)} tracks {direction} {abs(change)} dB")
+
+        track = self.find_track(args[0]) if args else None
+        if track is None:
+            return (False, f"Track not found: {self.label(args[0]) if args else ''}")
+        args[0] = self.label(args[0])
+        self._touched_track = track
+        if cmd != 'status':
+            self.channel_writes += 1
+
+        if cmd == 'adjust':
+            change = float(args[1])
+            track.volume_db = clamp_db(track.volume_db + change)
+            direction = "up" if change >= 0 else "down"
+            return (True, f"{args[0]} {direction} {abs(change)} dB")
+        elif cmd == 'set':
+            track.volume_db = clamp_db(float(args[1]))
+            return (True, f"Set {args[0]} to {args[1]} dB")
+        elif cmd == 'write-automation':
+            points = [tuple(float(v) for v in point.split(',')) for point in args[1].split(';')]
+            if len(points) < 2:
+                return (False, "A ride needs at least two breakpoints")
+            first, last = points[0][0], points[-1][0]
+            track.automation = sorted([p for p in track.automation if not first <= p[0] <= last] + points)
+            self.channel_writes += len(points)
+            self.last_values = {'points': len(points)}
+            return (True, f"Wrote {len(points)} automation points on {args[0]}")
+        elif cmd == 'preset':
+            presets = {'loud': 3, 'normal': 0, 'quiet': -6, 'whisper': -12}
+            if args[1] not in presets:
+                return (False, f"Unknown preset: {args[1]}")
+            track.volume_db = float(presets[args[1]])
+            return (True, f"Set {args[0]} to {presets[args[1]]} dB")
+        elif cmd == 'mute':
+            track.mute = True
+            return (True, f"Muted {args[0]}")
+        elif cmd == 'unmute':
+            track.mute = False
+            return (True, f"Unmuted {args[0]}")
+        elif cmd == 'toggle-mute':
+            track.mute = not track.mute
+            return (True, f"{args[0]} {'muted' if track.mute else 'unmuted'}")
+        elif cmd == 'solo':
+            track.solo = True
+            return (True, f"Soloed {args[0]}")
+        elif cmd == 'unsolo':
+            track.solo = False
+            return (True, f"Unsoloed {args[0]}")
+        elif cmd == 'status':
+            status = f"{args[0]}: {round(track.volume_db)} dB"
+            if track.mute:
+                status += " (muted)"
+            if track.solo:
+                status += " (solo)"
+            return (True, status)
+
+        return (False, f"Unknown command: {cmd}")
+
+    def _navigation(self, cmd, args):
+        if cmd == 'play':
+            if not self.playing:
+                self.play_start = self.playhead
+            self.playing = True
+            return (True, "Playing")
+        elif cmd == 'stop':
+            self.playing = False
+            return (True, "Stopped")
+        elif cmd == 'pause':
+            # Logic returns to the last play start position
+            if self.playing:
+                self.playhead = self.play_start
+            self.playing = False
+            return (True, "Paused")
+        elif cmd == 'toggle-play':
+            if not self.playing:
+                self.play_start = self.playhead
+            self.playing = not self.playing
+            return (True, "Playing" if self.playing else "Stopped")
+        elif cmd == 'rewind-start':
+            self.playing = False
+            self.playhead = 1.0
+            return (True, "Rewound to start")
+        elif cmd == 'fast-forward':
+            self.playhead += float(args[0])
+            return (True, f"Jumped forward {args[0]} bars")
+        elif cmd == 'rewind':
+            self.playhead = max(1.0, self.playhead - float(args[0]))
+            return (True, f"Jumped back {args[0]} bars")
+        elif cmd == 'jump-marker':
+            marker = self.find_marker(args[0])
+            if marker is None:
+                return (False, f"Marker not found: {args[0]}")
+            self.playhead = marker.position
+            return (True, f"Jumped to {args[0]}")
+        elif cmd == 'locate':
+            self.playhead = float(args[0])
+            return (True, f"Jumped to {args[1] if len(args) > 1 else 'bar ' + args[0]}")
+        elif cmd == 'jump-marker-num':
+            self.marker_reads += len(self.markers)
+            number = int(float(args[0]))
+            if number > len(self.markers):
+                return (False, f"Only {len(self.markers)} markers exist")
+            self.playhead = self.markers[number - 1].position
+            return (True, f"Jumped to marker {number}")
+        elif cmd == 'list-markers':
+            lines = ["Markers:"] + [f"{i}. {m.name} (bar {m.position:g})"
+                                    for i, m in enumerate(self.markers, 1)]
+            return (True, "\n".join(lines))
+        elif cmd == 'next-marker':
+            for marker in self.markers:
+                self.marker_reads += 1
+                if marker.position > self.playhead:
+                    self.playhead = marker.position
+                    return (True, f"Jumped to {marker.name}")
+            return (False, "No marker ahead")
+        elif cmd == 'prev-marker':
+            self.marker_reads += len(self.markers)
+            before = [m for m in self.markers if m.position < self.playhead]
+            if not before:
+                return (False, "No marker before")
+            self.playhead = before[-1].position
+            return (True, f"Jumped to {before[-1].name}")
+        elif cmd == 'create-marker':
+            self.add_marker(args[0], self.playhead)
+            return (True, f"Created marker: {args[0]}")
+        elif cmd == 'set-loop':
+            self.cycle, self.cycle_start, self.cycle_end = True, float(args[0]), float(args[1])
+            return (True, f"Loop set: bars {args[0]}-{args[1]}")
+        elif cmd == 'toggle-loop':
+            self.cycle = not self.cycle
+            return (True, f"Loop {'enabled' if self.cycle else 'disabled'}")
+        elif cmd == 'loop-selection':
+            self.cycle = True
+            return (True, "Looping selection")
+        elif cmd == 'loop-between-markers':
+            start, end = self.find_marker(args[0]), self.find_marker(args[1])
+            if start is None or end is None:
+                return (False, "Markers not found")
+            self.cycle, self.cycle_start, self.cycle_end = True, start.position, end.position
+            return (True, f"Looping {args[0]} to {args[1]}")
+        elif cmd == 'loop-from-here':
+            bars = float(args[0])
+            self.cycle, self.cycle_start, self.cycle_end = True, self.playhead, self.playhead + bars
+            return (True, f"Looping {args[0]} bars from here")
+        elif cmd == 'set-tempo':
+            self.tempo = float(args[0])
+            return (True, f"Tempo set to {args[0]} BPM")
+        elif cmd == 'get-tempo':
+            return (True, f"Tempo: {self.tempo:g} BPM")
+        elif cmd == 'adjust-tempo':
+            self.tempo = min(300.0, max(30.0, self.tempo + float(args[0])))
+            direction = "up" if float(args[0]) >= 0 else "down"
+            return (True, f"Tempo {direction} to {self.tempo:g} BPM")
+        elif cmd == 'get-position':
+            return (True, f"Bar {self.playhead:g}")
+        elif cmd == 'is-playing':
+            return (True, "Playing" if self.playing else "Stopped")
+        elif cmd == 'snapshot':
+            records = [f"tempo{ARG_SEPARATOR}{self.tempo:g}",
+                       f"position{ARG_SEPARATOR}{self.playhead:g}",
+                       f"playing{ARG_SEPARATOR}{str(self.playing).lower()}",
+                       ARG_SEPARATOR.join(['cycle', str(self.cycle).lower(),
+                                           f"{self.cycle_start:g}", f"{self.cycle_end:g}"])]
+            records += [ARG_SEPARATOR.join(['marker', m.name, f"{m.position:g}"])
+                        for m in self.markers]
+            return (True, COMMAND_SEPARATOR.join(records))
+
+        return (False, f"Unknown command: {cmd}")
+
+    def _track_management(self, cmd, args):
+        if cmd == 'create_audio':
+            self.add_track(f"Audio {len(self.tracks) + 1}", 'audio')
+            return (True, "Created audio track")
+        elif cmd == 'create_midi':
+            self.add_track(f"Inst {len(self.tracks) + 1}", 'midi')
+            return (True, "Created MIDI instrument track")
+        elif cmd == 'create_aux':
+            self.add_track(f"Aux {len(self.tracks) + 1}", 'aux')
+            return (True, "Created aux track")
+        elif cmd == 'show_all':
+            for track in self.tracks:
+                track.hidden = False
+            self.ui_steps += 1
+            return (True, "Showed all tracks")
+        elif cmd == 'get_selected':
+            return (True, str(self.selected))
+
+        number = int(args[0])
+        track = self.track_at(number)
+        if track is None:
+            return (False, f"Error: No track {number}")
+        self.select(number)
+
+        if cmd == 'duplicate':
+            copy = SimTrack(**{**track.__dict__, 'plugins': list(track.plugins),
+                               'automation': list(track.automation)})
+            self.tracks.insert(number, copy)
+            self.selected = number + 1
+            return (True, f"Duplicated track {number}")
+        elif cmd == 'delete':
+            self.tracks.pop(number - 1)
+            self.selected = min(number, len(self.tracks))
+            return (True, f"Deleted track {number}")
+        elif cmd == 'rename':
+            track.name = args[1]
+            return (True, f"Renamed track {number} to {args[1]}")
+        elif cmd == 'group':
+            end = int(args[1])
+            self.ui_steps += max(end - number, 0) + 1
+            name = args[2] if len(args) > 2 else f"Folder {number}"
+            self.tracks.insert(number - 1, SimTrack(name, 'folder'))
+            self.selected = number
+            return (True, f"Grouped tracks {number} to {end}")
+        elif cmd == 'ungroup':
+            if track.kind == 'folder':
+                self.tracks.pop(number - 1)
+            return (True, f"Ungrouped folder at track {number}")
+        elif cmd == 'color':
+            track.color = args[1]
+            self.ui_steps += 2
+            return (True, f"Colored track {number} {args[1]}")
+        elif cmd in ('hide', 'show'):
+            track.hidden = not track.hidden
+            return (True, f"Hid track {number}")
+        elif cmd == 'hide_except':
+            for other in self.tracks:
+                other.hidden = other is not track
+            return (True, f"Hid all tracks except {number}")
+        elif cmd in ('lock', 'unlock'):
+            track.locked = not track.locked
+            return (True, f"Locked track {number}")
+        elif cmd in ('move_up', 'move_down', 'move_to'):
+            position = None
+            if cmd == 'move_to':
+                # moveTrackTo(): the shortest way to an absolute position
+                position = max(int(args[1]), 1)
+                if position == number:
+                    return (True, f"Track {number} is already at position {position}")
+                positions = abs(position - number)
+                step = -1 if position < number else 1
+            else:
+                positions = int(args[1]) if len(args) > 1 else 1
+                step = -1 if cmd == 'move_up' else 1
+            index = number - 1
+            for _ in range(positions):
+                self.ui_steps += 1
+                target = index + step
+                if 0 <= target < len(self.tracks):
+                    self.tracks[index], self.tracks[target] = self.tracks[target], self.tracks[index]
+                    index = target
+            self.selected = index + 1
+            if position is not None:
+                return (True, f"Moved track {number} to position {position}")
+            direction = "up" if step < 0 else "down"
+            return (True, f"Moved track {number} {direction} {positions} positions")
+
+        return (False, f"Error: Unknown command '{cmd}'")
+
+    def _session_manager(self, cmd, args):
+        templates = {
+            'vocal_session': [("Lead Vocal", 'audio', 'red'), ("Harmony", 'audio', 'pink'),
+                              ("Ad Libs", 'audio', 'orange'), ("Backing Vocals", 'audio', 'yellow'),
+                              ("Instrumental", 'audio', 'blue')],
+            'beat_session': [("Kick", 'audio', 'red'), ("Snare", 'audio', 'orange'),
+                             ("Hi-Hats", 'audio', 'yellow'), ("Percussion", 'audio', 'green'),
+                             ("Bass", 'audio', 'blue'), ("Melody", 'midi', 'purple'),
+                             ("Chords", 'midi', 'cyan'), ("Pads", 'midi', 'magenta')],
+            'full_song_session': [("Kick", 'audio', 'red'), ("Snare", 'audio', 'red'),
+                                  ("Hi-Hats", 'audio', 'red'), ("Drums Bus", 'aux', 'red'),
+                                  ("Bass", 'audio', 'blue'), ("Guitar", 'audio', 'green'),
+                                  ("Keys", 'midi', 'green'), ("Synth", 'midi', 'green'),
+                                  ("Lead Vocal", 'audio', 'purple'), ("Harmony", 'audio', 'purple'),
+                                  ("Backing", 'audio', 'purple'), ("Reverb", 'aux', 'gray'),
+                                  ("Delay", 'aux', 'gray')],
+        }
+
+        if cmd in templates:
+            for name, kind, color in templates[cmd]:
+                track = self.add_track(name, kind)
+                track.color = color
+                self.ui_steps += 2
+                # Fixed delays: create (inside + after), rename, (pause), color, pause
+                self.busy += (0.3 if kind == 'aux' else 0.5) + 0.5 + 0.6 + 0.5 + 0.3
+                if cmd != 'full_song_session':
+                    self.busy += 0.3
+            return (True, f"Created {len(templates[cmd])}-track session")
+        elif cmd == 'create_track':
+            kind, settle = args[0], float(args[1])
+            if self.ui_wait('create_track', settle, polled=True) is None:
+                return (False, f"No {kind} track after {settle:g} s")
+            prefix = {'midi': 'Inst', 'aux': 'Aux'}.get(kind, 'Audio')
+            self.add_track(f"{prefix} {len(self.tracks) + 1}", kind)
+            return (True, f"Created {kind} track")
+        elif cmd == 'rename_current':
+            track = self.track_at(self.selected) if self.selected else None
+            if track is None:
+                return (False, "No track selected")
+            self.busy += 0.1
+            self.ui_steps += 4
+            if self.ui_wait('rename_current', float(args[1]), polled=True) is None:
+                return (False, f"Track not renamed to {args[0]} after {args[1]} s")
+            track.name = args[0]
+            return (True, f"Renamed to {args[0]}")
+        elif cmd == 'color_current':
+            track = self.track_at(self.selected) if self.selected else None
+            if track is None:
+                return (False, "No track selected")
+            self.ui_steps += 2
+            if self.ui_wait('color_current', float(args[1]), polled=False) is None:
+                return (False, f"Color picker not open after {args[1]} s")
+            track.color = args[0]
+            return (True, f"Colored {args[0]}")
+        elif cmd == 'group_last':
+            count, settle = int(args[0]), float(args[1])
+            first = self.selected - count + 1
+            if count < 1 or first < 1:
+                return (False, f"Can't group {count} tracks")
+            self.busy += 0.05 * (count - 1)
+            self.ui_steps += count
+            if self.ui_wait('group_last', settle, polled=True) is None:
+                return (False, f"No folder after {settle:g} s")
+            self.tracks.insert(first - 1, SimTrack(f"Folder {first}", 'folder'))
+            self.selected = first
+            return (True, f"Grouped last {count} tracks")
+        elif cmd == 'reset_mixer':
+            for track in self.tracks:
+                track.solo = False
+                track.mute = False
+            self.channel_writes += 2 * len(self.tracks)
+            self.ui_steps += 2
+            return (True, "Reset mixer: cleared all solo/mute states")
+        elif cmd == 'set_tempo':
+            self.tempo = float(args[0])
+            return (True, f"Set project tempo to {args[0]} BPM")
+        elif cmd in ('organize', 'standard_markers'):
+            return (True, "Track Organization Guidelines" if cmd == 'organize'
+                    else "Standard Structure")
+
+        return (False, f"Error: Unknown command '{cmd}'")
+
+    def _plugin_control(self, cmd, args):
+        chains = {
+            'vocal_chain': ['Channel EQ', 'Compressor', 'DeEsser 2', 'ChromaVerb'],
+            'drum_bus': ['Channel EQ', 'Compressor', 'Phat FX'],
+        }
+
+        if cmd in ('load_plugin', 'load_logic') or cmd in chains or cmd in (
+                'bypass', 'bypass_all', 'remove', 'remove_all', 'open_plugin', 'show_all'):
+            track = self.track_at(args[0])
+            if track is None:
+                return (False, f"Error: No track {args[0]}")
+            self.select(args[0])
+
+            if cmd == 'load_plugin':
+                track.plugins.append(args[1])
+                return (True, f"Loaded {args[1]} on track {args[0]}")
+            elif cmd == 'load_logic':
+                track.plugins.append(args[1])
+                return (True, f"Loaded {args[1]} on track {args[0]}")
+            elif cmd in chains:
+                track.plugins.extend(chains[cmd])
+                self.ui_steps += 3 * len(chains[cmd])
+                return (True, f"Loaded {cmd.replace('_', ' ')} on track {args[0]}")
+            elif cmd == 'remove':
+                slot = int(args[1])
+                if 1 <= slot <= len(track.plugins):
+                    track.plugins.pop(slot - 1)
+                return (True, f"Removed plugin {slot} from track {args[0]}")
+            elif cmd == 'remove_all':
+                track.plugins.clear()
+                return (True, f"Removed all plugins from track {args[0]}")
+            elif cmd == 'show_all':
+                return (True, ", ".join(track.plugins) or "No plugins")
+            return (True, f"{cmd} on track {args[0]}")
+
+        if cmd in ('close_plugin', 'adjust', 'save_preset', 'load_preset', 'next', 'previous'):
+            self.ui_steps += 1
+            return (True, f"{cmd} done")
+
+        return (False, f"Error: Unknown command '{cmd}'")
+
+    def _project_analyzer(self, cmd, args):
+        known = {'project_info', 'track_list', 'analyze_track', 'check_mix', 'snapshot'}
+        if cmd not in known:
+            return (False, f"Error: Unknown command '{cmd}'")
+        if cmd == 'snapshot':
+            return (True, json.dumps({
+                'tempo': self.tempo,
+                'position': self.playhead,
+                'playing': self.playing,
+                'cycle': {'enabled': self.cycle, 'start': self.cycle_start, 'end': self.cycle_end},
+                'tracks': [{'name': t.name, 'type': t.kind, 'volume_db': t.volume_db,
+                            'mute': t.mute, 'solo': t.solo, 'color': t.color,
+                            'plugins': list(t.plugins)}
+                           for t in self.tracks],
+                'markers': [{'name': m.name, 'position': m.position} for m in self.markers],
+            }))
+        if cmd == 'project_info':
+            return (True, f"Project: Logic Pro Project\nTempo: {self.tempo:g} BPM\n"
+                          f"Tracks: {len(self.tracks)}")
+        return (True, f"{cmd.replace('_', ' ').title()}")
+
+    def _punchobot(self, cmd, args):
+        if cmd == 'startPunch':
+            self.recording = True
+            self.playing = True
+            self.take_counter += 1
+            self.last_values = {'take': self.take_counter}
+            return (True, f"Recording Take {self.take_counter}")
+        elif cmd in ('nextTake', 'keepIt'):
+            if not self.recording:
+                return (True, "Not currently recording" if cmd == 'nextTake'
+                        else "No active take to save")
+            self.recording = False
+            self.playing = False
+            self.takes.append(f"Take {self.take_counter}")
+            if cmd == 'keepIt':
+                return (True, f"Take {self.take_counter} saved!")
+            return (True, f"Take {self.take_counter} processed. Ready for next.")
+        elif cmd == 'stopTake':
+            if not self.recording:
+                return (True, "Not currently recording")
+            self.recording = False
+            self.playing = False
+            self.take_stages[self.take_counter] = []
+            self.last_values = {'take': self.take_counter}
+            return (True, f"Take {self.take_counter} recorded. Ready for next.")
+        elif cmd in ('trimTake', 'fadeTake', 'moveTake'):
+            take = int(args[0])
+            if take not in self.take_stages or 'moveTake' in self.take_stages[take]:
+                return (False, f"Error: Take {take} not found")
+            self.take_stages[take].append(cmd)
+            if cmd == 'moveTake':
+                self.takes.append(f"Take {take}")
+            done = {'trimTake': "trimmed", 'fadeTake': "faded", 'moveTake': "moved to Vocals"}
+            return (True, f"Take {take} {done[cmd]}")
+        elif cmd == 'trashIt':
+            if not self.recording:
+                return (True, "Nothing to trash")
+            self.recording = False
+            self.playing = False
+            self.take_counter -= 1
+            return (True, "Take deleted. Ready to punch again.")
+        elif cmd == 'enterCompMode':
+            return (True, "Comp mode active. Select your favorite parts!")
+        elif cmd == 'resetTakeCounter':
+            self.take_counter = 0
+            return (True, "Take counter reset")
+        elif cmd == 'getTakeCount':
+            return (True, f"Current take: {self.take_counter}")
+
+        return (False, f"Unknown handler: {cmd}")
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    daw = SimulatedLogic(["Lead Vocals", "Drums", "Bass", "Guitars"])
+
+    print("🎹 MiDAS AI - Simulated Logic Pro")
+    print("=" * 60)
+    print()
+
+    steps = [
+        ('mixing.scpt', ['adjust', 'vocals', '3']),
+        ('mixing.scpt', ['solo', 'drums']),
+        ('mixing.scpt', ['status', 'vocals']),
+        ('navigation.scpt', ['set-tempo', '95']),
+        ('navigation.scpt', ['fast-forward', '8']),
+        ('navigation.scpt', ['create-marker', 'chorus']),
+        ('track_management.scpt', ['create_audio']),
+        ('track_management.scpt', ['rename', '5', 'Ad Libs']),
+        ('mixing.scpt', ['status', 'nothing']),
+    ]
+
+    for script, args in steps:
+        ok, message = daw.handle(script, args)
+        print(f"{'✅' if ok else '❌'} {script} {args} → {message}"
+              + (f"  {daw.last_values}" if daw.last_values else ""))
+
+    print()
+    print(f"Tracks: {[t.name for t in daw.tracks]}")
+    print(f"Tempo: {daw.tempo:g}  Playhead: bar {daw.playhead:g}  Markers: {daw.markers}")
+    print(f"UI steps: {daw.ui_steps}")
@@ -0,0 +1,206 @@
+"""
+MiDAS AI - Take Processing Pipeline
+Punchobot takes are processed in the background while the next one records
+
+punchobot.scpt's nextTake() used to stop, trim, fade and move the take
+before re-arming, so the singer waited for all of it. Commander now calls
+stopTake() - stop, name the take "Take <n>", re-arm - and hands the take
+number to this pipeline. A worker thread runs the stages in order:
+
+    trimTake(n) → fadeTake(n) → moveTake(n)
+
+Takes queue up in recording order; a stage that fails skips the rest of
+that take. Each stage's time is recorded, and depth (queued plus in
+progress) is shown with every "next take". The pipeline has its own
+executor so its osascript processes don't interfere with cancel() on
+the foreground one.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from latency_stats import LatencyHistogram
+
+TAKE_STAGES = ('trimTake', 'fadeTake', 'moveTake')
+
+
+class TakePipeline:
+    """FIFO of recorded takes + one worker running the processing stages"""
+
+    def __init__(self, executor, script_path, stages=TAKE_STAGES, timeout=30, on_complete=None):
+        """
+        Args:
+            executor: Executor for the stage handlers (not shared with foreground commands)
+            script_path: punchobot.scpt
+            stages: handler names run per take, in order
+            timeout: seconds per stage
+            on_complete: optional callable(take, ok, message) after each take
+        """
+        self.executor = executor
+        self.script_path = Path(script_path)
+        self.stages = stages
+        self.timeout = timeout
+        self.on_complete = on_complete
+
+        self._queue = deque()
+        self._lock = threading.Condition()
+        self.current = None  # take being processed
+        self.processed = 0
+        self.failed = []     # (take, error)
+        self.max_depth = 0
+        self.stage_times = {stage: LatencyHistogram() for stage in stages}
+        self.take_times = LatencyHistogram()  # submit -> last stage done
+
+        self.is_running = False
+        self._worker = None
+
+    @property
+    def depth(self):
+        """Takes queued or in progress"""
+        with self._lock:
+            return len(self._queue) + (self.current is not None)
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self._worker = threading.Thread(target=self._run_loop, daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout=2):
+        with self._lock:
+            self.is_running = False
+            self._lock.notify_all()
+        if self._worker:
+            self._worker.join(timeout)
+
+    def submit(self, take):
+        """Queue a recorded take; returns the depth including it"""
+        with self._lock:
+            self._queue.append((take, time.perf_counter()))
+            depth = len(self._queue) + (self.current is not None)
+            self.max_depth = max(self.max_depth, depth)
+            self._lock.notify_all()
+        self.start()
+        return depth
+
+    def drain(self, timeout=None):
+        """Block until every queued take is processed; True if the queue emptied"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while self._queue or self.current is not None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._lock.wait(remaining)
+        return True
+
+    def _run_loop(self):
+        while True:
+            with self._lock:
+                while self.is_running and not self._queue:
+                    self._lock.wait()
+                if not self.is_running:
+                    return
+                take, submitted = self._queue.popleft()
+                self.current = take
+
+            ok, message = self._process(take)
+            self.take_times.record(time.perf_counter() - submitted)
+            if self.on_complete:
+                self.on_complete(take, ok, message)
+
+            with self._lock:
+                self.current = None
+                if ok:
+                    self.processed += 1
+                else:
+                    self.failed.append((take, message))
+                self._lock.notify_all()
+
+    def _process(self, take):
+        """Run every stage for one take; stops at the first failure"""
+        message = ''
+        for stage in self.stages:
+            result = self.executor.call_handler(self.script_path, stage, timeout=self.timeout,
+                                                args=[take])
+            self.stage_times[stage].record(result.elapsed)
+            if not result.success:
+                return (False, f"{stage}: {result.error}")
+            message = result.output
+        return (True, message)
+
+    def stats(self):
+        return {
+            'depth': self.depth,
+            'max_depth': self.max_depth,
+            'processed': self.processed,
+            'failed': len(self.failed),
+            'stages': {stage: hist.summary() for stage, hist in self.stage_times.items()},
+            'take': self.take_times.summary(),
+        }
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    from commander import Commander
+    from executor import SimulatedExecutor
+    from simulated_logic import SimulatedLogic
+
+    print("🎙️  MiDAS AI - Take Processing Pipeline")
+    print("=" * 60)
+    print()
+
+    # Stage costs (seconds); nextTake does all of them before re-arming
+    stage_latency = {'stopTake': 0.04, 'trimTake': 0.25, 'fadeTake': 0.08, 'moveTake': 0.15}
+    stage_latency['nextTake'] = sum(stage_latency.values())
+    SINGING = 0.3  # seconds per take - shorter than processing, so takes queue up
+
+    def session(pipelined):
+        """Seconds from each "next take" until the singer can punch again"""
+        daw = SimulatedLogic(["Record", "Vocals"])
+        executor = SimulatedExecutor(daw, spawn_latency=0.02, action_latency=stage_latency)
+        commander = Commander(executor)
+        pipeline = None
+        if pipelined:
+            pipeline = TakePipeline(SimulatedExecutor(daw, spawn_latency=0.02,
+                                                      action_latency=stage_latency),
+                                    commander.script_path)
+            commander.set_take_pipeline(pipeline)
+
+        waits = []
+        for _ in range(5):
+            commander.run('startPunch')
+            time.sleep(SINGING)
+            start = time.perf_counter()
+            result = commander.run('nextTake')
+            waits.append(time.perf_counter() - start)
+            print(f"   {result.output}")
+        if pipeline:
+            assert pipeline.drain(timeout=5)
+            pipeline.stop()
+        assert daw.takes == [f"Take {n}" for n in range(1, 6)], daw.takes
+        return waits, pipeline
+
+    print("Sequential (nextTake):")
+    sequential, _ = session(False)
+    print("Pipelined (stopTake + background stages):")
+    pipelined, pipeline = session(True)
+
+    stats = pipeline.stats()
+    print()
+    for stage, summary in stats['stages'].items():
+        print(f"{stage:<10} {summary['count']} runs, p50 {summary['p50'] * 1000:4.0f} ms")
+    print(f"Take ready on Vocals: p50 {stats['take']['p50'] * 1000:.0f} ms after 'next take', "
+          f"max queue depth {stats['max_depth']}")
+    print(f"Wait before the next punch: {sum(sequential) / 5 * 1000:.0f} ms → "
+          f"{sum(pipelined) / 5 * 1000:.0f} ms per take")
+    assert sum(pipelined) < sum(sequential) / 3
+    print("✅ Takes processed in the background, all five on the vocal track in order")
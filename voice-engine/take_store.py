@@ -0,0 +1,192 @@
+"""
+MiDAS AI - Take Store
+Punchobot take history in SQLite, so take queries skip osascript
+
+punchobot.scpt only knows its takeCounter property: "how many takes"
+was a round trip and nothing remembered which takes were kept or
+trashed. Commander records every punchobot action here:
+
+    startPunch      → take row, status 'recording'
+    nextTake        → 'recorded'      keepIt → 'kept'      trashIt → 'trashed'
+    pipeline done   → processed = 1 (take_pipeline.py)
+    resetTakeCounter → a new session (take numbers start again)
+
+Rows are indexed by (session, take) and (session, status), so the take
+count, the history and comp mode's kept-take list are index lookups.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_DB_FILE = Path.home() / '.midas' / 'takes.db'
+
+# Statuses that still count towards punchobot's takeCounter
+COUNTED_STATUSES = ('recording', 'recorded', 'kept')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS takes (
+    id INTEGER PRIMARY KEY,
+    session TEXT NOT NULL,
+    take INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    started_at REAL NOT NULL,
+    stopped_at REAL
+);
+CREATE INDEX IF NOT EXISTS takes_by_take ON takes (session, take);
+CREATE INDEX IF NOT EXISTS takes_by_status ON takes (session, status);
+"""
+
+
+class TakeStore:
+    """Take rows for the current session (and every earlier one)"""
+
+    def __init__(self, db_file=DEFAULT_DB_FILE, session=None, clock=time.time):
+        """
+        Args:
+            db_file: SQLite file (None = in-memory only)
+            session: session name (default: the start time, e.g. '2026-02-18 14:05')
+            clock: time source for timestamps
+        """
+        if db_file:
+            Path(db_file).parent.mkdir(parents=True, exist_ok=True)
+        # The take pipeline's worker thread writes too - one connection, one lock
+        self._db = sqlite3.connect(str(db_file) if db_file else ':memory:', check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.clock = clock
+        self.session = session or time.strftime('%Y-%m-%d %H:%M', time.localtime(clock()))
+
+    def _execute(self, sql, params=()):
+        with self._lock, self._db:
+            return self._db.execute(sql, params).fetchall()
+
+    def new_session(self):
+        """Start a new session (after the take counter is reset)"""
+        base = self.session.split(' #')[0]
+        number = 2
+        while self._execute("SELECT 1 FROM takes WHERE session = ? LIMIT 1", (f"{base} #{number}",)):
+            number += 1
+        self.session = f"{base} #{number}"
+        return self.session
+
+    # ============================================================
+    # WRITES
+    # ============================================================
+
+    def start(self, take):
+        """A take started recording"""
+        self._execute("INSERT INTO takes (session, take, status, started_at) VALUES (?, ?, 'recording', ?)",
+                      (self.session, int(take), self.clock()))
+
+    def finish(self, status, processed=False):
+        """
+        The recording take stopped as status ('recorded' / 'kept' / 'trashed')
+        Returns: its take number, or None if no take was recording
+        """
+        rows = self._execute("SELECT id, take FROM takes WHERE session = ? AND status = 'recording' "
+                             "ORDER BY id DESC LIMIT 1", (self.session,))
+        if not rows:
+            return None
+        row_id, take = rows[0]
+        self._execute("UPDATE takes SET status = ?, processed = ?, stopped_at = ? WHERE id = ?",
+                      (status, int(processed), self.clock(), row_id))
+        return take
+
+    def mark_processed(self, take):
+        """Background processing finished for a take"""
+        self._execute("UPDATE takes SET processed = 1 WHERE session = ? AND take = ? AND status != 'trashed'",
+                      (self.session, int(take)))
+
+    # ============================================================
+    # QUERIES
+    # ============================================================
+
+    def has_takes(self):
+        return bool(self._execute("SELECT 1 FROM takes WHERE session = ? LIMIT 1", (self.session,)))
+
+    def count(self, status=None):
+        """Takes this session with status (default: the ones punchobot's counter includes)"""
+        statuses = (status,) if status else COUNTED_STATUSES
+        marks = ", ".join("?" * len(statuses))
+        return self._execute(f"SELECT COUNT(*) FROM takes WHERE session = ? AND status IN ({marks})",
+                             (self.session,) + statuses)[0][0]
+
+    def takes(self, status=None):
+        """
+        This session's takes in recording order
+        Returns: list of {'take', 'status', 'processed'}
+        """
+        sql = "SELECT take, status, processed FROM takes WHERE session = ?"
+        params = (self.session,)
+        if status:
+            sql += " AND status = ?"
+            params += (status,)
+        return [{'take': take, 'status': st, 'processed': bool(done)}
+                for take, st, done in self._execute(sql + " ORDER BY id", params)]
+
+    def sessions(self):
+        """(session, takes, kept) for every session, most recent first"""
+        return self._execute("SELECT session, COUNT(*), SUM(status = 'kept') FROM takes "
+                             "GROUP BY session ORDER BY MAX(id) DESC")
+
+    def close(self):
+        self._db.close()
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    from commander import Commander
+    from executor import SimulatedExecutor
+    from simulated_logic import SimulatedLogic
+
+    print("🗄️  MiDAS AI - Take Store")
+    print("=" * 60)
+    print()
+
+    db_file = Path(tempfile.mkdtemp()) / 'takes.db'
+    daw = SimulatedLogic(["Record", "Vocals"])
+    executor = SimulatedExecutor(daw, spawn_latency=0.150, command_latency=0.020, realtime=False)
+    commander = Commander(executor, take_store=TakeStore(db_file, session="verse punch-ins"))
+
+    for text in ["start punch", "next take", "start punch", "keep it", "start punch", "trash it",
+                 "start punch", "keep it", "how many takes", "take history", "kept takes", "comp mode"]:
+        before = executor.invocations
+        result = commander.run(commander.parse(text).action)
+        print(f"{text:<16} → {result.output.replace(chr(10), ' | '):<62} "
+              f"{executor.invocations - before} call(s)")
+    assert commander.take_store.count() == daw.take_counter == 3
+    assert [t['take'] for t in commander.take_store.takes('kept')] == [2, 3]
+
+    # Many sessions on disk: queries stay index lookups
+    random.seed(2)
+    store = TakeStore(db_file, session="session 150")
+    with store._db:
+        store._db.executemany(
+            "INSERT INTO takes (session, take, status, started_at) VALUES (?, ?, ?, 0)",
+            [(f"session {number}", take, random.choice(['recorded', 'kept', 'trashed']))
+             for number in range(300) for take in range(1, 41)])
+
+    start = time.perf_counter()
+    for _ in range(200):
+        store.count()
+        store.takes('kept')
+    per_query = (time.perf_counter() - start) / 400 * 1e6
+    plan = store._execute("EXPLAIN QUERY PLAN SELECT take FROM takes WHERE session = ? AND status = ?",
+                          ("session 150", 'kept'))
+    print()
+    print(f"{len(store.sessions())} sessions, 12000 takes: {per_query:.0f} µs per query "
+          f"(vs {executor.spawn_latency * 1000:.0f} ms osascript spawn)")
+    print(f"Plan: {plan[0][-1]}")
+    assert 'INDEX' in plan[0][-1]
+    print("✅ Take count and history answered from the store")
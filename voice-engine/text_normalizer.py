@@ -0,0 +1,272 @@
+"""
+MiDAS AI - Text Normalizer
+One pass over each utterance before routing, so parsers see one spelling
+
+    "Bring Vocals up three dB."        → "bring vocals up 3"
+    "forward a couple of bars"         → "forward 2 bars"
+    "set drums to minus two"           → "set drums to -2"
+    "set tempo a hundred and twenty"   → "set tempo 120"
+
+A translation table lower-cases ASCII, deletes punctuation the recognizer
+adds and turns other whitespace into spaces. A single walk over the words
+then folds spoken numbers ("twenty four", "one point five", "minus three",
+"a couple of") into digits, drops decibel units after a number ("3 db" →
+"3", since the dB is implied wherever an amount is) and spells bar units
+one way ("1 bar", "4 measures" → "bars", which patterns like
+"loop {amount} bars" need).
+
+Command words survive: a number word that starts the utterance without a
+unit ("zero all") and "one" after a determiner ("make this one red") are
+left alone.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import re
+
+ONES = {
+    'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6,
+    'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12,
+    'thirteen': 13, 'fourteen': 14, 'fifteen': 15, 'sixteen': 16, 'seventeen': 17,
+    'eighteen': 18, 'nineteen': 19,
+}
+TENS = {'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50, 'sixty': 60,
+        'seventy': 70, 'eighty': 80, 'ninety': 90}
+SIGNS = {'minus', 'negative'}
+
+# Unit after a number -> its spelling in the normalized text ('' = dropped)
+UNITS = {
+    'db': '', 'dbs': '', 'decibel': '', 'decibels': '',
+    'bar': 'bars', 'bars': 'bars', 'measure': 'bars', 'measures': 'bars',
+    'bpm': 'bpm',
+}
+
+# "this one", "the last one" - a pronoun, not a number ("loop next one" is a number)
+DETERMINERS = {'this', 'that', 'the', 'which', 'last', 'previous', 'each',
+               'every', 'any', 'no', 'other', 'another'}
+
+# ASCII upper case -> lower, recognizer punctuation deleted, other whitespace -> space
+TRANSLATION = str.maketrans(
+    {**{chr(c): chr(c + 32) for c in range(ord('A'), ord('Z') + 1)},
+     **{c: None for c in ',!?;:"()[]'},
+     **{c: ' ' for c in '\t\n\r'},
+     '’': "'", '‘': "'", '“': None, '”': None})
+
+NUMBER_TOKEN = re.compile(r'^-?\d+(?:\.\d+)?$')
+NUMBER_WITH_UNIT = re.compile(r'^(-?\d+(?:\.\d+)?)([a-z]+)$')  # "3db"
+UNIT_PATTERN = re.compile(r'\b(?:' + '|'.join(sorted(UNITS, key=len, reverse=True)) + r')\b')
+
+
+def strip_units(amount):
+    """Amount text without unit words ('6 db' → '6', '4 bars' → '4')"""
+    return UNIT_PATTERN.sub('', amount).strip()
+
+
+def _is_number_word(word):
+    return word in ONES or word in TENS
+
+
+def _read_words(words, i):
+    """
+    Spoken number starting at words[i]
+    Returns: (number text, index after it), or None
+    """
+    count = len(words)
+    if words[i] == 'a' and i + 1 < count and words[i + 1] == 'couple':
+        i += 2
+        return ('2', i + 1 if i < count and words[i] == 'of' else i)
+    if words[i] == 'couple' and i + 1 < count and words[i + 1] == 'of':
+        return ('2', i + 2)
+
+    # last: kind of the previous word, which decides what may follow it
+    value, last = 0, None
+    if words[i] == 'a' and i + 1 < count and words[i + 1] == 'hundred':
+        value, last, i = 100, 'hundred', i + 2
+    while i < count:
+        word = words[i]
+        if word in ONES and ONES[word] < 10 and last in (None, 'tens', 'hundred'):
+            value, last = value + ONES[word], 'ones'
+        elif word in ONES and last in (None, 'hundred'):
+            value, last = value + ONES[word], 'teens'
+        elif word in TENS and last in (None, 'hundred'):
+            value, last = value + TENS[word], 'tens'
+        elif word in TENS and last == 'ones':
+            value, last = value * 100 + TENS[word], 'tens'  # "one twenty" (bpm)
+        elif word == 'hundred' and last in ('ones', 'teens'):
+            value, last = value * 100, 'hundred'
+        elif not (word == 'and' and last == 'hundred' and i + 1 < count and _is_number_word(words[i + 1])):
+            break
+        i += 1
+    if last is None:
+        return None
+    text = str(value)
+
+    # "one point five"
+    if i + 1 < count and words[i] == 'point' and (words[i + 1] in ONES and ONES[words[i + 1]] < 10
+                                                  or words[i + 1].isdigit()):
+        digits = []
+        i += 1
+        while i < count and (words[i] in ONES and ONES[words[i]] < 10 or words[i].isdigit()):
+            digits.append(str(ONES.get(words[i], words[i])))
+            i += 1
+        text += '.' + ''.join(digits)
+    return (text, i)
+
+
+def normalize(text):
+    """Lower-cased, punctuation-free text with spoken numbers as digits"""
+    text = text.translate(TRANSLATION)
+    if not text.isascii():
+        text = text.lower()
+
+    words = []
+    for word in text.split():
+        word = word.strip(".'")
+        if '-' in word and not word.startswith('-') and all(_is_number_word(p) for p in word.split('-')):
+            words.extend(word.split('-'))  # "twenty-four"
+        elif word:
+            words.append(word)
+
+    out = []
+    i, count = 0, len(words)
+    while i < count:
+        word = words[i]
+        sign = ''
+        start = i
+        if word in SIGNS and i + 1 < count and (_is_number_word(words[i + 1])
+                                                or NUMBER_TOKEN.match(words[i + 1])):
+            sign, i = '-', i + 1
+            word = words[i]
+
+        spoken = None
+        match = NUMBER_WITH_UNIT.match(word)
+        if match and match.group(2) in UNITS:
+            number, unit, i = match.group(1), UNITS[match.group(2)], i + 1
+        elif NUMBER_TOKEN.match(word):
+            number, unit, i = word, None, i + 1
+        elif (word == 'one' and out and out[-1] in DETERMINERS
+              and (i + 1 == count or words[i + 1] not in UNITS and words[i + 1] != 'hundred')):
+            number = None
+        else:
+            spoken = _read_words(words, i)
+            number, i = spoken if spoken else (None, i)
+
+        if number is None:
+            out.append(words[start])
+            i = start + 1
+            continue
+
+        if match is None or match.group(2) not in UNITS:
+            unit = UNITS.get(words[i]) if i < count else None
+            if unit is not None:
+                i += 1
+        if spoken and start == 0 and not sign and unit is None:
+            # "zero all", "one more" - a command word, not an amount
+            out.extend(words[start:i])
+            continue
+
+        if sign and number.startswith('-'):
+            sign = ''
+        out.append(sign + number)
+        if unit:
+            out.append(unit)
+    return " ".join(out)
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from mixing_parser import MixingParser
+    from navigation_parser import NavigationParser
+
+    print("🔤 MiDAS AI - Text Normalizer")
+    print("=" * 60)
+    print()
+
+    cases = [
+        ("Bring Vocals up three dB.", "bring vocals up 3"),
+        ("forward a couple of bars", "forward 2 bars"),
+        ("set drums to minus two", "set drums to -2"),
+        ("set tempo a hundred and twenty", "set tempo 120"),
+        ("loop bars nine to sixteen", "loop bars 9 to 16"),
+        ("bass down one point five decibels", "bass down 1.5"),
+        ("bring vocals up slowly over twenty-four bars", "bring vocals up slowly over 24 bars"),
+        ("vocals up 6dB", "vocals up 6"),
+        ("loop one bar", "loop 1 bars"),
+        ("Zero all", "zero all"),
+        ("make this one red", "make this one red"),
+        ("jump to marker three", "jump to marker 3"),
+        ("rename track 2 to Lead Vox", "rename track 2 to lead vox"),
+        ("hi-hat down a bit", "hi-hat down a bit"),
+    ]
+    failed = 0
+    for spoken, expected in cases:
+        result = normalize(spoken)
+        ok = result == expected
+        failed += not ok
+        print(f"{'✅' if ok else '❌'} {spoken!r:<48} → {result!r}")
+    assert failed == 0
+    assert strip_units("6 decibels") == "6" and strip_units("4 bars") == "4"
+    print()
+
+    # Generated corpus: mixing / navigation patterns filled with spoken numbers,
+    # each paired with its digit form - a hit parses to the same command
+    mixing, navigation = MixingParser(), NavigationParser()
+    spoken_numbers = {1: "one", 2: "a couple of", 3: "three", 4: "four", 6: "six", 8: "eight",
+                      9: "nine", 12: "twelve", 16: "sixteen", 24: "twenty four", 32: "thirty-two",
+                      120: "a hundred and twenty", 128: "one hundred twenty eight"}
+    random.seed(4)
+
+    def variants(parser, skip):
+        for cmd_type, data in parser.commands.items():
+            if cmd_type in skip:
+                continue
+            for pattern in data.get('patterns', []):
+                if not re.search(r'\{(amount|number|bpm|start|end)\}', pattern):
+                    continue
+                for _ in range(40):
+                    values = {slot: random.choice(list(spoken_numbers))
+                              for slot in ('amount', 'number', 'bpm', 'start', 'end')}
+                    if values['start'] >= values['end']:
+                        values['start'], values['end'] = values['end'], values['start'] + values['end']
+                    digits = spoken = pattern.replace('{track}', 'vocals').replace('{group}', 'drums')
+                    for slot, value in values.items():
+                        words = spoken_numbers.get(value, str(value))
+                        digits = digits.replace(f'{{{slot}}}', str(value))
+                        spoken = spoken.replace(f'{{{slot}}}', words)
+                    if parser is mixing and random.random() < 0.5:
+                        digits, spoken = digits + " db", spoken + " decibels"
+                    if random.random() < 0.3:
+                        spoken = spoken.capitalize() + "."
+                    if parser.parse(digits)[0]:
+                        yield parser, digits, spoken
+
+    corpus = list(variants(mixing, ('fuzzy_amounts', 'track_aliases'))) + \
+        list(variants(navigation, ('fuzzy_amounts', 'common_sections')))
+
+    def command(parser, text):
+        success, cmd_type, params, _ = parser.parse(text)
+        return (cmd_type, [float(p) if re.match(r'^-?[\d.]+$', str(p)) else p for p in params or []])
+
+    def hits(prepare):
+        return sum(command(parser, prepare(spoken)) == command(parser, digits)
+                   for parser, digits, spoken in corpus)
+
+    before = hits(lambda text: text.lower().strip())
+    after = hits(normalize)
+    print(f"Corpus: {len(corpus)} spoken-number utterances")
+    print(f"Parsed like their digit form: {before} without normalizing → {after} with")
+    assert after > before and after >= len(corpus) * 0.95
+
+    texts = [spoken for _, _, spoken in corpus] * 20
+    start = time.perf_counter()
+    for text in texts:
+        normalize(text)
+    per_utterance = (time.perf_counter() - start) / len(texts) * 1e6
+    print(f"normalize(): {per_utterance:.1f} µs per utterance ({len(texts)} runs)")
+    print("✅ Spoken numbers and units folded once per utterance")
@@ -0,0 +1,224 @@
+"""
+MiDAS AI - Track Index
+Resolves spoken track names to channel indices on the Python side
+
+mixing.scpt's findTrack() scans every track per command. The index maps a
+normalized name (or an alias from mixing_commands.json) to the channel index
+once, and commands are sent as "#<index>:<name>" references. The script only
+trusts an index whose track still has that name, so a stale index degrades to
+the old name search instead of hitting the wrong channel.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+from typing import Dict, List, Optional
+
+REFERENCE_PREFIX = '#'
+GROUP_SEPARATOR = '\x1d'  # ASCII 29 - joins references for group-adjust
+
+
+def track_reference(index, name):
+    """Reference understood by findTrack(): '#<index>:<name>'"""
+    return f"{REFERENCE_PREFIX}{index}:{name}"
+
+
+def group_reference(indexed_names):
+    """Reference list for adjustGroupVolume() from [(index, name), ...]"""
+    return GROUP_SEPARATOR.join(track_reference(i, name) for i, name in indexed_names)
+
+
+def parse_track_reference(text):
+    """(index, name) for a '#<index>:<name>' reference, else None"""
+    if not text.startswith(REFERENCE_PREFIX) or ':' not in text:
+        return None
+    index, _, name = text[1:].partition(':')
+    if not index.isdigit():
+        return None
+    return (int(index), name)
+
+
+class TrackIndex:
+    """Normalized name / alias / pattern -> 1-based channel indices"""
+
+    def __init__(self, aliases=None):
+        """
+        Args:
+            aliases: spoken alias -> canonical name (mixing_commands.json track_aliases)
+        """
+        self.aliases = aliases or {}
+
+        # canonical name -> every spelling that means it ("vocals" -> vocal, vox, voice)
+        self.spellings: Dict[str, List[str]] = {}
+        for alias, canonical in self.aliases.items():
+            self.spellings.setdefault(canonical, [canonical])
+            if alias not in self.spellings[canonical]:
+                self.spellings[canonical].append(alias)
+
+        self.names: List[str] = []  # Logic track names in channel order
+        self._lowered: List[str] = []
+        self.version = None  # version of the track list this index was built from
+        self.valid = False
+        self._resolved: Dict[str, Optional[int]] = {}
+        self._members: Dict[str, List[int]] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def rebuild(self, names, version=None):
+        """Index a track list (Logic channel order)"""
+        self.names = list(names)
+        self._lowered = [name.lower() for name in self.names]
+        self.version = version
+        self.valid = True
+        self._resolved.clear()
+        self._members.clear()
+
+    def invalidate(self):
+        """Forget everything (tracks were created, renamed, moved or deleted)"""
+        self.valid = False
+        self._resolved.clear()
+        self._members.clear()
+
+    def _terms(self, query):
+        """Spellings to look for, the spoken query first"""
+        query = query.lower().strip()
+        canonical = self.aliases.get(query, query)
+        terms = [query]
+        for term in [canonical] + self.spellings.get(canonical, []):
+            if term not in terms:
+                terms.append(term)
+        return terms
+
+    def _scan(self, term):
+        return [i for i, name in enumerate(self._lowered, 1) if term in name]
+
+    def resolve(self, query) -> Optional[int]:
+        """
+        Channel index for a track name, or None.
+        Same rule as findTrack() (first name containing the query), then aliases.
+        """
+        if not self.valid:
+            return None
+        key = query.lower().strip()
+        if key in self._resolved:
+            self.hits += 1
+            return self._resolved[key]
+
+        self.misses += 1
+        index = None
+        for term in self._terms(key):
+            matches = self._scan(term)
+            if matches:
+                index = matches[0]
+                break
+        self._resolved[key] = index
+        return index
+
+    def members(self, pattern) -> List[int]:
+        """Channel indices of every track matching a group pattern (or any of its aliases)"""
+        if not self.valid:
+            return []
+        key = pattern.lower().strip()
+        if key in self._members:
+            self.hits += 1
+            return self._members[key]
+
+        self.misses += 1
+        found = set()
+        for term in self._terms(key):
+            found.update(self._scan(term))
+        self._members[key] = sorted(found)
+        return self._members[key]
+
+    def reference(self, query) -> Optional[str]:
+        """'#<index>:<name>' for a query, or None if it doesn't resolve"""
+        index = self.resolve(query)
+        if index is None:
+            return None
+        return track_reference(index, self.names[index - 1])
+
+    def group(self, pattern) -> Optional[str]:
+        """Group reference for a pattern, or None if nothing matches"""
+        indices = self.members(pattern)
+        if not indices:
+            return None
+        return group_reference((i, self.names[i - 1]) for i in indices)
+
+    def stats(self):
+        return {'tracks': len(self.names), 'valid': self.valid,
+                'hits': self.hits, 'misses': self.misses}
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    import json
+    from pathlib import Path
+
+    with open(Path(__file__).parent / "mixing_commands.json", 'r') as f:
+        aliases = json.load(f)['track_aliases']
+
+    print("🗂️  MiDAS AI - Track Index")
+    print("=" * 60)
+    print()
+
+    index = TrackIndex(aliases)
+    index.rebuild(["Kick", "Snare", "Perc Loop", "Bass", "Lead Vocal", "Vox Double", "Gtr L", "Gtr R"])
+
+    tests = [
+        ("kick", 1),
+        ("bass", 4),
+        ("vocals", 5),   # "Lead Vocal" only matches through the vocal alias
+        ("vox", 6),
+        ("guitars", 7),
+        ("strings", None),
+    ]
+
+    passed = 0
+    for query, expected in tests:
+        got = index.resolve(query)
+        ok = got == expected
+        passed += ok
+        print(f"{'✅' if ok else '❌'} '{query}' → {index.reference(query)}")
+
+    print()
+    print(f"'drums' group → {index.members('drums')}")
+    print(f"'guitars' group → {index.group('guitars')!r}")
+    assert parse_track_reference(track_reference(5, "Lead Vocal")) == (5, "Lead Vocal")
+
+    print()
+    print(f"RESULTS: {passed} passed, {len(tests) - passed} failed")
+
+    # End to end on a 120-track simulated session: name scans vs resolved references
+    from executor import SimulatedExecutor
+    from mixing_parser import MixingParser
+    from router import CommandRouter
+    from simulated_logic import SimulatedLogic
+
+    names = [f"Track {i}" for i in range(1, 111)] + \
+        ["Kick", "Snare", "Bass", "Lead Vocal", "Vox Double", "Gtr L", "Gtr R", "Keys", "Pad", "FX"]
+    commands = ["vocals up 2", "mute fx", "solo keys", "pad down 3", "unsolo keys",
+                "unmute fx", "set bass to 0"] * 5
+
+    print()
+    for label, use_router in [("name search", False), ("track index", True)]:
+        daw = SimulatedLogic(names)
+        executor = SimulatedExecutor(daw, realtime=False)
+        if use_router:
+            router = CommandRouter(executor=executor)
+            results = [router.execute(router.route(text)) for text in commands]
+            ok = sum(r.success for r in results)
+        else:
+            parser = MixingParser(executor=executor)
+            ok = sum(parser.execute(text)['success'] for text in commands)
+        print(f"{label:>12}: {ok}/{len(commands)} ok, {daw.name_comparisons} track name comparisons "
+              f"in Logic, {executor.invocations} osascript calls")
+
+    # Creating a track invalidates the index; the next command re-resolves
+    router.execute(router.route("create audio track"))
+    assert not router.track_index.valid
+    router.execute(router.route("mute fx"))
+    assert router.track_index.valid and len(router.track_index.names) == len(names) + 1
+    print("✅ Index rebuilt after track creation")
@@ -0,0 +1,418 @@
+"""
+MiDAS AI - Track Order
+Keeps the project's track order and folder tree on the Python side
+
+"move track 2 to top" used to send move_up with 50 positions and
+"move 8 to bottom" move_down with 50 - up to 50 UI moves with delays in
+a 6-track project. With the order known, TrackParser sends move_to with
+the absolute target and moveTrackTo() takes the shortest way there;
+relative moves are clamped to the ends of the list.
+
+Folder stacks are kept as a tree - every track points at the folder that
+contains it - so group commands are checked before anything is sent (the
+range exists and doesn't cut through a folder, ungroup targets a folder)
+and "ungroup the drums folder" is a bisect over the sorted folder names.
+
+The order is rebuilt from the shadow state's track list and updated
+incrementally from every track_management.scpt command that succeeded,
+so it stays exact between snapshots. A snapshot with the same tracks in
+the same order keeps the folder membership it can't report. Commands
+whose effect can't be predicted (moving or deleting a folder, moving a
+track across a folder edge, session templates) drop it until the next
+rebuild.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import List, Optional
+
+# track_management.scpt commands that don't change the order
+UNORDERED_COMMANDS = {'rename', 'color', 'hide', 'show', 'hide_except', 'show_all', 'lock', 'unlock'}
+
+# Default name and type Logic gives new tracks
+NEW_TRACKS = {'create_audio': ("Audio", 'audio'), 'create_midi': ("Inst", 'midi'),
+              'create_aux': ("Aux", 'aux')}
+
+
+def folder_key(name):
+    """Lookup key for a spoken folder name ("the Drums folder" -> "drums")"""
+    words = name.lower().split()
+    if words[:1] == ['the']:
+        words = words[1:]
+    if words[-1:] in (['folder'], ['stack']):
+        words = words[:-1]
+    return " ".join(words)
+
+
+@dataclass(eq=False)
+class TrackNode:
+    """One track in the tree"""
+    name: str
+    kind: Optional[str] = None                # audio / midi / aux / folder (None = unknown)
+    folder: Optional['TrackNode'] = None      # containing folder (None = top level)
+
+
+class TrackOrder:
+    """Tracks in Logic's order (1-based positions) with their folders"""
+
+    def __init__(self):
+        self.nodes: List[TrackNode] = []
+        self.version = None  # version of the track list this order was built from
+        self.valid = False
+        self._folders = None  # sorted [(key, position)], rebuilt after a change
+
+    @property
+    def names(self) -> List[str]:
+        return [node.name for node in self.nodes]
+
+    def rebuild(self, names, version=None, kinds=None):
+        """
+        Take the order from a track list (Logic channel order)
+        kinds: track types in the same order, if known
+        """
+        names = list(names)
+        kinds = list(kinds) if kinds else [None] * len(names)
+        if self.valid and self.names == names:
+            # Same layout - keep the folder membership a snapshot doesn't report
+            for node, kind in zip(self.nodes, kinds):
+                node.kind = kind or node.kind
+        else:
+            self.nodes = [TrackNode(name, kind) for name, kind in zip(names, kinds)]
+        self.version = version
+        self.valid = True
+        self._folders = None
+
+    def invalidate(self):
+        self.valid = False
+        self._folders = None
+
+    @property
+    def count(self) -> Optional[int]:
+        """Number of tracks, or None if the order isn't known"""
+        return len(self.nodes) if self.valid else None
+
+    def position(self, name) -> Optional[int]:
+        """1-based position of the first track with exactly this name"""
+        names = self.names
+        if self.valid and name in names:
+            return names.index(name) + 1
+        return None
+
+    # ============================================================
+    # FOLDERS
+    # ============================================================
+
+    def _folder_nodes(self):
+        """Every node that is a folder (by type, or because something is in it)"""
+        folders = {node.folder for node in self.nodes if node.folder is not None}
+        folders.update(node for node in self.nodes if node.kind == 'folder')
+        return folders
+
+    def find_folder(self, name) -> Optional[int]:
+        """
+        Position of the folder called name - exact name, else the first folder
+        name starting with it - or None
+        """
+        if not self.valid:
+            return None
+        if self._folders is None:
+            folders = self._folder_nodes()
+            self._folders = sorted((folder_key(node.name), position)
+                                   for position, node in enumerate(self.nodes, 1) if node in folders)
+        key = folder_key(name)
+        i = bisect_left(self._folders, (key, 0))
+        if i < len(self._folders) and self._folders[i][0].startswith(key):
+            return self._folders[i][1]
+        return None
+
+    def _ancestors(self, node):
+        parent = node.folder
+        while parent is not None:
+            yield parent
+            parent = parent.folder
+
+    def members(self, position) -> List[int]:
+        """Positions of every track inside the folder at position (nested ones too)"""
+        if not self.valid or not 1 <= position <= len(self.nodes):
+            return []
+        folder = self.nodes[position - 1]
+        found = []
+        for i in range(position, len(self.nodes)):
+            if folder not in self._ancestors(self.nodes[i]):
+                break
+            found.append(i + 1)
+        return found
+
+    def describe(self) -> str:
+        """The tree as text, one track per line, indented under its folder"""
+        folders = self._folder_nodes()
+        lines = []
+        for position, node in enumerate(self.nodes, 1):
+            depth = len(list(self._ancestors(node)))
+            label = f"{node.name}/" if node in folders else node.name
+            lines.append(f"{'  ' * depth}{position}. {label}")
+        return "\n".join(lines)
+
+    # ============================================================
+    # VALIDATION
+    # ============================================================
+
+    def check(self, args) -> Optional[str]:
+        """
+        Error for a group/ungroup command the tree says can't work, else None
+        (always None if the order isn't known)
+        """
+        if not self.valid or not args or args[0] not in ('group', 'ungroup'):
+            return None
+        count = len(self.nodes)
+
+        if args[0] == 'ungroup':
+            if not args[1].isdigit():
+                return f"No folder called '{args[1]}'"
+            position = int(args[1])
+            if not 1 <= position <= count:
+                return f"No track {position} (the project has {count})"
+            node = self.nodes[position - 1]
+            if node.kind is not None and node not in self._folder_nodes():
+                return f"Track {position} ({node.name}) isn't a folder"
+            return None
+
+        start, end = int(args[1]), int(args[2])
+        if start > end:
+            return f"Group range {start} to {end} is backwards"
+        if start < 1 or end > count:
+            return f"Tracks {start} to {end} aren't all in the project (it has {count})"
+
+        # Every track's nearest folder outside the range must be the first track's folder...
+        grouped = set(self.nodes[start - 1:end])
+        outer = self.nodes[start - 1].folder
+        for node in self.nodes[start - 1:end]:
+            parent = next((p for p in self._ancestors(node) if p not in grouped), None)
+            if parent is not outer:
+                return f"Tracks {start} to {end} cut through the {(parent or outer).name} folder"
+        # ...and no folder in the range may continue past its end
+        if end < count:
+            for parent in self._ancestors(self.nodes[end]):
+                if parent in grouped:
+                    return f"Tracks {start} to {end} cut through the {parent.name} folder"
+        return None
+
+    # ============================================================
+    # MOVES
+    # ============================================================
+
+    def move_args(self, num, target):
+        """
+        track_management.scpt args moving track num to position target
+        ('top' / 'bottom' or a number, clamped to the list)
+        Returns: args, or None if the order isn't known
+        """
+        count = self.count
+        if count is None:
+            return None
+        if target == 'top':
+            target = 1
+        elif target == 'bottom':
+            target = count
+        target = min(max(int(target), 1), max(count, 1))
+        return ['move_to', str(num), str(target)]
+
+    def relative_positions(self, num, direction, amount):
+        """amount clamped to how far track num can actually move (unchanged if unknown)"""
+        count = self.count
+        if count is None or not 1 <= int(num) <= count:
+            return str(amount)
+        room = int(num) - 1 if direction == 'up' else count - int(num)
+        return str(min(int(amount), room))
+
+    # ============================================================
+    # UPDATES
+    # ============================================================
+
+    def apply(self, args):
+        """Update the order after a successful track_management.scpt command"""
+        if not self.valid or not args:
+            return
+        self._folders = None
+        cmd = args[0]
+        if cmd in UNORDERED_COMMANDS:
+            if cmd == 'rename':
+                self._rename(int(args[1]), args[2])
+            return
+        if cmd in NEW_TRACKS:
+            name, kind = NEW_TRACKS[cmd]
+            self.nodes.append(TrackNode(f"{name} {len(self.nodes) + 1}", kind))
+            return
+
+        index = int(args[1]) - 1 if args[1].isdigit() else -1
+        if not 0 <= index < len(self.nodes):
+            self.invalidate()
+            return
+        node = self.nodes[index]
+        is_folder = node in self._folder_nodes()
+
+        if cmd == 'duplicate' and not is_folder:
+            self.nodes.insert(index + 1, TrackNode(node.name, node.kind, node.folder))
+        elif cmd == 'delete' and not is_folder:
+            self.nodes.pop(index)
+        elif cmd == 'group':
+            # A folder stack is created above the first grouped track, holding the range
+            name = args[3] if len(args) > 3 else f"Folder {index + 1}"
+            outer = node.folder
+            stack = TrackNode(name, 'folder', outer)
+            for member in self.nodes[index:int(args[2])]:
+                if member.folder is outer:
+                    member.folder = stack
+            self.nodes.insert(index, stack)
+        elif cmd == 'ungroup' and is_folder:
+            for member in self.nodes:
+                if member.folder is node:
+                    member.folder = node.folder
+            self.nodes.pop(index)
+        elif cmd in ('move_up', 'move_down', 'move_to') and not is_folder:
+            if cmd == 'move_to':
+                target = int(args[2]) - 1
+            else:
+                positions = int(args[2]) if len(args) > 2 else 1
+                target = index - positions if cmd == 'move_up' else index + positions
+            target = min(max(target, 0), len(self.nodes) - 1)
+            passed = self.nodes[min(index, target):max(index, target) + 1]
+            if any(other.folder is not node.folder or other.kind == 'folder' for other in passed):
+                self.invalidate()  # moved into or out of a folder
+                return
+            self.nodes.insert(target, self.nodes.pop(index))
+        else:
+            self.invalidate()  # a folder moved or deleted, or an unknown command: re-read
+
+    def _rename(self, num, name):
+        if 1 <= num <= len(self.nodes):
+            self.nodes[num - 1].name = name
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    import time
+
+    from executor import SimulatedExecutor
+    from router import CommandRouter
+    from simulated_logic import SimulatedLogic
+    from track_parser import TrackParser
+
+    print("↕️  MiDAS AI - Track Order")
+    print("=" * 60)
+    print()
+
+    names = ["Kick", "Snare", "Bass", "Keys", "Vocals", "FX"]
+    commands = ["move track 5 to top", "move 2 to bottom", "move track 3 up 9", "move track 1 to top"]
+    # What the parser used to send for them
+    blind_args = [['move_up', '5', '50'], ['move_down', '2', '50'], ['move_up', '3', '9'], ['move_up', '1', '50']]
+
+    def moves(daw, send):
+        before = daw.ui_steps
+        assert send().success
+        return daw.ui_steps - before - SimulatedLogic.SELECT_RESET_STEPS  # select cursor + moves
+
+    daw = SimulatedLogic(names)
+    executor = SimulatedExecutor(daw, realtime=False)
+    parser = TrackParser(executor=executor)
+    blind = [moves(daw, lambda: executor.run(parser.script_path, args)) for args in blind_args]
+    blind_result = [t.name for t in daw.tracks]
+
+    daw = SimulatedLogic(names)
+    parser = TrackParser(executor=SimulatedExecutor(daw, realtime=False))
+    parser.order.rebuild(names)
+    exact = []
+    for text in commands:
+        args = parser.resolve(parser.parse(text)['args'])
+        exact.append(moves(daw, lambda: parser.executor.run(parser.script_path, args)))
+        parser.order.apply(args)
+
+    for text, before, after in zip(commands, blind, exact):
+        print(f"{text:<22} {before:>3} → {after:>2} UI steps")
+    print(f"Order: {' / '.join(parser.order.names)}")
+    assert [t.name for t in daw.tracks] == blind_result == parser.order.names
+    assert exact == [4 + 4, 1 + 4, 2 + 2, 0]
+    print(f"Total: {sum(blind)} → {sum(exact)} UI steps")
+    print()
+
+    # Through the router: order taken from the shadow state, kept up to date incrementally
+    daw = SimulatedLogic(names)
+    executor = SimulatedExecutor(daw, realtime=False)
+    router = CommandRouter(executor=executor, dedupe_window=0)
+    for text in ["create audio track", "move track 7 to top", "duplicate track 2", "move track 2 to bottom"]:
+        before = executor.invocations
+        intent = router.route(text)
+        assert executor.invocations == before  # positions are looked up when the move runs
+        result = router.execute(intent)
+        print(f"{text:<24} → {daw.log[-1][1]}  {result.output}")
+        assert result.success, result.error
+    assert daw.log[-1][1] == ['move_to', '2', '8']  # the bottom after the create and duplicate
+    assert router.tracks.order.names == [t.name for t in daw.tracks], router.tracks.order.names
+
+    # A move Logic rejects leaves the order alone
+    names_before = router.tracks.order.names
+    executor.action_latency['move_to'] = 20.0
+    result = router.execute(router.route("move track 3 to top"))
+    assert not result.success and router.tracks.order.names == names_before
+    del executor.action_latency['move_to']
+    print(f"Order: {' / '.join(router.tracks.order.names)}")
+    print()
+
+    # Folder tree: group commands checked before anything is sent
+    daw = SimulatedLogic(["Kick", "Snare", "Hats", "Bass", "Lead", "Harmony"])
+    executor = SimulatedExecutor(daw, realtime=False)
+    router = CommandRouter(executor=executor, dedupe_window=0)
+    router.refresh_state()
+    for text, ok in [("group tracks 1 to 3 as drums", True), ("group tracks 6 to 7 as vox", True),
+                     ("group tracks 2 to 3 as kit", True), ("group tracks 3 to 5", False),
+                     ("ungroup track 6", False), ("group tracks 9 to 12", False),
+                     ("ungroup the drums folder", True), ("ungroup the strings folder", False)]:
+        before = executor.invocations
+        intent = router.route(text)
+        result = router.execute(intent)
+        print(f"{text:<28} → {result.output or result.error}  ({executor.invocations - before} call(s))")
+        assert result.success == ok, (text, result)
+        assert ok or executor.invocations == before
+    order = router.tracks.order
+    assert order.names == [t.name for t in daw.tracks], order.names
+    print(order.describe())
+    assert order.members(order.find_folder("the vox folder")) == [7, 8]
+
+    # Batched voice commands: each move and "this" looked up when its turn comes
+    print()
+    daw = SimulatedLogic(["Kick", "Snare", "Bass"])
+    executor = SimulatedExecutor(daw, realtime=False)
+    parser = TrackParser(executor=executor)
+    parser.order.rebuild([t.name for t in daw.tracks], kinds=['audio'] * 3)
+    for texts in [["create audio track", "call this guitar", "color track 1 red"],
+                  ["move track 1 to bottom", "group 1 to 2", "group tracks 9 to 12", "duplicate track 2"]]:
+        before = executor.invocations
+        results = parser.process_voice_commands(texts)
+        for text, result in zip(texts, results):
+            print(f"{text:<24} → {result.get('output') or result.get('error')}")
+        print(f"   {len(texts)} commands in {executor.invocations - before} call(s)")
+        assert [r['success'] for r in results] == [text != "group tracks 9 to 12" for text in texts]
+    # "this" was the new track 4; Kick went to the new bottom before Snare and Bass were grouped
+    assert [t.name for t in daw.tracks] == ["Folder 1", "Snare", "Snare", "Bass", "guitar", "Kick"]
+    assert parser.order.names == [t.name for t in daw.tracks], (parser.order.names, [t.name for t in daw.tracks])
+    # Followed through each command as it ran: no re-read needed after the batches
+    assert parser.selection.selected == daw.selected and parser.selection.resyncs == 1, (
+        parser.selection.selected, daw.selected)
+    assert not any(args[:1] == ['group'] and args[1] == '9' for _, args in daw.log)
+    print(f"Order: {' / '.join(parser.order.names)} (selected {daw.selected})")
+    print()
+
+    # Resolving a folder name is a bisect
+    big = TrackOrder()
+    big.rebuild([f"Bus {n:04d}" for n in range(2000)], kinds=['folder'] * 2000)
+    start = time.perf_counter()
+    for n in range(0, 2000, 2):
+        assert big.find_folder(f"bus {n:04d} folder") == n + 1
+    per_lookup = (time.perf_counter() - start) / 1000 * 1e6
+    print(f"2000 folders: {per_lookup:.1f} µs per folder lookup")
+    print("✅ Moves sent as exact positions, folders checked and resolved without re-reading Logic")
@@ -7,11 +7,18 @@ Built: February 17, 2026
 
 import json
 import re
-import subprocess
 from pathlib import Path
 
+from batch import CommandBatch
+from executor import OsascriptExecutor
+from track_order import TrackOrder
+from track_selection import SELECTED, TrackSelection
+
 class TrackParser:
-    def __init__(self):
+    # Commands whose args resolve() looks up in the track order
+    ORDER_COMMANDS = {'move_up', 'move_down', 'move_to', 'ungroup'}
+    
+    def __init__(self, executor=None, selection=None):
         # Load command patterns
         commands_file = Path(__file__).parent / 'track_commands.json'
         with open(commands_file, 'r') as f:
@@ -19,6 +26,13 @@ class TrackParser:
         
         # AppleScript file path
         self.script_path = Path(__file__).parent.parent / 'logic-automation' / 'track_management.scpt'
+        self.executor = executor or OsascriptExecutor()
+        
+        # Track order for exact moves (rebuilt by the router from the shadow state)
+        self.order = TrackOrder()
+        
+        # Selected track for "this" commands (shared with PluginParser by the router)
+        self.selection = selection or TrackSelection(self.executor)
         
     def parse(self, text):
         """Parse natural language command and return AppleScript command"""
@@ -125,20 +139,23 @@ class TrackParser:
         elif action == 'rename':
             args = ['rename', vars_dict['num'], vars_dict['name']]
         elif action == 'rename_selected':
-            # Rename currently selected track (use track 1 as placeholder)
-            args = ['rename', '1', vars_dict['name']]
+            # Rename currently selected track
+            args = ['rename', SELECTED, vars_dict['name']]
         elif action == 'group':
             args = ['group', vars_dict['start'], vars_dict['end']]
         elif action == 'group_named':
             args = ['group', vars_dict['start'], vars_dict['end'], vars_dict['name']]
         elif action == 'ungroup':
             args = ['ungroup', vars_dict['num']]
+        elif action == 'ungroup_named':
+            # Folder name - resolve() looks its position up when the command runs
+            args = ['ungroup', vars_dict['name']]
         elif action == 'color':
             color = self._normalize_color(vars_dict['color'])
             args = ['color', vars_dict['num'], color]
         elif action == 'color_selected':
             color = self._normalize_color(vars_dict['color'])
-            args = ['color', '1', color]
+            args = ['color', SELECTED, color]
         elif action == 'hide':
             args = ['hide', vars_dict['num']]
         elif action == 'show':
@@ -160,9 +177,11 @@ class TrackParser:
         elif action == 'move_down_amount':
             args = ['move_down', vars_dict['num'], vars_dict['amount']]
         elif action == 'move_to_top':
-            args = ['move_up', vars_dict['num'], '50']  # Move 50 positions (enough to reach top)
+            # Exact position - top is always 1
+            args = ['move_to', vars_dict['num'], '1']
         elif action == 'move_to_bottom':
-            args = ['move_down', vars_dict['num'], '50']  # Move 50 positions (enough to reach bottom)
+            # resolve() turns 'bottom' into a position when the command runs
+            args = ['move_to', vars_dict['num'], 'bottom']
         
         return {
             'action': action,
@@ -190,6 +209,8 @@ class TrackParser:
             return f"Grouping tracks {vars_dict['start']} to {vars_dict['end']}"
         elif action == 'ungroup':
             return f"Ungrouping folder at track {vars_dict['num']}"
+        elif action == 'ungroup_named':
+            return f"Ungrouping the {vars_dict['name']} folder"
         elif action in ['color', 'color_selected']:
             return f"Coloring track {vars_dict.get('color', 'red')}"
         elif action == 'hide':
@@ -214,49 +235,115 @@ class TrackParser:
             return f"Moving track {vars_dict['num']} to bottom"
         return "Executing command"
     
+    def needs_order(self, args):
+        """True if resolve() needs the track count or folder positions"""
+        return (len(args) > 2 and args[0] == 'move_to' and args[2] == 'bottom'
+                or len(args) > 1 and args[0] == 'ungroup' and not args[1].isdigit())
+    
+    def resolve(self, args):
+        """
+        Script args for a track command, looked up in the track order and
+        selection when it runs (earlier commands may have moved tracks or
+        changed the selection since it was parsed)
+        args: command name, then arguments (as parsed)
+        """
+        args = self.selection.resolve(args)
+        cmd = args[0] if args else ''
+        
+        if cmd == 'move_to' and args[2] == 'bottom':
+            # Exact position from the track order; 50 moves (enough to reach bottom) if unknown
+            return self.order.move_args(args[1], 'bottom') or ['move_down', args[1], '50']
+        
+        if cmd in ('move_up', 'move_down'):
+            direction = 'up' if cmd == 'move_up' else 'down'
+            return [cmd, args[1], self.order.relative_positions(args[1], direction, args[2])]
+        
+        if cmd == 'ungroup' and not args[1].isdigit():
+            # Folder position from the folder tree (the name is kept if it isn't there)
+            position = self.order.find_folder(args[1])
+            return ['ungroup', str(position)] if position else list(args)
+        
+        return args
+    
     def execute(self, command):
         """Execute AppleScript command"""
         if not command:
             return {"success": False, "error": "No command parsed"}
+        args = self.resolve(command['args'])
         
-        try:
-            # Build osascript command
-            cmd = ['osascript', str(self.script_path)] + command['args']
-            
-            # Execute
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                return {
-                    "success": True,
-                    "output": result.stdout.strip(),
-                    "description": command['description']
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": result.stderr.strip(),
-                    "description": command['description']
-                }
+        # "This" with no selected track, or group commands the folder tree says
+        # can't work, never reach Logic
+        error = self.selection.check(args) or self.order.check(args)
+        if error:
+            return {"success": False, "error": error, "description": command['description']}
+        
+        # Execute AppleScript
+        result = self.executor.run(self.script_path, args, timeout=10)
         
-        except subprocess.TimeoutExpired:
+        if result.success:
+            self._observe(args)
             return {
-                "success": False,
-                "error": "Command timed out",
+                "success": True,
+                "output": result.output,
                 "description": command['description']
             }
-        except Exception as e:
+        else:
             return {
                 "success": False,
-                "error": str(e),
+                "error": result.error,
                 "description": command['description']
             }
     
+    def runs_alone(self, args):
+        """
+        True if a command depends on where earlier commands left the tracks or
+        the selection (moves, folders, "this") - it is resolved and checked
+        just before it runs, so it never goes out inside a batch
+        """
+        return bool(args) and (args[0] in self.ORDER_COMMANDS or args[0] == 'group'
+                               or args[1:2] == [SELECTED])
+    
+    def execute_batch(self, commands):
+        """
+        Execute several parsed commands (one result per command, in order)
+        Runs of independent commands go out in one osascript call; the ones
+        that depend on earlier commands run on their own, in sequence, like
+        a macro replay
+        """
+        results = [None] * len(commands)
+        batch = CommandBatch(self.executor)
+        queued = []
+        
+        def flush():
+            # Followed one command at a time, so each sees the layout the previous one left
+            for (index, command, args), result in zip(queued, batch.execute()):
+                if result.success:
+                    self._observe(args)
+                    results[index] = {"success": True, "output": result.output,
+                                      "description": command['description']}
+                else:
+                    results[index] = {"success": False, "error": result.error,
+                                      "description": command['description']}
+            queued.clear()
+        
+        for index, command in enumerate(commands):
+            if not command:
+                results[index] = {"success": False, "error": "No command parsed"}
+            elif self.runs_alone(command['args']):
+                flush()
+                results[index] = self.execute(command)
+            else:
+                batch.add(self.script_path, command['args'])
+                queued.append((index, command, command['args']))
+        flush()
+        
+        return results
+    
+    def _observe(self, args):
+        """Follow track order and selection through a command that succeeded"""
+        self.order.apply(args)
+        self.selection.observe(self.script_path.name, args, self.order.count)
+    
     def process_voice_command(self, text):
         """Complete pipeline: parse → execute → return result"""
         command = self.parse(text)
@@ -273,6 +360,20 @@ class TrackParser:
         result['action'] = command['action']
         
         return result
+    
+    def process_voice_commands(self, texts):
+        """Batch pipeline: parse all → execute in one call → return results"""
+        commands = [self.parse(text) for text in texts]
+        results = self.execute_batch(commands)
+        
+        for text, command, result in zip(texts, commands, results):
+            result['original'] = text
+            if command:
+                result['action'] = command['action']
+            else:
+                result['error'] = "Could not understand command"
+        
+        return results
 
 
 # ============================================
@@ -300,6 +401,7 @@ def test_parser():
         "group tracks 1 to 4",
         "group 5 to 8 as vocals",
         "ungroup track 2",
+        "ungroup the drums folder",
         
         # Colors
         "color track 3 red",
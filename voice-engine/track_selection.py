@@ -0,0 +1,226 @@
+"""
+MiDAS AI - Track Selection
+Follows Logic's selected track on the Python side so "this" means the right track
+
+"call this bass", "paint this green" and "load compressor" used to send
+track 1 - asking Logic (getSelectedTrackNumber) would cost a UI query per
+command. Every track_management / plugin_control command selects the track
+it works on (selectTrackByNumber), and creating, duplicating, grouping or
+moving a track leaves a known track selected, so the selection is followed
+from the commands that succeeded:
+
+    create_*         → the new last track        duplicate n → n + 1
+    delete n         → n (or the new last one)   group s e   → s (the folder)
+    move_*           → where the track ended up  other n     → n
+
+Parsers put the SELECTED placeholder where the track number goes, and
+resolve() fills it in when the command runs - a "this" queued behind
+"create audio track" means the new track, not whatever was selected while
+it was parsed. The selection is re-read with get_selected when it's
+unknown, older than max_age seconds or max_commands commands (the user
+may have clicked a track in the meantime). If Logic can't say which track
+is selected, check() fails the command ("No track selected") rather than
+guessing one.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import time
+from pathlib import Path
+from typing import Optional
+
+TRACK_SCRIPT = Path(__file__).parent.parent / 'logic-automation' / 'track_management.scpt'
+
+# track_management.scpt commands that leave the selection alone
+KEEPS_SELECTION = {'show_all', 'get_selected'}
+
+# Track argument of a parsed "this" command, replaced by resolve() when it runs
+SELECTED = 'selected'
+
+
+class TrackSelection:
+    """The selected track number (1-based), from commands plus periodic resyncs"""
+
+    def __init__(self, executor, max_age=120, max_commands=25, clock=time.monotonic):
+        """
+        Args:
+            executor: Executor used for resyncs
+            max_age: seconds before the followed selection is re-read
+            max_commands: commands before the followed selection is re-read
+            clock: time source (seconds)
+        """
+        self.executor = executor
+        self.max_age = max_age
+        self.max_commands = max_commands
+        self.clock = clock
+
+        self.selected = None   # None = unknown
+        self.synced_at = None
+        self.commands = 0      # commands followed since the last resync
+
+        self.resyncs = 0
+        self.followed = 0
+
+    def needs_resync(self):
+        return (self.selected is None or self.synced_at is None
+                or self.clock() - self.synced_at > self.max_age
+                or self.commands >= self.max_commands)
+
+    def resync(self):
+        """Ask Logic which track is selected; True if it answered"""
+        self.resyncs += 1
+        result = self.executor.run(TRACK_SCRIPT, ['get_selected'], timeout=10)
+        if not result.success or not result.output.strip().isdigit():
+            self.selected = None
+            return False
+        self.selected = int(result.output.strip()) or None
+        self.synced_at = self.clock()
+        self.commands = 0
+        return True
+
+    def track(self) -> Optional[str]:
+        """
+        Selected track number as a script argument (resyncs first if due)
+        Returns None if Logic can't tell us
+        """
+        if self.needs_resync():
+            self.resync()
+        return str(self.selected) if self.selected else None
+
+    def resolve(self, args):
+        """
+        args with the SELECTED placeholder replaced by the selected track number
+        (left in place if there is no selection - see check())
+        """
+        if len(args) > 1 and args[1] == SELECTED:
+            track = self.track()
+            if track is not None:
+                return [args[0], track] + list(args[2:])
+        return list(args)
+
+    @staticmethod
+    def check(args) -> Optional[str]:
+        """Error for resolved args that still have no track to act on, else None"""
+        if len(args) > 1 and args[1] == SELECTED:
+            return "No track selected"
+        return None
+
+    def invalidate(self):
+        self.selected = None
+
+    def observe(self, script_name, args, count=None):
+        """
+        Follow the selection through a successful command
+        count: number of tracks after it ran, if known
+        """
+        if not args:
+            return
+        cmd = args[0]
+        if script_name == 'plugin_control.scpt':
+            if len(args) > 1 and args[1].isdigit():
+                self._select(int(args[1]))
+            return
+        if script_name != 'track_management.scpt' or cmd in KEEPS_SELECTION:
+            return
+
+        if cmd in ('create_audio', 'create_midi', 'create_aux'):
+            self._select(count)
+            return
+        if len(args) < 2 or not args[1].isdigit():
+            return
+        number = int(args[1])
+        if cmd == 'duplicate':
+            number += 1
+        elif cmd == 'delete' and count is not None:
+            number = min(number, count)
+        elif cmd == 'move_to':
+            number = int(args[2])
+        elif cmd in ('move_up', 'move_down'):
+            positions = int(args[2]) if len(args) > 2 else 1
+            number = max(number - positions, 1) if cmd == 'move_up' else number + positions
+            if count is not None:
+                number = min(number, count)
+        self._select(number)
+
+    def _select(self, number):
+        self.selected = number or None
+        self.commands += 1
+        self.followed += 1
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    from executor import SimulatedExecutor
+    from router import CommandRouter
+    from simulated_logic import SimulatedLogic
+
+    print("👉 MiDAS AI - Track Selection")
+    print("=" * 60)
+    print()
+
+    daw = SimulatedLogic(["Kick", "Snare", "Bass", "Keys"])
+    executor = SimulatedExecutor(daw, realtime=False)
+    now = [0.0]
+    router = CommandRouter(executor=executor, dedupe_window=0)
+    router.tracks.selection.clock = lambda: now[0]
+    router.refresh_state()
+
+    for text, expected in [("create audio track", 5), ("call this guitar", 5),
+                           ("color track 2 blue", 2), ("paint this green", 2),
+                           ("duplicate track 3", 4), ("load compressor", 4),
+                           ("move track 1 to bottom", 6), ("rename this to kick sub", 6)]:
+        before = executor.invocations
+        intent = router.route(text)
+        result = router.execute(intent)
+        assert result.success, (text, result.error)
+        print(f"{text:<24} → {str(daw.log[-1][1]):<38} {executor.invocations - before} call(s)")
+        assert daw.selected == expected == router.tracks.selection.selected, (text, daw.selected)
+    # Kick went to the bottom: Snare is now track 1, the duplicated Bass track 3
+    assert [t.name for t in daw.tracks] == ["Snare", "Bass", "Bass", "Keys", "guitar", "kick sub"]
+    assert daw.tracks[0].color == 'green' and daw.tracks[2].plugins == ['compressor']
+    print(f"Resyncs: {router.tracks.selection.resyncs} (first use only), "
+          f"followed {router.tracks.selection.followed} commands")
+    assert router.tracks.selection.resyncs == 1
+
+    # The user clicks another track; the next "this" after max_age re-reads it
+    daw.selected = 3
+    now[0] += router.tracks.selection.max_age + 1
+    router.execute(router.route("make this red"))
+    assert daw.tracks[2].color == 'red' and router.tracks.selection.resyncs == 2
+    print(f"After clicking track 3 and {router.tracks.selection.max_age + 1} s: resynced, "
+          f"colored {daw.tracks[2].name}")
+
+    # "this" queued behind a slow create means the new track: resolved when it runs, not when parsed
+    daw = SimulatedLogic(["Kick", "Snare"])
+    executor = SimulatedExecutor(daw, command_latency=0.01, action_latency={'create_audio': 0.3})
+    router = CommandRouter(executor=executor, dedupe_window=0)
+    router.refresh_state()
+    router.start_scheduler()
+    _, create = router.submit("create audio track")
+    intent, rename = router.submit("call this guitar")
+    assert intent.args[1] == SELECTED
+    assert create.wait(5) and rename.wait(5) and rename.result.success, rename.result
+    router.stop_scheduler()
+    assert [t.name for t in daw.tracks] == ["Kick", "Snare", "guitar"], [t.name for t in daw.tracks]
+    print(f"Queued behind a {executor.action_latency['create_audio']:g} s create: renamed "
+          f"{daw.log[-1][1]} → {' / '.join(t.name for t in daw.tracks)}")
+
+    # Nothing selected: "this" fails instead of landing on track 1
+    daw = SimulatedLogic(["Kick", "Snare"])
+    daw.selected = 0
+    executor = SimulatedExecutor(daw, realtime=False)
+    router = CommandRouter(executor=executor, dedupe_window=0)
+    for text in ["call this guitar", "load compressor"]:
+        result = router.execute(router.route(text))
+        assert not result.success and result.error == "No track selected", (text, result)
+    assert router.tracks.execute(router.tracks.parse("paint this green"))['error'] == "No track selected"
+    assert router.plugins.execute(router.plugins.parse("load eq"))['error'] == "No track selected"
+    assert [t.name for t in daw.tracks] == ["Kick", "Snare"] and not daw.tracks[0].plugins
+    assert all(args[0] == 'get_selected' for _, args in daw.log), daw.log
+    print(f"No selection: \"call this guitar\" → {result.error}, nothing sent "
+          f"({executor.invocations} get_selected queries)")
+
+    print("✅ \"this\" resolves to the selected track without a query per command")
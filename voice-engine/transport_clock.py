@@ -0,0 +1,246 @@
+"""
+MiDAS AI - Transport Clock
+Local playhead that keeps moving while Logic plays
+
+getPlayheadPosition() is a full osascript round trip, and the playhead is
+stale the moment playback starts. The clock anchors the last position Logic
+reported (or the last transport command we sent) and extrapolates from the
+tempo while playing, wrapping inside the cycle range. Position queries and
+relative jumps read the clock; a resync is due every resync_interval seconds
+of playback and happens anyway whenever a transport command runs.
+
+Positions are in bars, 1-based, with the fraction covering the beats.
+
+Built by Jarvis & Adam - February 2026
+"""
+
+import time
+from typing import Optional, Tuple
+
+# Seconds of playback before the extrapolated playhead is re-read from Logic
+DEFAULT_RESYNC_INTERVAL = 10.0
+
+# Logic clamps the tempo to this range (adjustTempo() in navigation.scpt)
+MIN_TEMPO = 30.0
+MAX_TEMPO = 300.0
+
+
+class TransportClock:
+    """Playhead extrapolated from the last known position, tempo and play state"""
+
+    def __init__(self, clock=time.monotonic, beats_per_bar=4, resync_interval=DEFAULT_RESYNC_INTERVAL):
+        """
+        Args:
+            clock: time source (seconds)
+            beats_per_bar: time signature numerator (4/4 unless told otherwise)
+            resync_interval: seconds of playback an extrapolation is trusted for
+        """
+        self.clock = clock
+        self.beats_per_bar = beats_per_bar
+        self.resync_interval = resync_interval
+
+        self.tempo: Optional[float] = None
+        self.playing = False
+        self.play_start: Optional[float] = None  # where playback last started (pause returns here)
+
+        # Cycle range; start/end None = cycle on but range unknown (loop-selection)
+        self.cycle = False
+        self.cycle_start: Optional[float] = None
+        self.cycle_end: Optional[float] = None
+
+        self._anchor_position: Optional[float] = None  # bar at _anchor_time
+        self._anchor_time = 0.0
+        self.synced_at: Optional[float] = None          # last time Logic reported the position
+
+        self.syncs = 0
+        self.local_updates = 0
+
+    # ============================================================
+    # READING
+    # ============================================================
+
+    def position(self) -> Optional[float]:
+        """Current playhead in bars, or None if it can't be worked out locally"""
+        if self._anchor_position is None:
+            return None
+        if not self.playing:
+            return self._anchor_position
+        if self.tempo is None:
+            return None
+
+        elapsed = self.clock() - self._anchor_time
+        position = self._anchor_position + elapsed * self.tempo / 60.0 / self.beats_per_bar
+
+        if self.cycle:
+            if self.cycle_start is None or self.cycle_end is None:
+                return None  # Logic is looping a range we don't know
+            length = self.cycle_end - self.cycle_start
+            # Playback that starts past the cycle end doesn't loop
+            if length > 0 and self._anchor_position < self.cycle_end <= position:
+                position = self.cycle_start + (position - self.cycle_end) % length
+        return position
+
+    def bar_beat(self) -> Optional[Tuple[int, float]]:
+        """(bar, beat) for the current position, beat 1-based"""
+        position = self.position()
+        if position is None:
+            return None
+        bar = int(position)
+        return (bar, 1 + (position - bar) * self.beats_per_bar)
+
+    def describe(self):
+        """'Bar 5, beat 3' style position (None if unknown)"""
+        bar_beat = self.bar_beat()
+        if bar_beat is None:
+            return None
+        bar, beat = bar_beat
+        if abs(beat - round(beat)) < 0.01:
+            return f"Bar {bar}" if round(beat) == 1 else f"Bar {bar}, beat {round(beat)}"
+        return f"Bar {bar}, beat {beat:.1f}"
+
+    def known(self):
+        return self.position() is not None
+
+    def needs_resync(self):
+        """True once an extrapolation has run longer than resync_interval"""
+        if not self.playing:
+            return False
+        return self.synced_at is None or self.clock() - self.synced_at > self.resync_interval
+
+    # ============================================================
+    # SYNC FROM LOGIC
+    # ============================================================
+
+    def sync(self, position, playing, tempo=None, cycle=None):
+        """
+        Re-anchor on what Logic reported
+        Args:
+            position: playhead in bars (None = unknown)
+            playing: transport running
+            tempo: BPM (None = keep the current tempo)
+            cycle: (enabled, start, end) or None to keep the current cycle
+        """
+        if tempo is not None:
+            self.tempo = tempo
+        if cycle is not None:
+            self.cycle, self.cycle_start, self.cycle_end = cycle
+        if playing and not self.playing:
+            self.play_start = position
+        self.playing = playing
+        self._anchor(position)
+        self.synced_at = self._anchor_time
+        self.syncs += 1
+
+    def _anchor(self, position):
+        self._anchor_position = position
+        self._anchor_time = self.clock()
+
+    # ============================================================
+    # LOCAL UPDATES (transport commands we sent)
+    # ============================================================
+
+    def play(self):
+        if not self.playing:
+            self.play_start = self._anchor_position
+            self.playing = True
+            self._anchor(self._anchor_position)
+        self.local_updates += 1
+
+    def stop(self):
+        """Stop where the playhead is"""
+        self._anchor(self.position())
+        self.playing = False
+        self.local_updates += 1
+
+    def pause(self):
+        """Logic returns to the last play start position"""
+        position = self.play_start if self.playing else self.position()
+        self.playing = False
+        self._anchor(position)
+        self.local_updates += 1
+
+    def locate(self, position):
+        """Absolute move (marker jump, rewind to start); playback continues from there"""
+        self._anchor(position)
+        self.local_updates += 1
+
+    def jump(self, bars):
+        """Relative move from the extrapolated position, clamped at bar 1"""
+        position = self.position()
+        if position is not None:
+            position = max(1.0, position + bars)
+        self.locate(position)
+
+    def set_tempo(self, tempo):
+        """Re-anchor first so the time already played keeps the old tempo"""
+        self._anchor(self.position())
+        self.tempo = min(MAX_TEMPO, max(MIN_TEMPO, tempo))
+        self.local_updates += 1
+
+    def set_cycle(self, enabled, start=None, end=None):
+        """Cycle on/off; start/end None = range not known here"""
+        self._anchor(self.position())
+        self.cycle, self.cycle_start, self.cycle_end = enabled, start, end
+        self.local_updates += 1
+
+    def stats(self):
+        return {
+            'syncs': self.syncs,
+            'local_updates': self.local_updates,
+            'since_sync': None if self.synced_at is None else self.clock() - self.synced_at,
+        }
+
+
+# ============================================================
+# TEST / DEMO
+# ============================================================
+
+if __name__ == "__main__":
+    print("⏱️  MiDAS AI - Transport Clock")
+    print("=" * 60)
+    print()
+
+    now = [0.0]
+    clock = TransportClock(clock=lambda: now[0])
+    clock.sync(1.0, playing=False, tempo=120.0, cycle=(False, 1.0, 5.0))
+
+    # 120 BPM in 4/4: one bar every 2 seconds
+    tests = []
+    clock.play()
+    now[0] = 3.0
+    tests.append(("3 s of playback", clock.position(), 2.5))
+    clock.jump(4)
+    tests.append(("fast-forward 4", clock.position(), 6.5))
+    now[0] = 4.0
+    clock.set_tempo(60.0)
+    now[0] = 8.0
+    tests.append(("tempo halved", clock.position(), 8.0))
+    clock.pause()
+    tests.append(("pause → play start", clock.position(), 1.0))
+    clock.set_cycle(True, 5.0, 9.0)
+    clock.locate(7.0)
+    clock.play()
+    now[0] = 24.0
+    tests.append(("16 s in a 4-bar cycle", clock.position(), 7.0))
+    clock.stop()
+    now[0] = 60.0
+    tests.append(("stopped", clock.position(), 7.0))
+    clock.set_cycle(True)
+    clock.play()
+    tests.append(("unknown cycle range", clock.position(), None))
+
+    passed = 0
+    for label, got, expected in tests:
+        ok = got == expected
+        passed += ok
+        print(f"{'✅' if ok else '❌'} {label:<24} → {got}")
+
+    print()
+    clock.sync(33.375, playing=True, tempo=120.0, cycle=(False, 1.0, 5.0))
+    print(f"Synced: {clock.describe()} (resync due: {clock.needs_resync()})")
+    now[0] += 11.0
+    print(f"+11 s:  {clock.describe()} (resync due: {clock.needs_resync()})")
+    print(f"Stats: {clock.stats()}")
+
+    print()
+    print(f"RESULTS: {passed} passed, {len(tests) - passed} failed")